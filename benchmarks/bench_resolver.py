@@ -0,0 +1,31 @@
+"""Field resolution cost as schema width grows.
+
+Run with ``poetry run python benchmarks/bench_resolver.py``. The time per
+lookup should stay flat as the number of columns increases.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from datadrill import FieldResolver
+
+LOOKUPS = 100_000
+
+
+def main() -> None:
+    for width in (100, 1_000, 10_000, 20_000):
+        resolver = FieldResolver([f"scen_col{i}" for i in range(width)])
+        scenario = resolver.with_prefix("scen_")
+        names = [f"col{(i * 7919) % width}" for i in range(LOOKUPS)]
+
+        def lookups() -> None:
+            for name in names:
+                scenario.resolve(name)
+
+        elapsed = min(timeit.repeat(lookups, number=1, repeat=3))
+        print(f"width={width:>6} ns/lookup={elapsed / LOOKUPS * 1e9:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Reproducible performance baseline for readers, resolution and runs.
+
+Run the suite and save the results as JSON under ``reports/``::
+
+    poetry run python benchmarks/suite.py run --output reports/benchmarks.json
+
+Add ``--rust`` to also time the Rust ``DataFrameOps`` on the same workloads
+(needs ``cargo``) and ``--quick`` for smaller inputs. Compare two result files
+and exit with status 1 when a case slowed down by more than the threshold::
+
+    poetry run python benchmarks/suite.py compare baseline.json \\
+        reports/benchmarks.json --threshold 0.10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+import polars as pl
+
+from datadrill import (
+    DataFrame,
+    Environment,
+    Field,
+    FieldResolver,
+    Reader,
+    series_function,
+    use_prefix,
+)
+
+REPO = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT = REPO / "reports" / "benchmarks.json"
+
+Case = tuple[str, Callable[[], object]]
+
+
+def make_frame(rows: int, cols: int, prefixes: tuple[str, ...] = ("",)) -> pl.DataFrame:
+    """Return ``rows`` x ``cols`` integer columns for every prefix.
+
+    Values are deterministic so runs are comparable across machines.
+    """
+    base = pl.int_range(0, rows, eager=True)
+    return pl.DataFrame(
+        {
+            f"{prefix}col{c}": (base * 31 + c * 7 + p) % 1000
+            for p, prefix in enumerate(prefixes)
+            for c in range(cols)
+        }
+    )
+
+
+def chain(depth: int) -> Reader:
+    """Return ``col0 + 0 + 1 + ...``, a reader nested ``depth`` levels deep."""
+    reader = Field("col0")()
+    for i in range(depth):
+        reader = reader + i
+    return reader
+
+
+def balanced(leaves: int) -> Reader:
+    """Return a balanced sum over ``leaves`` column readers."""
+    readers = [Field(f"col{i % 10}")() for i in range(leaves)]
+    while len(readers) > 1:
+        pairs = zip(readers[::2], readers[1::2])
+        readers = [a + b for a, b in pairs] + readers[len(readers) // 2 * 2 :]
+    return readers[0]
+
+
+@series_function
+def scaled(a: pl.Series, b: pl.Series) -> pl.Series:
+    return a * 2 + b
+
+
+@series_function(elementwise=True)
+def scaled_elementwise(a: pl.Series, b: pl.Series) -> pl.Series:
+    return a * 2 + b
+
+
+def reader_cases(quick: bool) -> Iterator[Case]:
+    env = Environment(FieldResolver([f"col{i}" for i in range(10)]))
+    for depth in (50, 250):
+        yield f"reader/build_chain/depth={depth}", lambda d=depth: chain(d)
+        reader = chain(depth)
+        yield f"reader/lower_chain/depth={depth}", lambda r=reader: r(env)
+    for leaves in (256,) if quick else (256, 4096):
+        yield f"reader/build_balanced/leaves={leaves}", lambda n=leaves: balanced(n)
+        reader = balanced(leaves)
+        yield f"reader/lower_balanced/leaves={leaves}", lambda r=reader: r(env)
+
+
+def resolver_cases(quick: bool) -> Iterator[Case]:
+    for width in (1_000,) if quick else (1_000, 20_000):
+        schema = [f"{p}col{i}" for p in ("", "scen1_", "scen2_") for i in range(width)]
+        resolver = FieldResolver(schema).with_prefix("scen2_")
+        names = [f"col{(i * 7919) % width}" for i in range(10_000)]
+
+        def lookups(r: FieldResolver = resolver, names: list[str] = names) -> None:
+            for name in names:
+                r.resolve(name)
+
+        yield f"resolver/resolve_wide/width={width}", lookups
+
+
+def run_cases(quick: bool) -> Iterator[Case]:
+    col = [Field(f"col{i}") for i in range(10)]
+    for rows in (100_000,) if quick else (100_000, 1_000_000):
+        df = make_frame(rows, 10)
+        query = (
+            DataFrame(df)
+            .filter(col[0]() > 500)
+            .select(col[1]() + col[2]() * 2, col[3]())
+        )
+        yield f"run/filter_select/rows={rows}", query.run
+
+        for name, func in (("udf", scaled), ("udf_elementwise", scaled_elementwise)):
+            udf = DataFrame(df).select(func(col[1](), col[2]()))
+            yield f"run/{name}_select/rows={rows}", udf.run
+
+    cols = 100 if quick else 1_000
+    wide = make_frame(10_000, cols, prefixes=("", "scen1_", "scen2_"))
+    readers = [use_prefix("scen1_")(Field(f"col{i}")()) for i in range(cols)]
+    query = DataFrame(wide).select(*readers)
+    yield f"run/wide_prefixed_select/cols={cols}", query.run
+
+
+def time_case(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Return the best seconds per call and the calls per timing."""
+    number, _ = timeit.Timer(func).autorange()
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    return best, number
+
+
+def rust_results(quick: bool) -> dict[str, dict[str, object]]:
+    """Run ``rust/benches/dataframe.rs`` and parse its JSON lines."""
+    command = [
+        "cargo",
+        "bench",
+        "--quiet",
+        "--manifest-path",
+        str(REPO / "rust" / "Cargo.toml"),
+        "--bench",
+        "dataframe",
+        "--",
+    ]
+    if quick:
+        command.append("--quick")
+    output = subprocess.run(command, check=True, capture_output=True, text=True)
+    results = {}
+    for line in output.stdout.splitlines():
+        if line.startswith("{"):
+            record = json.loads(line)
+            results[f"rust/{record.pop('name')}"] = record
+    return results
+
+
+def run(args: argparse.Namespace) -> int:
+    results: dict[str, dict[str, object]] = {}
+    groups = (reader_cases, resolver_cases, run_cases)
+    for case in (c for group in groups for c in group(args.quick)):
+        name, func = case
+        if args.filter and args.filter not in name:
+            continue
+        seconds, number = time_case(func, args.repeat)
+        results[f"python/{name}"] = {"seconds": seconds, "number": number}
+        print(f"python/{name:<45} {seconds * 1e3:10.3f} ms")
+    if args.rust:
+        for name, record in rust_results(args.quick).items():
+            results[name] = record
+            print(f"{name:<52} {float(record['seconds']) * 1e3:10.3f} ms")
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text())["results"]
+    current = json.loads(args.current.read_text())["results"]
+    regressions = 0
+    for name in sorted(baseline.keys() & current.keys()):
+        before = baseline[name]["seconds"]
+        after = current[name]["seconds"]
+        change = after / before - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{name:<52} {before * 1e3:10.3f} -> {after * 1e3:10.3f} ms "
+            f"{change:+7.1%}{flag}"
+        )
+    for name in sorted(baseline.keys() ^ current.keys()):
+        side = "baseline" if name in baseline else "current"
+        print(f"{name:<52} only in {side}")
+    if regressions:
+        print(f"{regressions} case(s) slower than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and save JSON")
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--quick", action="store_true")
+    run_parser.add_argument("--rust", action="store_true")
+    run_parser.add_argument("--filter", help="only run cases containing this text")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
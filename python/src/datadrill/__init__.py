@@ -1,7 +1,13 @@
 """DataDrill package."""
 
+from .cache import ReaderCache, ResultCache
 from .core import sample_dataframe_with_modified
-from .dataframe import DataFrame
+from .dataframe import DataFrame, gather_runs, run_all
+from .index import FrameIndex
+from .parallel import ChunkedExecutor
+from .partition import Partition, Partitions
+from .profile import OpProfile, Profile
+from .serialize import deserialize_plan, register_function, serialize_plan
 from .field import (
     Environment,
     Field,
@@ -34,4 +40,17 @@ __all__ = [
     "get_data",
     "use_prefix",
     "DataFrame",
+    "gather_runs",
+    "run_all",
+    "FrameIndex",
+    "ReaderCache",
+    "ResultCache",
+    "ChunkedExecutor",
+    "Partition",
+    "Partitions",
+    "Profile",
+    "OpProfile",
+    "register_function",
+    "serialize_plan",
+    "deserialize_plan",
 ]
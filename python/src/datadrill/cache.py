@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Hashable, NamedTuple, Sequence
+
+import polars as pl
+
+from .dataframe import DataFrame
+from .field import Environment, Node, Reader
+
+
+class CacheInfo(NamedTuple):
+    """Statistics reported by :meth:`ReaderCache.info`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ReaderCache:
+    """Memoize reader results per ``(reader, environment)`` pair.
+
+    Readers are keyed on their :attr:`~datadrill.Reader.node` tree, so readers
+    composed the same way share an entry even if they are distinct objects.
+
+    Entries are evicted least recently used first once ``maxsize`` is reached.
+    Readers that are not :attr:`~datadrill.Reader.cacheable` are always
+    evaluated and never counted as hits or misses.
+
+    Example:
+        >>> from datadrill import Environment, Field, FieldResolver
+        >>> cache = ReaderCache(maxsize=256)
+        >>> env = Environment(FieldResolver(["price", "base"]))
+        >>> normalized = cache.wrap(Field("price")() / Field("base")())
+        >>> normalized(env)  # computed
+        >>> normalized(env)  # served from the cache
+        >>> cache.info().hits
+        1
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Node, Environment], Any] = OrderedDict()
+
+    def evaluate(self, reader: Reader, env: Environment) -> Any:
+        """Return ``reader(env)``, reusing a cached result when possible."""
+        if not reader.cacheable:
+            return reader(env)
+
+        key = (reader.node, env)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        result = reader(env)
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def wrap(self, reader: Reader) -> Reader:
+        """Return a reader that evaluates ``reader`` through this cache."""
+        return Reader(Cached(self, reader.node))
+
+    def info(self) -> CacheInfo:
+        """Return hit, miss and size statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@dataclass(frozen=True, eq=False)
+class Cached(Node):
+    """Evaluate ``child`` through ``cache``; built by :meth:`ReaderCache.wrap`."""
+
+    cache: ReaderCache
+    child: Node
+
+    def lower(self, env: Environment) -> Any:
+        return self.cache.evaluate(Reader(self.child), env)
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.child,)
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        (child,) = children
+        return Cached(self.cache, child)
+
+
+class ResultCacheInfo(NamedTuple):
+    """Statistics reported by :meth:`ResultCache.info`."""
+
+    hits: int
+    misses: int
+    max_bytes: int
+    bytes: int
+    entries: int
+    spilled: int
+    spill_bytes: int
+
+
+@dataclass
+class _Entry:
+    result: pl.DataFrame | Path
+    nbytes: int
+    # Weak references to the inputs keyed by identity; the entry is stale
+    # once any of them is gone, since its id may have been reused.
+    sources: tuple[weakref.ref[Any], ...]
+    # Size of the spill file, for entries whose result is a path.
+    file_bytes: int = 0
+
+    def alive(self) -> bool:
+        return all(source() is not None for source in self.sources)
+
+
+def _content_hash(df: pl.DataFrame) -> str:
+    digest = hashlib.blake2b(repr(df.schema).encode(), digest_size=16)
+    if df.width:
+        digest.update(df.hash_rows().to_frame().write_ipc(None).getvalue())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Memoize :meth:`DataFrame.run <datadrill.DataFrame.run>` results.
+
+    Entries are keyed on the recorded operations with their reader trees and
+    arguments, the :class:`~datadrill.Environment` and the input frames. By
+    default inputs are identified by object identity, which assumes they are
+    not modified in place; with ``hash_inputs=True`` eager inputs are keyed
+    on a hash of their rows instead, so equal frames share entries. Lazy
+    inputs such as file scans are always keyed by identity.
+
+    Results are kept in memory up to ``max_bytes`` as estimated by
+    :meth:`polars.DataFrame.estimated_size`, evicting the least recently used
+    first. With ``spill_dir`` evicted results are written there as Arrow IPC
+    files and read back on their next hit instead of being dropped; a file is
+    deleted once read back. ``max_spill_bytes`` bounds the total size of the
+    files, deleting the oldest first. Plans
+    with readers that are not :attr:`~datadrill.Reader.cacheable` always
+    run and are never counted as hits or misses.
+
+    Example:
+        >>> cache = ResultCache(max_bytes=1 << 30, spill_dir="/tmp/datadrill")
+        >>> query.run(env, cache=cache)  # computed
+        >>> query.run(env, cache=cache)  # served from the cache
+        >>> cache.info().hits
+        1
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 2**20,
+        *,
+        spill_dir: str | Path | None = None,
+        max_spill_bytes: int | None = None,
+        hash_inputs: bool = False,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if max_spill_bytes is not None and max_spill_bytes <= 0:
+            raise ValueError("max_spill_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.spill_dir = None if spill_dir is None else Path(spill_dir)
+        self.max_spill_bytes = max_spill_bytes
+        self.hash_inputs = hash_inputs
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self.spill_bytes = 0
+        self._memory: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._spilled: dict[Hashable, _Entry] = {}
+
+    def evaluate(
+        self, frame: DataFrame, env: Environment, **kwargs: Any
+    ) -> pl.DataFrame:
+        """Return ``frame.run(env, **kwargs)``, reusing a cached result."""
+        sources: list[weakref.ref[Any]] = []
+        key = self._frame_key(frame, sources)
+        if key is None:
+            return frame.run(env, **kwargs)
+        key = (key, env)
+
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+            return result.clone()
+
+        self.misses += 1
+        result = frame.run(env, **kwargs)
+        self._store(key, _Entry(result, result.estimated_size(), tuple(sources)))
+        return result.clone()
+
+    def info(self) -> ResultCacheInfo:
+        """Return hit, miss and size statistics."""
+        return ResultCacheInfo(
+            self.hits,
+            self.misses,
+            self.max_bytes,
+            self.bytes,
+            len(self._memory) + len(self._spilled),
+            len(self._spilled),
+            self.spill_bytes,
+        )
+
+    def clear(self) -> None:
+        """Remove every entry, delete spilled files and reset the statistics."""
+        for entry in self._spilled.values():
+            self._delete(entry)
+        self._memory.clear()
+        self._spilled.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self.spill_bytes = 0
+
+    def _frame_key(
+        self, frame: DataFrame, sources: list[weakref.ref[Any]]
+    ) -> Hashable | None:
+        ops: list[Hashable] = []
+        for op in frame._ops:
+            if not all(node.cacheable for node in op.nodes):
+                return None
+            params: list[Hashable] = []
+            for param in op.params:
+                if isinstance(param, DataFrame):
+                    param = self._frame_key(param, sources)
+                    if param is None:
+                        return None
+                params.append(param)
+            ops.append((op.name, op.nodes, tuple(params)))
+        return (self._input_key(frame.df, sources), tuple(ops))
+
+    def _input_key(
+        self, df: pl.DataFrame | pl.LazyFrame, sources: list[weakref.ref[Any]]
+    ) -> Hashable:
+        if self.hash_inputs and isinstance(df, pl.DataFrame):
+            return ("content", _content_hash(df))
+        sources.append(weakref.ref(df))
+        return ("id", id(df))
+
+    def _lookup(self, key: Hashable) -> pl.DataFrame | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry.alive():
+                self._memory.move_to_end(key)
+                assert isinstance(entry.result, pl.DataFrame)
+                return entry.result
+            self._remove(key)
+            return None
+
+        entry = self._spilled.pop(key, None)
+        if entry is None:
+            return None
+        assert isinstance(entry.result, Path)
+        if not entry.alive():
+            self._delete(entry)
+            return None
+        result = pl.read_ipc(entry.result, memory_map=False)
+        self._delete(entry)
+        self._store(key, _Entry(result, entry.nbytes, entry.sources))
+        return result
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        if key in self._memory:
+            self._remove(key)
+        self._memory[key] = entry
+        self.bytes += entry.nbytes
+        while self.bytes > self.max_bytes and self._memory:
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self._spill(evicted_key, evicted)
+
+    def _spill(self, key: Hashable, entry: _Entry) -> None:
+        if self.spill_dir is None or not entry.alive():
+            return
+        assert isinstance(entry.result, pl.DataFrame)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{uuid.uuid4().hex}.arrow"
+        entry.result.write_ipc(path)
+        spilled = _Entry(path, entry.nbytes, entry.sources, path.stat().st_size)
+        self._spilled[key] = spilled
+        self.spill_bytes += spilled.file_bytes
+        limit = self.max_spill_bytes
+        while limit is not None and self.spill_bytes > limit and self._spilled:
+            # Dicts keep insertion order, so the first entry is the oldest.
+            self._delete(self._spilled.pop(next(iter(self._spilled))))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._memory.pop(key)
+        self.bytes -= entry.nbytes
+
+    def _delete(self, entry: _Entry) -> None:
+        if isinstance(entry.result, Path):
+            entry.result.unlink(missing_ok=True)
+            self.spill_bytes -= entry.file_bytes
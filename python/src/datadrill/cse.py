@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Sequence
+
+import polars as pl
+
+from .field import Environment, Node, PolarsExpr, PrefixScope
+
+TEMP_PREFIX = "__datadrill_cse_"
+
+_Key = tuple[Node, Environment]
+
+
+@dataclass(frozen=True)
+class CSEReport:
+    """How many repeated sub-readers a plan computes only once.
+
+    ``hoisted`` counts the distinct sub-readers moved into temporary columns
+    and ``duplicates_removed`` the evaluations saved by doing so.
+    """
+
+    hoisted: int = 0
+    duplicates_removed: int = 0
+
+    def __add__(self, other: CSEReport) -> CSEReport:
+        return CSEReport(
+            self.hoisted + other.hoisted,
+            self.duplicates_removed + other.duplicates_removed,
+        )
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Hoisted columns and rewritten readers for a run of operations.
+
+    ``hoists[i]`` lists the ``(name, expr)`` columns to add right before the
+    ``i``-th operation, the first place they are needed. ``exprs[i]`` holds
+    that operation's lowered expressions referencing those columns.
+    """
+
+    hoists: list[list[tuple[str, pl.Expr]]]
+    exprs: list[list[pl.Expr]]
+    temporaries: list[str]
+    report: CSEReport
+
+
+def _is_trivial(node: Node) -> bool:
+    # Columns and literals cost nothing to recompute.
+    if isinstance(node, PrefixScope):
+        return _is_trivial(node.child)
+    return not node.children()
+
+
+def _rewrite(node: Node, env: Environment, names: dict[_Key, str]) -> Node:
+    name = names.get((node, env))
+    if name is not None:
+        return PolarsExpr(pl.col(name))
+    return _rewrite_children(node, env, names)
+
+
+def _rewrite_children(node: Node, env: Environment, names: dict[_Key, str]) -> Node:
+    children = node.children()
+    if not children:
+        return node
+    child_env = node.child_env(env)
+    rewritten = [_rewrite(child, child_env, names) for child in children]
+    if all(new is old for new, old in zip(rewritten, children)):
+        return node
+    return node.with_children(rewritten)
+
+
+def eliminate(
+    ops: Sequence[Sequence[Node]],
+    env: Environment,
+    *,
+    start: int = 0,
+    grouped: Sequence[bool] = (),
+) -> Segment:
+    """Hoist sub-readers repeated across ``ops`` into temporary columns.
+
+    ``ops`` holds the reader trees of consecutive operations over the same
+    columns. A sub-reader is hoisted when it appears at least twice, is
+    cacheable and more than a plain column or literal. Occurrences nested
+    inside an already counted repeat are not counted again.
+
+    Sub-readers that are not provably row-local, such as windows, raw Polars
+    aggregations, closures or whole-column series functions, depend on which
+    rows they see. They are never moved across an operation: they are only
+    hoisted when every occurrence is in one operation that is not
+    ``grouped``, and never when they may aggregate, since the hoisted column
+    would be broadcast to every row.
+    ``start`` offsets the generated column names.
+    """
+    counts: Counter[_Key] = Counter()
+    first_use: dict[_Key, int] = {}
+    last_use: dict[_Key, int] = {}
+    order: list[_Key] = []
+
+    def visit(node: Node, node_env: Environment, index: int) -> None:
+        key = (node, node_env)
+        counts[key] += 1
+        last_use[key] = index
+        if counts[key] > 1:
+            return
+        child_env = node.child_env(node_env)
+        for child in node.children():
+            visit(child, child_env, index)
+        first_use[key] = index
+        order.append(key)
+
+    for index, nodes in enumerate(ops):
+        for node in nodes:
+            visit(node, env, index)
+
+    names: dict[_Key, str] = {}
+    hoists: list[list[tuple[str, pl.Expr]]] = [[] for _ in ops]
+    saved = 0
+    # ``order`` is post-order, so nested repeats get their column first and
+    # enclosing repeats can reference it.
+    for key in order:
+        node, node_env = key
+        if counts[key] < 2 or _is_trivial(node):
+            continue
+        if not node.cacheable:
+            continue
+        if not node.row_local:
+            index = first_use[key]
+            in_group = index < len(grouped) and grouped[index]
+            if node.aggregates or in_group or last_use[key] != index:
+                continue
+        expr = _rewrite_children(node, node_env, names).lower(node_env)
+        name = f"{TEMP_PREFIX}{start + len(names)}"
+        hoists[first_use[key]].append((name, expr))
+        names[key] = name
+        saved += counts[key] - 1
+
+    exprs = []
+    for nodes in ops:
+        lowered = []
+        for node in nodes:
+            rewritten = _rewrite(node, env, names)
+            if rewritten is node:
+                lowered.append(node.lower(env))
+                continue
+            output = node.lower(env).meta.output_name(raise_if_undetermined=False)
+            expr = rewritten.lower(env)
+            lowered.append(expr if output is None else expr.alias(output))
+        exprs.append(lowered)
+
+    return Segment(hoists, exprs, list(names.values()), CSEReport(len(names), saved))
@@ -1,57 +1,964 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Callable, List
+import asyncio
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    TYPE_CHECKING,
+    Literal,
+    Mapping,
+    Sequence,
+    overload,
+)
 
 import polars as pl
 
-from .field import Environment, FieldResolver, Reader, Field
+from .cse import CSEReport, eliminate
+from .field import (
+    Environment,
+    Field,
+    FieldResolver,
+    Node,
+    PrefixScope,
+    Reader,
+    SeriesCall,
+)
+from .index import FrameIndex
+from .parallel import ChunkedExecutor
+from .profile import OpProfile, Profile, ProfileHook
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
 
 ExprSource = Reader | Field | pl.Expr | int | float
+ScanSource = str | Path | list[str] | list[Path]
+JoinKeys = str | ExprSource | Sequence[str | ExprSource]
+PartitionKeys = JoinKeys
+JoinHow = Literal["inner", "left", "right", "full", "semi", "anti", "cross"]
+OpFunc = Callable[[pl.LazyFrame, List[pl.Expr]], pl.LazyFrame]
 
 
 @dataclass(frozen=True)
-class DataFrame:
-    """Composable DataFrame operations."""
+class _Op:
+    """A recorded operation and how it may be executed.
+
+    ``apply`` receives the lowered expressions of ``nodes``. ``row_local``
+    operations can run on any slice of their input, and operations that
+    ``keep_columns`` leave the frame's columns unchanged. After any other
+    operation, later readers resolve against the new columns. ``params`` holds
+    the remaining arguments ``apply`` was built from, so that together with
+    ``name`` and ``nodes`` they identify the operation.
+    """
+
+    name: str
+    nodes: tuple[Node, ...]
+    apply: OpFunc
+    row_local: bool = True
+    keep_columns: bool = False
+    params: tuple[Any, ...] = ()
+
+
+_WHOLE_INPUT = {
+    "sort": "orders rows across the whole input",
+    "group_by": "aggregates rows across the whole input",
+    "join": "matches rows against another frame",
+}
+
+
+def _row_local(nodes: Sequence[Node]) -> bool:
+    return all(node.row_local for node in nodes)
 
-    df: pl.DataFrame
-    _ops: List[Callable[[pl.DataFrame, Environment], pl.DataFrame]] = field(
-        default_factory=list
+
+def _reads_columns(nodes: Sequence[Node]) -> bool:
+    """Whether any of the row-local ``nodes`` reads a column of the input."""
+    return any(node.columns(None, "") for node in nodes)
+
+
+def _refresh_env(env: Environment, lf: pl.LazyFrame) -> Environment:
+    names = lf.collect_schema().names()
+    return Environment(FieldResolver(names, env.resolver.prefix))
+
+
+def _key_nodes(keys: JoinKeys) -> tuple[Node, ...]:
+    if isinstance(keys, (str, Reader, Field, pl.Expr)) or not isinstance(
+        keys, Sequence
+    ):
+        keys = [keys]
+    return tuple(
+        Reader._node_from(Field(key) if isinstance(key, str) else key) for key in keys
     )
 
+
+def _same_exprs(left: Sequence[pl.Expr], right: Sequence[pl.Expr]) -> bool:
+    return all(a.meta.eq(b) for a, b in zip(left, right))
+
+
+def _with_executor(node: Node, executor: ChunkedExecutor) -> Node:
+    children = node.children()
+    if isinstance(node, SeriesCall) and node.elementwise and node.parallel is None:
+        node = replace(node, parallel=executor)
+    if not children:
+        return node
+    return node.with_children([_with_executor(c, executor) for c in children])
+
+
+def _under_prefix(node: Node, prefix: str) -> Node:
+    """Return ``node`` with every :class:`PrefixScope` nested under ``prefix``.
+
+    Resolved with a resolver prefixed by ``prefix``, the result reads the
+    columns ``node`` reads without that prefix.
+    """
+    children = node.children()
+    if isinstance(node, PrefixScope):
+        node = PrefixScope(prefix + node.prefix, node.child)
+    if not children:
+        return node
+    return node.with_children([_under_prefix(c, prefix) for c in children])
+
+
+@dataclass(frozen=True)
+class DataFrame:
+    """Composable DataFrame operations.
+
+    Operations are recorded and lowered into a single :class:`polars.LazyFrame`
+    plan, so Polars can optimize the whole chain and only one result is
+    materialized when the plan is collected.
+
+    ``df`` may also be a :class:`polars.LazyFrame` such as a file scan. The
+    default :class:`FieldResolver` is then built from the scan's schema, which
+    only touches file metadata, and Polars reads just the columns the plan's
+    readers resolve to.
+    """
+
+    df: pl.DataFrame | pl.LazyFrame
+    _ops: List[_Op] = field(default_factory=list)
+    index: FrameIndex | None = None
+
+    @classmethod
+    def scan_parquet(cls, source: ScanSource, **kwargs: Any) -> DataFrame:
+        """Return a DataFrame backed by :func:`polars.scan_parquet`."""
+        return cls(pl.scan_parquet(source, **kwargs))
+
+    @classmethod
+    def scan_ipc(cls, source: ScanSource, **kwargs: Any) -> DataFrame:
+        """Return a DataFrame backed by :func:`polars.scan_ipc`.
+
+        Uncompressed Arrow IPC files are memory-mapped rather than read, so
+        with :meth:`sink_ipc` data can go from disk to disk without copies.
+        """
+        return cls(pl.scan_ipc(source, **kwargs))
+
+    @classmethod
+    def scan_csv(cls, source: ScanSource, **kwargs: Any) -> DataFrame:
+        """Return a DataFrame backed by :func:`polars.scan_csv`."""
+        return cls(pl.scan_csv(source, **kwargs))
+
+    def _with_op(self, op: _Op) -> DataFrame:
+        return replace(self, _ops=[*self._ops, op])
+
+    def with_index(
+        self,
+        sorted_by: str | None = None,
+        zone_maps: Sequence[str] = (),
+        *,
+        chunk_size: int = 65_536,
+    ) -> DataFrame:
+        """Return the DataFrame with a :class:`~datadrill.index.FrameIndex`.
+
+        ``sorted_by`` names a column sorted in ascending order and
+        ``zone_maps`` columns whose minimum and maximum are recorded per
+        chunk of ``chunk_size`` rows. Plans built on the result skip the
+        rows that comparisons such as ``Field("ts")() > x`` in their leading
+        filters rule out, including fields resolved through a prefix. The
+        input must be an eager frame, which the index assumes never changes,
+        so :meth:`incremental` runs, whose input grows, do not use it.
+        """
+        if not isinstance(self.df, pl.DataFrame):
+            raise ValueError("indexes need an eager polars.DataFrame input")
+        index = FrameIndex.build(self.df, sorted_by, zone_maps, chunk_size)
+        return replace(self, index=index)
+
     def filter(self, predicate: ExprSource) -> DataFrame:
         """Return a new DataFrame with ``predicate`` applied."""
 
-        def op(df: pl.DataFrame, env: Environment) -> pl.DataFrame:
-            expr = Reader._expr_from(predicate, env)
-            return df.filter(expr)
+        def op(lf: pl.LazyFrame, exprs: List[pl.Expr]) -> pl.LazyFrame:
+            return lf.filter(exprs[0])
 
-        return DataFrame(self.df, [*self._ops, op])
+        nodes = (Reader._node_from(predicate),)
+        return self._with_op(
+            _Op("filter", nodes, op, _row_local(nodes), keep_columns=True)
+        )
 
     def select(self, *exprs: ExprSource) -> DataFrame:
         """Return a new DataFrame selecting ``exprs``."""
 
-        def op(df: pl.DataFrame, env: Environment) -> pl.DataFrame:
-            columns = [Reader._expr_from(e, env) for e in exprs]
-            return df.select(columns)
+        def op(lf: pl.LazyFrame, columns: List[pl.Expr]) -> pl.LazyFrame:
+            return lf.select(columns)
+
+        nodes = tuple(Reader._node_from(e) for e in exprs)
+        # Literals only broadcast to the input's height next to a column, so
+        # a select of literals alone yields one row whatever the input.
+        row_local = _row_local(nodes) and _reads_columns(nodes)
+        return self._with_op(_Op("select", nodes, op, row_local))
+
+    def with_columns(self, *exprs: ExprSource) -> DataFrame:
+        """Return a new DataFrame adding or replacing the columns in ``exprs``.
+
+        Later operations can refer to the new columns with :class:`Field`.
+        """
+
+        def op(lf: pl.LazyFrame, columns: List[pl.Expr]) -> pl.LazyFrame:
+            return lf.with_columns(columns)
+
+        nodes = tuple(Reader._node_from(e) for e in exprs)
+        return self._with_op(_Op("with_columns", nodes, op, _row_local(nodes)))
+
+    def join(
+        self,
+        other: DataFrame,
+        on: JoinKeys | None = None,
+        *,
+        left_on: JoinKeys | None = None,
+        right_on: JoinKeys | None = None,
+        how: JoinHow = "inner",
+        prefix: str = "right_",
+    ) -> DataFrame:
+        """Return a new DataFrame joined with ``other``.
+
+        Every column of ``other`` is renamed to ``prefix`` plus its name, so
+        after the join ``use_prefix(prefix)`` readers address the right side
+        and unprefixed readers the left side. Keys are readers or field names:
+        ``left_on`` resolves through the environment the plan runs in and
+        ``right_on`` against the columns of ``other``, where ``use_prefix``
+        readers pick prefixed columns of ``other`` itself.
+
+        Both sides stay lazy, so Polars pushes the projections and predicates
+        of later operations below the join into each input. ``how="cross"``
+        pairs every row of both sides and takes no keys.
+        """
+        if on is not None:
+            left_on = right_on = on
+        if how == "cross":
+            if left_on is not None or right_on is not None:
+                raise ValueError("cross joins take no keys")
+            left_nodes: tuple[Node, ...] = ()
+            right_nodes: tuple[Node, ...] = ()
+        elif left_on is None or right_on is None:
+            raise ValueError("join needs on, or both left_on and right_on")
+        else:
+            left_nodes = _key_nodes(left_on)
+            # The right keys are lowered against the renamed columns of
+            # ``other``, so prefixes chosen in them must stay under ``prefix``.
+            right_nodes = tuple(
+                _under_prefix(node, prefix) for node in _key_nodes(right_on)
+            )
+        if len(left_nodes) != len(right_nodes):
+            raise ValueError("left_on and right_on must have the same length")
+
+        def op(lf: pl.LazyFrame, keys: List[pl.Expr]) -> pl.LazyFrame:
+            right = other.lazy()
+            names = right.collect_schema().names()
+            renamed = {name: f"{prefix}{name}" for name in names}
+            if how == "cross":
+                return lf.join(right.rename(renamed), how="cross")
+            right_env = Environment(FieldResolver(list(renamed.values()), prefix))
+            right_keys = [node.lower(right_env) for node in right_nodes]
+            return lf.join(
+                right.rename(renamed), left_on=keys, right_on=right_keys, how=how
+            )
+
+        params = (other, right_nodes, how, prefix)
+        return self._with_op(
+            _Op("join", left_nodes, op, row_local=False, params=params)
+        )
 
-        return DataFrame(self.df, [*self._ops, op])
+    def group_by(self, *keys: ExprSource, maintain_order: bool = False) -> GroupBy:
+        """Group rows by ``keys``; finish with :meth:`GroupBy.agg`.
+
+        Keys resolve through the environment like any other reader, so a
+        prefixed environment groups by the prefixed columns.
+        """
+        return GroupBy(self, keys, maintain_order)
 
     def sort(self, by: ExprSource, *, descending: bool = False) -> DataFrame:
         """Return a new DataFrame sorted by ``by``."""
 
-        def op(df: pl.DataFrame, env: Environment) -> pl.DataFrame:
-            expr = Reader._expr_from(by, env)
-            return df.sort(by=expr, descending=descending)
+        def op(lf: pl.LazyFrame, exprs: List[pl.Expr]) -> pl.LazyFrame:
+            return lf.sort(by=exprs[0], descending=descending)
+
+        nodes = (Reader._node_from(by),)
+        return self._with_op(
+            _Op(
+                "sort",
+                nodes,
+                op,
+                row_local=False,
+                keep_columns=True,
+                params=(descending,),
+            )
+        )
+
+    def _default_env(self) -> Environment:
+        return Environment(FieldResolver(self.df.collect_schema().names()))
+
+    def lazy(
+        self,
+        env: Environment | None = None,
+        *,
+        cse: bool = False,
+        parallel: ChunkedExecutor | None = None,
+    ) -> pl.LazyFrame:
+        """Return the stored operations as a single lazy query plan.
+
+        With ``cse=True`` sub-readers repeated within or across operations are
+        computed once as temporary columns; see :meth:`cse_report`.
+        ``parallel`` runs every elementwise series function that has no
+        executor of its own over row chunks; see :class:`ChunkedExecutor`.
+        """
+        if env is None:
+            env = self._default_env()
+
+        frame = self if parallel is None else self._with_executor(parallel)
+        return frame._apply_ops(frame._source(env), env, cse=cse)[0]
+
+    def _source(self, env: Environment) -> pl.LazyFrame:
+        if self.index is None:
+            return self.df.lazy()
+        filters = []
+        # Narrowing the input changes what aggregations and windows see, so
+        # only filters ahead of the first such operation may use the index.
+        for op in self._ops:
+            if not (op.keep_columns and op.row_local):
+                break
+            if op.name == "filter":
+                filters.append(op.nodes[0])
+        return self.index.scan(filters, env)
+
+    def _with_executor(self, executor: ChunkedExecutor) -> DataFrame:
+        ops = [
+            replace(op, nodes=tuple(_with_executor(n, executor) for n in op.nodes))
+            for op in self._ops
+        ]
+        return replace(self, _ops=ops)
+
+    def _apply_ops(
+        self, lf: pl.LazyFrame, env: Environment, *, cse: bool = False
+    ) -> tuple[pl.LazyFrame, CSEReport]:
+        if not cse:
+            for index, op in enumerate(self._ops, start=1):
+                lf = op.apply(lf, [node.lower(env) for node in op.nodes])
+                if not op.keep_columns and index < len(self._ops):
+                    env = _refresh_env(env, lf)
+            return lf, CSEReport()
+
+        report = CSEReport()
+        for ops in self._cse_segments():
+            segment = eliminate(
+                [op.nodes for op in ops],
+                env,
+                start=report.hoisted,
+                grouped=[op.name == "group_by" for op in ops],
+            )
+            for op, hoists, exprs in zip(ops, segment.hoists, segment.exprs):
+                for name, expr in hoists:
+                    lf = lf.with_columns(expr.alias(name))
+                lf = op.apply(lf, exprs)
+            if segment.temporaries:
+                lf = lf.drop(segment.temporaries, strict=False)
+            if not ops[-1].keep_columns:
+                env = _refresh_env(env, lf)
+            report += segment.report
+        return lf, report
+
+    def _cse_segments(self) -> Iterator[List[_Op]]:
+        # Readers only refer to the same columns until an operation replaces
+        # them, so repeats are shared up to and including such an operation.
+        segment: List[_Op] = []
+        for op in self._ops:
+            segment.append(op)
+            if not op.keep_columns:
+                yield segment
+                segment = []
+        if segment:
+            yield segment
+
+    def cse_report(self, env: Environment | None = None) -> CSEReport:
+        """Return how many repeated sub-readers ``cse=True`` computes once."""
+        if env is None:
+            env = self._default_env()
+        return self._apply_ops(self.df.lazy(), env, cse=True)[1]
+
+    def explain(
+        self,
+        env: Environment | None = None,
+        *,
+        optimized: bool = True,
+        cse: bool = False,
+    ) -> str:
+        """Return the Polars query plan built from the stored operations."""
+        return self.lazy(env, cse=cse).explain(optimized=optimized)
+
+    @overload
+    def run(
+        self,
+        env: Environment | None = None,
+        *,
+        lazy: Literal[False] = ...,
+        cse: bool = ...,
+        parallel: ChunkedExecutor | None = ...,
+        cache: ResultCache | None = ...,
+        profile: ProfileHook | None = ...,
+    ) -> pl.DataFrame: ...
+
+    @overload
+    def run(
+        self,
+        env: Environment | None = None,
+        *,
+        lazy: Literal[True],
+        cse: bool = ...,
+        parallel: ChunkedExecutor | None = ...,
+        cache: ResultCache | None = ...,
+        profile: ProfileHook | None = ...,
+    ) -> pl.LazyFrame: ...
+
+    def run(
+        self,
+        env: Environment | None = None,
+        *,
+        lazy: bool = False,
+        cse: bool = False,
+        parallel: ChunkedExecutor | None = None,
+        cache: ResultCache | None = None,
+        profile: ProfileHook | None = None,
+    ) -> pl.DataFrame | pl.LazyFrame:
+        """Execute stored operations using ``env`` if provided.
+
+        The whole chain is collected once. Pass ``lazy=True`` to receive the
+        uncollected :class:`polars.LazyFrame` instead, ``cse=True`` to compute
+        repeated sub-readers only once and ``parallel`` to run elementwise
+        series functions over row chunks. With ``cache`` a result computed
+        earlier for the same plan, environment and input is returned instead
+        of running the plan again; see :class:`~datadrill.cache.ResultCache`.
+        ``profile`` is called with the :class:`~datadrill.profile.Profile` of
+        the run, as recorded by :meth:`profile`.
+        """
+        if profile is not None:
+            if lazy or cache is not None:
+                raise ValueError("profile only applies to uncached collected runs")
+            result, report = self.profile(env, cse=cse, parallel=parallel)
+            profile(report)
+            return result
+        if cache is not None:
+            if lazy:
+                raise ValueError("cache only applies to collected results")
+            if env is None:
+                env = self._default_env()
+            return cache.evaluate(self, env, cse=cse, parallel=parallel)
+        plan = self.lazy(env, cse=cse, parallel=parallel)
+        if lazy:
+            return plan
+        return plan.collect()
+
+    async def run_async(
+        self,
+        env: Environment | None = None,
+        *,
+        cse: bool = False,
+        parallel: ChunkedExecutor | None = None,
+    ) -> pl.DataFrame:
+        """Execute stored operations without blocking the event loop.
+
+        The plan is built as in :meth:`run` and collected on the Polars thread
+        pool with :meth:`polars.LazyFrame.collect_async`. Cancelling the
+        awaiting task returns control immediately, but Polars cannot stop a
+        query once submitted: it finishes in the background and its result
+        is dropped.
+        """
+        plan = self.lazy(env, cse=cse, parallel=parallel)
+        return await plan.collect_async()
+
+    def sink_parquet(
+        self,
+        path: str | Path,
+        env: Environment | None = None,
+        *,
+        partition_by: PartitionKeys | None = None,
+        compression: str = "zstd",
+        row_group_size: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Stream the result to Parquet without collecting it in memory.
+
+        With ``partition_by`` one file is written per distinct key under the
+        directory ``path``; see :meth:`sink_csv` for how keys resolve. Other
+        keyword arguments go to :meth:`polars.LazyFrame.sink_parquet`.
+        """
+        self._sink(
+            "sink_parquet",
+            path,
+            env,
+            partition_by,
+            compression=compression,
+            row_group_size=row_group_size,
+            **kwargs,
+        )
+
+    def sink_ipc(
+        self,
+        path: str | Path,
+        env: Environment | None = None,
+        *,
+        partition_by: PartitionKeys | None = None,
+        compression: Literal["uncompressed", "lz4", "zstd"] = "uncompressed",
+        **kwargs: Any,
+    ) -> None:
+        """Stream the result to Arrow IPC files; see :meth:`sink_parquet`."""
+        self._sink(
+            "sink_ipc", path, env, partition_by, compression=compression, **kwargs
+        )
+
+    def sink_csv(
+        self,
+        path: str | Path,
+        env: Environment | None = None,
+        *,
+        partition_by: PartitionKeys | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Stream the result to CSV; see :meth:`sink_parquet`.
+
+        Keys in ``partition_by`` are readers or field names resolved against
+        the columns of the result, so they must be among the output columns.
+        """
+        self._sink("sink_csv", path, env, partition_by, **kwargs)
+
+    def _sink(
+        self,
+        method: str,
+        path: str | Path,
+        env: Environment | None,
+        partition_by: PartitionKeys | None,
+        **kwargs: Any,
+    ) -> None:
+        if env is None:
+            env = self._default_env()
+        plan = self.lazy(env)
+        target: str | Path | pl.PartitionByKey = path
+        if partition_by is not None:
+            output_env = _refresh_env(env, plan)
+            keys = [node.lower(output_env) for node in _key_nodes(partition_by)]
+            target = pl.PartitionByKey(path, by=keys)
+            kwargs.setdefault("mkdir", True)
+        getattr(plan, method)(target, engine="streaming", **kwargs)
+
+    def profile(
+        self,
+        env: Environment | None = None,
+        *,
+        by_op: bool = False,
+        cse: bool = False,
+        parallel: ChunkedExecutor | None = None,
+    ) -> tuple[pl.DataFrame, Profile]:
+        """Run the plan and return the result with a :class:`Profile`.
+
+        The fused plan runs through :meth:`polars.LazyFrame.profile`, which
+        reports per-node timings. With ``by_op=True`` operations are instead
+        collected one at a time to record each one's wall time, row counts and
+        output size; this gives up optimizations across operations, so it suits
+        finding which operation is slow rather than timing the whole plan.
+        """
+        if cse and by_op:
+            raise ValueError("cse rewrites across operations; profile it fused")
+        if env is None:
+            env = self._default_env()
+        frame = self if parallel is None else self._with_executor(parallel)
+        if cse:
+            # Readers are lowered per segment, so only the total is known.
+            start = perf_counter()
+            lf, _ = frame._apply_ops(frame._source(env), env, cse=True)
+            lower = perf_counter() - start
+            ops = [OpProfile(index, op.name) for index, op in enumerate(self._ops)]
+        else:
+            lf, ops = frame._profile_ops(env, by_op)
+            lower = sum(op.lower_seconds or 0.0 for op in ops)
+
+        if by_op:
+            result = lf.collect()
+            execute = sum(op.execute_seconds or 0.0 for op in ops)
+            nodes = None
+        else:
+            start = perf_counter()
+            try:
+                result, nodes = lf.profile()
+            except pl.exceptions.ComputeError as err:
+                # Plans that reduce to a projection of in-memory data have no
+                # nodes to time.
+                if "no data to time" not in str(err):
+                    raise
+                result, nodes = lf.collect(), None
+            execute = perf_counter() - start
+        profile = Profile(
+            tuple(ops), lower, execute, result.height, result.estimated_size(), nodes
+        )
+        return result, profile
+
+    def _profile_ops(
+        self, env: Environment, by_op: bool
+    ) -> tuple[pl.LazyFrame, List[OpProfile]]:
+        lf = self._source(env)
+        if by_op:
+            current = lf.collect()
+        ops: List[OpProfile] = []
+        for index, op in enumerate(self._ops):
+            start = perf_counter()
+            exprs = [node.lower(env) for node in op.nodes]
+            lower = perf_counter() - start
+            if by_op:
+                start = perf_counter()
+                result = op.apply(current.lazy(), exprs).collect()
+                execute = perf_counter() - start
+                ops.append(
+                    OpProfile(
+                        index,
+                        op.name,
+                        lower,
+                        execute,
+                        current.height,
+                        result.height,
+                        result.estimated_size(),
+                    )
+                )
+                current = result
+                lf = current.lazy()
+            else:
+                lf = op.apply(lf, exprs)
+                ops.append(OpProfile(index, op.name, lower))
+            if not op.keep_columns and index < len(self._ops) - 1:
+                env = _refresh_env(env, lf)
+        return lf, ops
+
+    def run_many(
+        self,
+        scenarios: Mapping[str, Environment] | Sequence[str],
+        env: Environment | None = None,
+        *,
+        how: Literal["wide", "long"] = "wide",
+        label: str = "scenario",
+        lazy: bool = False,
+    ) -> pl.DataFrame | pl.LazyFrame:
+        """Evaluate the plan in several environments with a single select.
+
+        ``scenarios`` maps labels to environments, or lists prefixes that are
+        applied to ``env`` and double as labels. Operations before the final
+        ``select`` must not depend on the prefix and run once. Each selected
+        reader is lowered per scenario; readers that resolve to the same
+        expression everywhere are computed once and shared.
+
+        With ``how="wide"`` every prefix-dependent output becomes one column per
+        scenario, named by prepending the label to the output name without its
+        prefix. With ``how="long"`` scenarios are stacked under their original
+        names with a ``label`` column identifying each one.
+        """
+        if env is None:
+            env = self._default_env()
+        if isinstance(scenarios, Mapping):
+            envs = dict(scenarios)
+        else:
+            envs = {prefix: env.with_prefix(prefix) for prefix in scenarios}
+        if not envs:
+            raise ValueError("run_many needs at least one scenario")
+        if not self._ops or self._ops[-1].name != "select":
+            raise ValueError("run_many needs a plan that ends with select")
+
+        # The operations before the select resolve the same in every scenario.
+        lf = self._source(next(iter(envs.values())))
+        for op in self._ops[:-1]:
+            lowered = [[node.lower(e) for node in op.nodes] for e in envs.values()]
+            if not all(_same_exprs(lowered[0], other) for other in lowered[1:]):
+                raise ValueError(
+                    f"{op.name} depends on the prefix; only the final select may"
+                )
+            lf = op.apply(lf, lowered[0])
+            if not op.keep_columns:
+                envs = {name: _refresh_env(e, lf) for name, e in envs.items()}
+
+        columns: List[pl.Expr] = []
+        shared: List[str] = []
+        # Wide column name and long column name of each scenario's outputs.
+        renames: dict[str, List[tuple[str, str]]] = {name: [] for name in envs}
+        for node in self._ops[-1].nodes:
+            exprs = {name: node.lower(e) for name, e in envs.items()}
+            first = next(iter(exprs.values()))
+            if _same_exprs(list(exprs.values()), [first] * len(exprs)):
+                columns.append(first)
+                shared.append(first.meta.output_name())
+                continue
+            for name, expr in exprs.items():
+                output = expr.meta.output_name()
+                prefix = envs[name].resolver.prefix
+                if prefix and output.startswith(prefix):
+                    output = output[len(prefix) :]
+                columns.append(expr.alias(f"{name}{output}"))
+                renames[name].append((f"{name}{output}", output))
+
+        plan = lf.select(columns)
+        if how == "long":
+            plan = pl.concat(
+                [
+                    plan.select(
+                        pl.lit(name).alias(label),
+                        *shared,
+                        *(pl.col(wide).alias(long) for wide, long in renames[name]),
+                    )
+                    for name in envs
+                ]
+            )
+        elif how != "wide":
+            raise ValueError(f"unknown layout: {how!r}")
+        if lazy:
+            return plan
+        return plan.collect()
+
+    def run_batches(
+        self, env: Environment | None = None, *, batch_size: int = 100_000
+    ) -> Iterator[pl.DataFrame]:
+        """Execute stored operations chunk by chunk, yielding result batches.
 
-        return DataFrame(self.df, [*self._ops, op])
+        The input is sliced into chunks of ``batch_size`` rows and each chunk is
+        run through the plan with Polars' streaming engine, so memory stays
+        bounded by a few batches regardless of the input size. Every yielded
+        frame has ``batch_size`` rows except possibly the last one.
 
-    def run(self, env: Environment | None = None) -> pl.DataFrame:
-        """Execute stored operations using ``env`` if provided."""
+        Only row-local operations (``filter``, ``select`` and ``with_columns``
+        of elementwise readers) can run this way, and their expressions are
+        evaluated per chunk. Raw Polars expressions count as elementwise when
+        their plan shows it; closures passed to :func:`~datadrill.map` never
+        do. A ``select`` must also read a column, as literals alone yield a
+        single row. A ``ValueError`` explains which operations need the whole
+        input instead.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self._check_row_local("run in batches")
         if env is None:
-            env = Environment(FieldResolver(self.df.columns))
+            env = self._default_env()
+        return self._iter_batches(env, batch_size)
 
-        df = self.df
+    def incremental(self, env: Environment | None = None) -> Incremental:
+        """Return an :class:`Incremental` run for append-only inputs.
+
+        Each :meth:`Incremental.update` only runs the plan over rows appended
+        since the previous update and appends them to the previous result.
+        Like :meth:`run_batches`, this needs a row-local plan, so closures
+        such as ``map(lambda e: e - e.mean(), ...)`` and selects of literals
+        alone, which would add a row per update, are rejected. A ``ValueError``
+        names the operations that prevent it.
+        """
+        self._check_row_local("run incrementally")
+        if env is None:
+            env = self._default_env()
+        return Incremental(self, env)
+
+    def _check_row_local(self, action: str) -> None:
+        reasons = []
         for op in self._ops:
-            df = op(df, env)
-        return df
+            if op.row_local:
+                continue
+            if op.name == "select" and _row_local(op.nodes):
+                reason = "reads no column and yields a single row"
+            else:
+                reason = _WHOLE_INPUT.get(
+                    op.name,
+                    "uses an aggregation, window, closure or whole-column function",
+                )
+            reasons.append(f"{op.name} {reason}")
+        if reasons:
+            raise ValueError(
+                f"cannot {action}: {'; '.join(reasons)}; use run() instead"
+            )
+
+    def _iter_batches(
+        self, env: Environment, batch_size: int
+    ) -> Iterator[pl.DataFrame]:
+        source = self._source(env)
+        height = source.select(pl.len()).collect().item()
+
+        pending: list[pl.DataFrame] = []
+        pending_rows = 0
+        for offset in range(0, height, batch_size):
+            chunk, _ = self._apply_ops(source.slice(offset, batch_size), env)
+            part = chunk.collect(engine="streaming")
+            if part.height == 0:
+                continue
+            pending.append(part)
+            pending_rows += part.height
+            if pending_rows >= batch_size:
+                buffered = pl.concat(pending)
+                while buffered.height >= batch_size:
+                    yield buffered.head(batch_size)
+                    buffered = buffered.slice(batch_size)
+                pending = [buffered] if buffered.height else []
+                pending_rows = buffered.height
+
+        if pending_rows:
+            yield pl.concat(pending)
+
+
+@dataclass(frozen=True)
+class GroupBy:
+    """Grouping keys waiting for aggregations; see :meth:`DataFrame.group_by`."""
+
+    frame: DataFrame
+    keys: tuple[ExprSource, ...]
+    maintain_order: bool = False
+
+    def agg(self, *aggs: ExprSource) -> DataFrame:
+        """Return a new DataFrame with one row per group and ``aggs`` computed.
+
+        The grouping is planned in the same lazy query, so earlier filters and
+        projections are pushed below it.
+        """
+        n_keys = len(self.keys)
+        maintain_order = self.maintain_order
+
+        def op(lf: pl.LazyFrame, exprs: List[pl.Expr]) -> pl.LazyFrame:
+            grouped = lf.group_by(exprs[:n_keys], maintain_order=maintain_order)
+            return grouped.agg(exprs[n_keys:])
+
+        nodes = tuple(Reader._node_from(e) for e in (*self.keys, *aggs))
+        params = (n_keys, maintain_order)
+        return self.frame._with_op(
+            _Op("group_by", nodes, op, row_local=False, params=params)
+        )
+
+
+class Incremental:
+    """Keep the result of a row-local plan current as its input grows.
+
+    Built by :meth:`DataFrame.incremental`. The input is assumed to be
+    append-only: rows already processed must not change, so the plan only
+    runs over the rows past :attr:`rows`.
+    """
+
+    def __init__(self, frame: DataFrame, env: Environment):
+        self.frame = frame
+        self.env = env
+        self.rows = 0
+        self.result: pl.DataFrame | None = None
+
+    def update(self, df: pl.DataFrame | pl.LazyFrame | None = None) -> pl.DataFrame:
+        """Process rows appended since the last update and return the result.
+
+        ``df`` is the whole current input; it defaults to the frame the plan
+        was built on, which suits scans of growing files.
+        """
+        source = (self.frame.df if df is None else df).lazy()
+        height = source.select(pl.len()).collect().item()
+        if height < self.rows:
+            raise ValueError(
+                f"input has {height} rows but {self.rows} were already "
+                "processed; incremental runs need an append-only input"
+            )
+
+        plan, _ = self.frame._apply_ops(source.slice(self.rows), self.env)
+        appended = plan.collect()
+        self.rows = height
+        if self.result is None:
+            self.result = appended
+        else:
+            self.result = pl.concat([self.result, appended])
+        return self.result
+
+
+async def gather_runs(
+    frames: Iterable[DataFrame],
+    env: Environment | None = None,
+    *,
+    timeout: float | None = None,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """Run ``frames`` concurrently with :meth:`DataFrame.run_async`.
+
+    Every plan is submitted before any is awaited, so they overlap on the
+    Polars thread pool. Results come back in the order of ``frames``. When a
+    run fails, or ``timeout`` seconds pass first, the runs still pending are
+    cancelled and the error is raised, ``TimeoutError`` for the timeout.
+    With ``return_exceptions`` failed runs return their exception instead.
+    """
+    tasks = [asyncio.ensure_future(frame.run_async(env)) for frame in frames]
+    try:
+        async with asyncio.timeout(timeout):
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def run_all(
+    queries: Sequence[DataFrame], env: Environment | None = None, *, cse: bool = False
+) -> list[pl.DataFrame]:
+    """Run ``queries`` together with :func:`polars.collect_all`.
+
+    Results come back in the order of ``queries``. Queries derived from the
+    same :class:`DataFrame` share the operations they have in common: those
+    are lowered once into one lazy subplan and cached, so Polars computes
+    them a single time, and a lazy input such as a scan is read once. Queries
+    with an index instead narrow their input by their own filters. ``env``
+    applies to every query and defaults to each input's columns.
+    """
+    # A query's operations are identified by its input and the operations
+    # applied to it, which derived queries share by identity.
+    paths = []
+    users: dict[tuple[int, ...], int] = {}
+    children: dict[tuple[int, ...], set[tuple[int, ...]]] = {}
+    for query in queries:
+        if query.index is not None:
+            # Each query narrows its indexed input by its own filters.
+            paths.append([])
+            continue
+        path = [(id(query.df),)]
+        for op in query._ops:
+            path.append((*path[-1], id(op)))
+        for parent, key in zip([None, *path], path):
+            users[key] = users.get(key, 0) + 1
+            if parent is not None:
+                children.setdefault(parent, set()).add(key)
+        paths.append(path)
+
+    def shared(key: tuple[int, ...]) -> bool:
+        # Cache where queries diverge rather than at every common step.
+        count = users[key]
+        return count > 1 and all(users[c] < count for c in children.get(key, ()))
+
+    lowered: dict[tuple[int, ...], tuple[pl.LazyFrame, Environment, bool]] = {}
+    plans = []
+    for query, path in zip(queries, paths):
+        if cse or query.index is not None:
+            plans.append(query.lazy(env, cse=cse))
+            continue
+        base = path[0]
+        if base not in lowered:
+            lf = query.df.lazy()
+            if isinstance(query.df, pl.LazyFrame) and shared(base):
+                lf = lf.cache()
+            query_env = query._default_env() if env is None else env
+            lowered[base] = (lf, query_env, False)
+        for op, parent, key in zip(query._ops, path, path[1:]):
+            if key in lowered:
+                continue
+            lf, op_env, stale = lowered[parent]
+            if stale:
+                op_env = _refresh_env(op_env, lf)
+            lf = op.apply(lf, [node.lower(op_env) for node in op.nodes])
+            if shared(key):
+                lf = lf.cache()
+            lowered[key] = (lf, op_env, not op.keep_columns)
+        plans.append(lowered[path[-1]][0])
+    return pl.collect_all(plans)
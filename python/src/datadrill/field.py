@@ -1,18 +1,83 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Sequence, Any, TypeAlias
+import operator
+from dataclasses import dataclass, fields as dataclass_fields, replace
+import json
+from functools import partial, wraps
+from typing import Callable, Iterator, Sequence, Any, TypeAlias, overload
 
 import polars as pl
 
+from .parallel import ChunkedExecutor, SeriesBatch
+
+
+class _Schema(tuple[str, ...]):
+    """Column names with a hash index shared by every derived resolver."""
+
+    _index: frozenset[str]
+    _fields_by_prefix: dict[str, frozenset[str]]
+    _hash: int
+
+    def __new__(cls, names: Sequence[str]) -> _Schema:
+        schema = super().__new__(cls, names)
+        schema._index = frozenset(schema)
+        schema._fields_by_prefix = {}
+        return schema
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._index
+
+    def __hash__(self) -> int:
+        # Tuples recompute their hash on every call; wide schemas make that
+        # the dominant cost of hashing an Environment, so compute it once.
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = tuple.__hash__(self)
+            return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, _Schema) and hash(self) != hash(other):
+            return False
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # String hashes differ between processes, so the cached hash and
+        # index are rebuilt on load rather than pickled.
+        return (_Schema, (tuple(self),))
+
+    def fields(self, prefix: str) -> frozenset[str]:
+        """Return the names available under ``prefix`` with the prefix removed."""
+        fields = self._fields_by_prefix.get(prefix)
+        if fields is None:
+            size = len(prefix)
+            fields = frozenset(c[size:] for c in self if c.startswith(prefix))
+            self._fields_by_prefix[prefix] = fields
+        return fields
+
 
 @dataclass(frozen=True)
 class FieldResolver:
-    """Resolve column names based on an optional prefix."""
+    """Resolve column names based on an optional prefix.
+
+    ``schema`` is stored as an indexed tuple so lookups take constant time
+    regardless of width. Resolvers derived through :meth:`with_prefix` and
+    :meth:`clear_prefix` share the same index instead of copying it, and the
+    schema hash is computed once so resolvers are cheap to use as cache keys.
+    """
 
     schema: Sequence[str]
     prefix: str = ""
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.schema, _Schema):
+            object.__setattr__(self, "schema", _Schema(self.schema))
+
     def with_prefix(self, value: str = "") -> FieldResolver:
         """Return a copy of the resolver with ``prefix`` set to ``value``."""
         return FieldResolver(self.schema, value)
@@ -21,6 +86,10 @@ class FieldResolver:
         """Return a copy of the resolver without a prefix."""
         return FieldResolver(self.schema)
 
+    def fields(self) -> frozenset[str]:
+        """Return the field names that resolve under the current prefix."""
+        return self.schema.fields(self.prefix)
+
     def resolve(self, name: str) -> str:
         """Return the column name taking the prefix into account."""
         column = f"{self.prefix}{name}"
@@ -47,136 +116,705 @@ class Environment:
 ReaderFunc = Callable[[Environment], Any]
 
 
+class Node:
+    """Base class for the expression tree built by :class:`Reader`.
+
+    Nodes are immutable and compare and hash structurally, so two readers
+    composed the same way have equal nodes. :meth:`lower` turns a node into a
+    Polars expression for a given environment.
+    """
+
+    def lower(self, env: Environment) -> Any:
+        """Return the value of this node evaluated in ``env``."""
+        raise NotImplementedError
+
+    def children(self) -> tuple[Node, ...]:
+        """Return the direct child nodes."""
+        return ()
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        """Return a copy of this node with its children replaced."""
+        return self
+
+    def child_env(self, env: Environment) -> Environment:
+        """Return the environment children are lowered in."""
+        return env
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the lowered value only depends on the environment."""
+        return all(child.cacheable for child in self.children())
+
+    @property
+    def row_local(self) -> bool:
+        """Whether each output row only depends on the same input row.
+
+        Nodes whose expression cannot be inspected, such as closures, report
+        ``False`` so that no plan relies on an assumption they may break.
+        """
+        return all(child.row_local for child in self.children())
+
+    @property
+    def aggregates(self) -> bool:
+        """Whether the lowered expression may reduce rows to a single value."""
+        return any(child.aggregates for child in self.children())
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        """Return the columns read by this node.
+
+        ``env`` resolves and validates column names when given; otherwise
+        ``prefix`` is prepended to field names as-is.
+        """
+        return frozenset().union(*(c.columns(env, prefix) for c in self.children()))
+
+    def _key(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, f.name) for f in dataclass_fields(self))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return False
+        return hash(self) == hash(other) and self._key() == other._key()
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        # Trees are hashed repeatedly while caching and deduplicating, so the
+        # recursive hash is computed once per node.
+        try:
+            return self.__dict__["_hash"]
+        except KeyError:
+            value = hash((type(self).__name__, self._key()))
+            object.__setattr__(self, "_hash", value)
+            return value
+
+    def __getstate__(self) -> dict[str, Any]:
+        # String hashes differ between processes, so the memoised hash is
+        # recomputed after unpickling rather than carried along.
+        state = dict(self.__dict__)
+        state.pop("_hash", None)
+        return state
+
+
+def _value_key(value: Any) -> tuple[Any, ...]:
+    # Include the type so ``1``, ``1.0`` and ``True`` stay distinct. Values
+    # that cannot be hashed, such as lists passed to series functions, only
+    # compare equal to themselves.
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), id(value))
+    return (type(value), value)
+
+
+@dataclass(frozen=True, eq=False)
+class FieldRef(Node):
+    """A field resolved through the environment's :class:`FieldResolver`."""
+
+    name: str
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return pl.col(env.resolver.resolve(self.name))
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        if env is None:
+            return frozenset([f"{prefix}{self.name}"])
+        return frozenset([env.resolver.resolve(self.name)])
+
+
+@dataclass(frozen=True, eq=False)
+class Literal(Node):
+    """A constant lowered with :func:`polars.lit`."""
+
+    value: Any
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return pl.lit(self.value)
+
+    def _key(self) -> tuple[Any, ...]:
+        return _value_key(self.value)
+
+
+@dataclass(frozen=True, eq=False)
+class Constant(Node):
+    """A plain Python value passed unchanged to a series function."""
+
+    value: Any
+
+    def lower(self, env: Environment) -> Any:
+        return self.value
+
+    def _key(self) -> tuple[Any, ...]:
+        return _value_key(self.value)
+
+
+def _tree_row_local(tree: Any) -> bool:
+    """Whether a serialized expression only combines values row by row.
+
+    Only node kinds known to be elementwise are accepted, and functions must
+    be flagged by Polars as row-separable and length-preserving. A literal
+    Series is a whole column, except as the set ``is_in`` looks values up in.
+    """
+    if not isinstance(tree, dict) or len(tree) != 1:
+        return False
+    ((kind, body),) = tree.items()
+    if kind in ("Column", "Columns"):
+        return True
+    if kind == "Literal":
+        return "Series" not in body
+    if kind == "Alias":
+        return _tree_row_local(body[0])
+    if kind == "Cast":
+        return _tree_row_local(body["expr"])
+    if kind == "BinaryExpr":
+        return _tree_row_local(body["left"]) and _tree_row_local(body["right"])
+    if kind == "Ternary":
+        parts = (body["predicate"], body["truthy"], body["falsy"])
+        return all(_tree_row_local(part) for part in parts)
+    if kind == "Function":
+        flags = body["options"]["flags"]
+        if "ROW_SEPARABLE" not in flags or "LENGTH_PRESERVING" not in flags:
+            return False
+        inputs = body["input"]
+        function = body["function"]
+        if isinstance(function, dict) and "IsIn" in function.get("Boolean", {}):
+            return _tree_row_local(inputs[0]) and "Literal" in inputs[1]
+        return all(_tree_row_local(arg) for arg in inputs)
+    return False
+
+
+@dataclass(frozen=True, eq=False)
+class PolarsExpr(Node):
+    """A ready-made :class:`polars.Expr` embedded in a reader.
+
+    Whether it is row-local is read from the expression's serialized plan.
+    """
+
+    expr: pl.Expr
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return self.expr
+
+    @property
+    def row_local(self) -> bool:
+        try:
+            tree = json.loads(self.expr.meta.serialize(format="json"))
+        except Exception:  # Python UDFs may not serialize
+            return False
+        return _tree_row_local(tree)
+
+    @property
+    def aggregates(self) -> bool:
+        return not self.row_local
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        return frozenset(self.expr.meta.root_names())
+
+    def _key(self) -> tuple[Any, ...]:
+        try:
+            return (self.expr.meta.serialize(format="binary"),)
+        except Exception:  # pragma: no cover - unserializable expressions
+            return (id(self.expr),)
+
+
+_BINARY_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    name: getattr(operator, name)
+    for name in (
+        "add",
+        "sub",
+        "mul",
+        "truediv",
+        "floordiv",
+        "mod",
+        "pow",
+        "and_",
+        "or_",
+        "xor",
+        "lt",
+        "le",
+        "gt",
+        "ge",
+        "eq",
+        "ne",
+    )
+}
+
+_UNARY_OPS: dict[str, Callable[[Any], Any]] = {
+    name: getattr(operator, name) for name in ("neg", "pos", "invert")
+}
+
+
+@dataclass(frozen=True, eq=False)
+class BinaryOp(Node):
+    """An operator applied to two nodes, named after :mod:`operator`."""
+
+    op: str
+    left: Node
+    right: Node
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return _BINARY_OPS[self.op](self.left.lower(env), self.right.lower(env))
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.left, self.right)
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        left, right = children
+        return BinaryOp(self.op, left, right)
+
+
+def conjuncts(node: Node) -> Iterator[Node]:
+    """Yield the conditions that ``&`` combines in ``node``."""
+    if isinstance(node, BinaryOp) and node.op == "and_":
+        yield from conjuncts(node.left)
+        yield from conjuncts(node.right)
+    else:
+        yield node
+
+
+@dataclass(frozen=True, eq=False)
+class UnaryOp(Node):
+    """A unary operator applied to a node, named after :mod:`operator`."""
+
+    op: str
+    operand: Node
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return _UNARY_OPS[self.op](self.operand.lower(env))
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.operand,)
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        (operand,) = children
+        return UnaryOp(self.op, operand)
+
+
+@dataclass(frozen=True, eq=False)
+class PrefixScope(Node):
+    """Evaluate ``child`` with the resolver prefix set to ``prefix``."""
+
+    prefix: str
+    child: Node
+
+    def lower(self, env: Environment) -> Any:
+        return self.child.lower(env.with_prefix(self.prefix))
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.child,)
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        (child,) = children
+        return PrefixScope(self.prefix, child)
+
+    def child_env(self, env: Environment) -> Environment:
+        return env.with_prefix(self.prefix)
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        scoped = None if env is None else env.with_prefix(self.prefix)
+        return self.child.columns(scoped, self.prefix)
+
+
+@dataclass(frozen=True, eq=False)
+class Call(Node):
+    """A Python function applied to lowered expressions.
+
+    Built by :func:`map`, :func:`map2` and :func:`field_function`. The function
+    receives :class:`polars.Expr` values and its result is lowered again, so
+    it may return a reader, an expression or a constant.
+    """
+
+    func: Callable[..., Any]
+    args: tuple[Node, ...]
+    kwargs: tuple[tuple[str, Node], ...] = ()
+
+    def lower(self, env: Environment) -> pl.Expr:
+        call_args = [arg.lower(env) for arg in self.args]
+        call_kwargs = {key: value.lower(env) for key, value in self.kwargs}
+        result = self.func(*call_args, **call_kwargs)
+        return Reader._expr_from(result, env)
+
+    @property
+    def row_local(self) -> bool:
+        return False
+
+    @property
+    def aggregates(self) -> bool:
+        return True
+
+    def children(self) -> tuple[Node, ...]:
+        return (*self.args, *(value for _, value in self.kwargs))
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        args, values = children[: len(self.args)], children[len(self.args) :]
+        kwargs = tuple((key, value) for (key, _), value in zip(self.kwargs, values))
+        return replace(self, args=tuple(args), kwargs=kwargs)
+
+
+@dataclass(frozen=True, eq=False)
+class SeriesCall(Node):
+    """A function applied to :class:`polars.Series` through ``map_batches``.
+
+    :class:`Constant` arguments are passed to the function unchanged; every
+    other argument is evaluated as a column. With ``numpy`` the columns are
+    passed as NumPy arrays and an array result is converted back using
+    ``return_dtype``. ``elementwise`` tells Polars the function works row by
+    row so it may split the input into chunks and stream it, and ``parallel``
+    runs such a function over row chunks with a :class:`ChunkedExecutor`.
+    """
+
+    func: Callable[..., pl.Series]
+    args: tuple[Node, ...]
+    kwargs: tuple[tuple[str, Node], ...] = ()
+    numpy: bool = False
+    elementwise: bool = False
+    return_dtype: Any = None
+    parallel: ChunkedExecutor | None = None
+
+    @property
+    def row_local(self) -> bool:
+        return self.elementwise and super().row_local
+
+    def lower(self, env: Environment) -> pl.Expr:
+        exprs: list[pl.Expr] = []
+        # Each slot is either the index of a column in ``exprs`` or a constant.
+        slots: list[tuple[bool, Any]] = []
+        for value in self.children():
+            if isinstance(value, Constant):
+                slots.append((False, value.value))
+            else:
+                slots.append((True, len(exprs)))
+                exprs.append(value.lower(env).alias(f"_{len(exprs)}"))
+
+        return_dtype = self.return_dtype
+        batch = SeriesBatch(
+            self.func,
+            tuple(slots),
+            len(self.args),
+            tuple(key for key, _ in self.kwargs),
+            self.numpy,
+            return_dtype,
+        )
+        call: Callable[[Sequence[pl.Series]], pl.Series] = batch
+        if self.parallel is not None:
+            call = partial(self.parallel.map, batch)
+
+        if len(exprs) == 1:
+            return exprs[0].map_batches(
+                lambda column: call([column]),
+                return_dtype,
+                is_elementwise=self.elementwise,
+            )
+        if self.elementwise:
+            # ``pl.map_batches`` cannot be marked elementwise, so several inputs
+            # travel as a struct; packing and unpacking it does not copy data.
+            return pl.struct(exprs).map_batches(
+                lambda struct: call(struct.struct.unnest().get_columns()),
+                return_dtype,
+                is_elementwise=True,
+            )
+        return pl.map_batches(exprs, call, return_dtype)
+
+    def children(self) -> tuple[Node, ...]:
+        return (*self.args, *(value for _, value in self.kwargs))
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        args, values = children[: len(self.args)], children[len(self.args) :]
+        kwargs = tuple((key, value) for (key, _), value in zip(self.kwargs, values))
+        return replace(self, args=tuple(args), kwargs=kwargs)
+
+
+_AGGREGATIONS = frozenset(["sum", "mean", "min", "max", "count", "first", "last"])
+_ELEMENTWISE_METHODS = frozenset(["alias"])
+
+
+@dataclass(frozen=True, eq=False)
+class MethodCall(Node):
+    """A :class:`polars.Expr` method called on the lowered ``receiver``."""
+
+    method: str
+    receiver: Node
+    args: tuple[Node, ...] = ()
+
+    def lower(self, env: Environment) -> pl.Expr:
+        method = getattr(self.receiver.lower(env), self.method)
+        return method(*(arg.lower(env) for arg in self.args))
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.receiver, *self.args)
+
+    def with_children(self, children: Sequence[Node]) -> Node:
+        receiver, *args = children
+        return MethodCall(self.method, receiver, tuple(args))
+
+    @property
+    def row_local(self) -> bool:
+        return self.method in _ELEMENTWISE_METHODS and super().row_local
+
+    @property
+    def aggregates(self) -> bool:
+        if self.method == "over":
+            return False
+        return self.method in _AGGREGATIONS or super().aggregates
+
+
+@dataclass(frozen=True, eq=False)
+class Ask(Node):
+    """The environment itself, as returned by :func:`ask`."""
+
+    def lower(self, env: Environment) -> Environment:
+        return env
+
+    @property
+    def cacheable(self) -> bool:
+        return False
+
+    @property
+    def row_local(self) -> bool:
+        return False
+
+
+@dataclass(frozen=True, eq=False)
+class Asks(Node):
+    """A value computed from the environment by :func:`asks`."""
+
+    func: Callable[[Environment], Any]
+
+    def lower(self, env: Environment) -> pl.Expr:
+        return Reader._expr_from(self.func(env), env)
+
+    @property
+    def cacheable(self) -> bool:
+        return False
+
+    @property
+    def row_local(self) -> bool:
+        return False
+
+    @property
+    def aggregates(self) -> bool:
+        return True
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        if env is None:
+            raise ValueError("fields read by asks() need an environment")
+        return Reader._node_from(self.func(env)).columns(env, prefix)
+
+
+@dataclass(frozen=True, eq=False)
+class Opaque(Node):
+    """A reader built directly from a Python closure."""
+
+    func: ReaderFunc
+    closure_cacheable: bool = True
+
+    def lower(self, env: Environment) -> Any:
+        return self.func(env)
+
+    @property
+    def cacheable(self) -> bool:
+        return self.closure_cacheable
+
+    @property
+    def row_local(self) -> bool:
+        return False
+
+    @property
+    def aggregates(self) -> bool:
+        return True
+
+    def columns(self, env: Environment | None, prefix: str) -> frozenset[str]:
+        raise ValueError("fields read by a closure-based Reader are unknown")
+
+
 class Reader:
-    """Callable wrapper supporting expression operators."""
+    """Expression tree supporting Python operators.
+
+    Operators and the helpers in this module build a tree of :class:`Node`
+    objects which is available as :attr:`node`. Calling the reader with an
+    :class:`Environment` lowers the tree to a Polars expression. Passing a
+    plain function instead of a node wraps it as an :class:`Opaque` node.
+
+    ``cacheable`` marks whether the result only depends on the environment it
+    is evaluated in, which allows :class:`~datadrill.cache.ReaderCache` to
+    memoize it. Readers built from :func:`ask` or :func:`asks` are not
+    cacheable, and neither is anything composed from them.
+    """
 
-    def __init__(self, func: ReaderFunc):
-        self._func = func
+    def __init__(self, func: ReaderFunc | Node, *, cacheable: bool = True):
+        if isinstance(func, Node):
+            self.node = func
+        else:
+            self.node = Opaque(func, cacheable)
 
     def __call__(self, env: Environment) -> Any:
-        return self._func(env)
+        return self.node.lower(env)
+
+    @property
+    def cacheable(self) -> bool:
+        return self.node.cacheable
+
+    def required_fields(self, env: Environment | None = None) -> frozenset[str]:
+        """Return the column names this reader reads.
+
+        With ``env`` the names are resolved (and validated) exactly as when the
+        reader runs. Without it, fields outside :func:`use_prefix` are reported
+        unprefixed.
+        """
+        prefix = "" if env is None else env.resolver.prefix
+        return self.node.columns(env, prefix)
 
     @staticmethod
-    def _expr_from(value: ExprLike, env: Environment) -> pl.Expr:
+    def _node_from(value: ExprLike) -> Node:
         if isinstance(value, Reader):
-            return value(env)
+            return value.node
         if isinstance(value, Field):
-            return value()(env)
+            return FieldRef(value.name)
         if isinstance(value, pl.Expr):
-            return value
-        return pl.lit(value)
-
-    def _binary_op(
-        self,
-        other: ExprLike,
-        op: Callable[[pl.Expr, pl.Expr], pl.Expr],
-        *,
-        reverse: bool = False,
-    ) -> Reader:
-        def wrapper(env: Environment) -> pl.Expr:
-            left = self._expr_from(self, env)
-            right = self._expr_from(other, env)
-            if reverse:
-                left, right = right, left
-            return op(left, right)
-
-        return Reader(wrapper)
+            return PolarsExpr(value)
+        return Literal(value)
+
+    @staticmethod
+    def _expr_from(value: ExprLike, env: Environment) -> pl.Expr:
+        return Reader._node_from(value).lower(env)
+
+    def _binary_op(self, other: ExprLike, op: str, *, reverse: bool = False) -> Reader:
+        left = self.node
+        right = self._node_from(other)
+        if reverse:
+            left, right = right, left
+        return Reader(BinaryOp(op, left, right))
 
     def __add__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a + b)
+        return self._binary_op(other, "add")
 
     def __radd__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a + b, reverse=True)
+        return self._binary_op(other, "add", reverse=True)
 
     def __sub__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a - b)
+        return self._binary_op(other, "sub")
 
     def __rsub__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a - b, reverse=True)
+        return self._binary_op(other, "sub", reverse=True)
 
     def __mul__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a * b)
+        return self._binary_op(other, "mul")
 
     def __rmul__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a * b, reverse=True)
+        return self._binary_op(other, "mul", reverse=True)
 
     def __truediv__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a / b)
+        return self._binary_op(other, "truediv")
 
     def __rtruediv__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a / b, reverse=True)
+        return self._binary_op(other, "truediv", reverse=True)
 
     def __floordiv__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a // b)
+        return self._binary_op(other, "floordiv")
 
     def __rfloordiv__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a // b, reverse=True)
+        return self._binary_op(other, "floordiv", reverse=True)
 
     def __mod__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a % b)
+        return self._binary_op(other, "mod")
 
     def __rmod__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a % b, reverse=True)
+        return self._binary_op(other, "mod", reverse=True)
 
     def __pow__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a**b)
+        return self._binary_op(other, "pow")
 
     def __rpow__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a**b, reverse=True)
+        return self._binary_op(other, "pow", reverse=True)
 
     def __and__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a & b)
+        return self._binary_op(other, "and_")
 
     def __rand__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a & b, reverse=True)
+        return self._binary_op(other, "and_", reverse=True)
 
     def __or__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a | b)
+        return self._binary_op(other, "or_")
 
     def __ror__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a | b, reverse=True)
+        return self._binary_op(other, "or_", reverse=True)
 
     def __xor__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a ^ b)
+        return self._binary_op(other, "xor")
 
     def __rxor__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a ^ b, reverse=True)
+        return self._binary_op(other, "xor", reverse=True)
 
     def __lt__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a < b)
+        return self._binary_op(other, "lt")
 
     def __le__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a <= b)
+        return self._binary_op(other, "le")
 
     def __gt__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a > b)
+        return self._binary_op(other, "gt")
 
     def __ge__(self, other: ExprLike) -> Reader:
-        return self._binary_op(other, lambda a, b: a >= b)
+        return self._binary_op(other, "ge")
 
     def __eq__(self, other: object) -> Reader:  # type: ignore[override]
-        return self._binary_op(other, lambda a, b: a == b)
+        return self._binary_op(other, "eq")
 
     def __ne__(self, other: object) -> Reader:  # type: ignore[override]
-        return self._binary_op(other, lambda a, b: a != b)
+        return self._binary_op(other, "ne")
 
     def __neg__(self) -> Reader:
-        def wrapper(env: Environment) -> pl.Expr:
-            return -self(env)
-
-        return Reader(wrapper)
+        return Reader(UnaryOp("neg", self.node))
 
     def __pos__(self) -> Reader:
-        def wrapper(env: Environment) -> pl.Expr:
-            return +self(env)
-
-        return Reader(wrapper)
+        return Reader(UnaryOp("pos", self.node))
 
     def __invert__(self) -> Reader:
-        def wrapper(env: Environment) -> pl.Expr:
-            return ~self(env)
+        return Reader(UnaryOp("invert", self.node))
+
+    def _method(self, method: str, *args: Node) -> Reader:
+        return Reader(MethodCall(method, self.node, args))
+
+    def alias(self, name: str) -> Reader:
+        """Rename the output of this reader."""
+        return self._method("alias", Constant(name))
+
+    def over(self, *keys: ExprLike) -> Reader:
+        """Evaluate this reader as a window over the groups in ``keys``.
+
+        Keys are resolved through the environment like any other reader.
+        """
+        return self._method("over", *(self._node_from(key) for key in keys))
+
+    def sum(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.sum`."""
+        return self._method("sum")
+
+    def mean(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.mean`."""
+        return self._method("mean")
+
+    def min(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.min`."""
+        return self._method("min")
+
+    def max(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.max`."""
+        return self._method("max")
+
+    def count(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.count`."""
+        return self._method("count")
+
+    def first(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.first`."""
+        return self._method("first")
 
-        return Reader(wrapper)
+    def last(self) -> Reader:
+        """Aggregate with :meth:`polars.Expr.last`."""
+        return self._method("last")
 
 
 @dataclass(frozen=True)
@@ -187,12 +825,7 @@ class Field:
 
     def __call__(self) -> Reader:
         """Return a reader that resolves the correct column based on the environment."""
-
-        def reader(env: Environment) -> pl.Expr:
-            column = env.resolver.resolve(self.name)
-            return pl.col(column)
-
-        return Reader(reader)
+        return Reader(FieldRef(self.name))
 
 
 # Inputs accepted by Reader._expr_from and map helpers
@@ -203,22 +836,14 @@ def use_prefix(prefix: str) -> Callable[[Reader], Reader]:
     """Force a reader to resolve using ``prefix``."""
 
     def decorator(reader: Reader) -> Reader:
-        def wrapper(env: Environment) -> pl.Expr:
-            return reader(env.with_prefix(prefix))
-
-        return Reader(wrapper)
+        return Reader(PrefixScope(prefix, reader.node))
 
     return decorator
 
 
 def get_data(name: str) -> Reader:
     """Return a reader resolving ``name`` using the environment's resolver."""
-
-    def reader(env: Environment) -> pl.Expr:
-        column = env.resolver.resolve(name)
-        return pl.col(column)
-
-    return Reader(reader)
+    return Reader(FieldRef(name))
 
 
 def field_function(func: Callable[..., Any]) -> Callable[..., Reader]:
@@ -239,23 +864,61 @@ def field_function(func: Callable[..., Any]) -> Callable[..., Reader]:
         A Polars expression representing ``(a + b) * 2``.
     """
 
+    @wraps(func)
     def factory(*args: Any, **kwargs: Any) -> Reader:
-        def reader(env: Environment) -> pl.Expr:
-            call_args = [Reader._expr_from(arg, env) for arg in args]
-            call_kwargs = {
-                key: Reader._expr_from(value, env) for key, value in kwargs.items()
-            }
-            result = func(*call_args, **call_kwargs)
-            return Reader._expr_from(result, env)
-
-        return Reader(reader)
+        return Reader(
+            Call(
+                func,
+                tuple(Reader._node_from(arg) for arg in args),
+                tuple((key, Reader._node_from(value)) for key, value in kwargs.items()),
+            )
+        )
 
     return factory
 
 
-def series_function(func: Callable[..., pl.Series]) -> Callable[..., Reader]:
+def _series_arg(value: Any) -> Node:
+    if isinstance(value, (Reader, Field, pl.Expr)):
+        return Reader._node_from(value)
+    return Constant(value)
+
+
+@overload
+def series_function(func: Callable[..., Any]) -> Callable[..., Reader]: ...
+
+
+@overload
+def series_function(
+    *,
+    numpy: bool = False,
+    elementwise: bool = False,
+    return_dtype: pl.DataType | type[pl.DataType] | None = None,
+    parallel: ChunkedExecutor | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Reader]]: ...
+
+
+def series_function(
+    func: Callable[..., Any] | None = None,
+    *,
+    numpy: bool = False,
+    elementwise: bool = False,
+    return_dtype: pl.DataType | type[pl.DataType] | None = None,
+    parallel: ChunkedExecutor | None = None,
+) -> Any:
     """Wrap ``func`` so it operates on :class:`polars.Series` values.
 
+    Column arguments are passed to ``map_batches`` as separate Series.
+    An ``elementwise`` function of several columns receives them packed into
+    a struct and unnested again, which does not copy data. Options:
+
+    - ``numpy``: pass columns as NumPy arrays, zero-copy when they have no
+      nulls, and convert an array result back to a Series.
+    - ``elementwise``: declare that ``func`` works row by row so Polars can
+      split the input into chunks and use the streaming engine.
+    - ``return_dtype``: the output dtype, declared up front.
+    - ``parallel``: a :class:`ChunkedExecutor` running an ``elementwise``
+      function over row chunks on a thread or process pool.
+
     Example:
         >>> from datadrill import Environment, Field, FieldResolver
         >>> import polars as pl
@@ -267,51 +930,38 @@ def series_function(func: Callable[..., pl.Series]) -> Callable[..., Reader]:
         ...     return (a + b) * factor
         >>> add_and_scale_series(Field("a")(), Field("b")(), factor=2)(env)
         A Polars expression applying ``add_and_scale_series`` to the columns.
+
+        >>> import numpy as np
+        >>> @series_function(numpy=True, elementwise=True, return_dtype=pl.Float64)
+        ... def hypot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        ...     return np.hypot(a, b)
+        >>> hypot(Field("a")(), Field("b")())(env)
+        An elementwise Polars expression evaluated on NumPy views.
     """
 
-    def factory(*args: Any, **kwargs: Any) -> Reader:
-        def reader(env: Environment) -> pl.Expr:
-            exprs = []
-            constants = {}
-
-            for i, value in enumerate(args):
-                name = f"_{i}"
-                if isinstance(value, (Reader, Field)) or isinstance(value, pl.Expr):
-                    exprs.append(Reader._expr_from(value, env).alias(name))
-                else:
-                    constants[name] = value
-
-            for name, value in kwargs.items():
-                if isinstance(value, (Reader, Field)) or isinstance(value, pl.Expr):
-                    exprs.append(Reader._expr_from(value, env).alias(name))
-                else:
-                    constants[name] = value
-
-            struct_expr = pl.struct(exprs)
-
-            def map_fn(struct: pl.Series) -> pl.Series:
-                call_args = []
-                for i in range(len(args)):
-                    name = f"_{i}"
-                    if name in constants:
-                        call_args.append(constants[name])
-                    else:
-                        call_args.append(struct.struct.field(name))
-
-                call_kwargs = {}
-                for key in kwargs.keys():
-                    if key in constants:
-                        call_kwargs[key] = constants[key]
-                    else:
-                        call_kwargs[key] = struct.struct.field(key)
-
-                return func(*call_args, **call_kwargs)
-
-            return struct_expr.map_batches(map_fn)
-
-        return Reader(reader)
+    if parallel is not None and not elementwise:
+        raise ValueError("parallel execution requires elementwise=True")
 
-    return factory
+    def decorate(func: Callable[..., Any]) -> Callable[..., Reader]:
+        @wraps(func)
+        def factory(*args: Any, **kwargs: Any) -> Reader:
+            return Reader(
+                SeriesCall(
+                    func,
+                    tuple(_series_arg(arg) for arg in args),
+                    tuple((key, _series_arg(value)) for key, value in kwargs.items()),
+                    numpy=numpy,
+                    elementwise=elementwise,
+                    return_dtype=return_dtype,
+                    parallel=parallel,
+                )
+            )
+
+        return factory
+
+    if func is None:
+        return decorate
+    return decorate(func)
 
 
 def map(
@@ -327,13 +977,7 @@ def map(
         >>> increment(env)
         A Polars expression adding ``1`` to column ``a``.
     """
-
-    def wrapper(env: Environment) -> pl.Expr:
-        value = Reader._expr_from(reader, env)
-        result = func(value)
-        return Reader._expr_from(result, env)
-
-    return Reader(wrapper)
+    return Reader(Call(func, (Reader._node_from(reader),)))
 
 
 def map2(
@@ -350,39 +994,19 @@ def map2(
         >>> combine(env)
         A Polars expression representing ``a + b``.
     """
-
-    def wrapper(env: Environment) -> pl.Expr:
-        value1 = Reader._expr_from(reader1, env)
-        value2 = Reader._expr_from(reader2, env)
-        result = func(value1, value2)
-        return Reader._expr_from(result, env)
-
-    return Reader(wrapper)
+    return Reader(Call(func, (Reader._node_from(reader1), Reader._node_from(reader2))))
 
 
 def ask() -> Reader:
     """Return the current :class:`Environment`."""
-
-    def reader(env: Environment) -> Environment:
-        return env
-
-    return Reader(reader)
+    return Reader(Ask())
 
 
 def asks(func: Callable[[Environment], ExprLike]) -> Reader:
     """Transform the environment into an expression using ``func``."""
-
-    def reader(env: Environment) -> pl.Expr:
-        value = func(env)
-        return Reader._expr_from(value, env)
-
-    return Reader(reader)
+    return Reader(Asks(func))
 
 
 def pure(value: ExprLike) -> Reader:
     """Return a reader that always yields ``value``."""
-
-    def reader(env: Environment) -> pl.Expr:
-        return Reader._expr_from(value, env)
-
-    return Reader(reader)
+    return Reader(Reader._node_from(value))
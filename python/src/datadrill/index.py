@@ -0,0 +1,160 @@
+"""Skip rows of a resident frame using a sorted column and zone maps."""
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import polars as pl
+
+from .field import BinaryOp, Environment, Literal, Node, conjuncts
+
+# Comparisons with the field on the right, rewritten with it on the left.
+_FLIPPED = {"lt": "gt", "le": "ge", "gt": "lt", "ge": "le", "eq": "eq"}
+
+Bound = tuple[str, str, Any]
+
+
+def _column(node: Node, env: Environment) -> str | None:
+    if isinstance(node, Literal):
+        return None
+    expr = node.lower(env)
+    return expr.meta.output_name() if expr.meta.is_column() else None
+
+
+def _bound(node: Node, env: Environment) -> Bound | None:
+    """Return ``(column, op, value)`` when ``node`` compares a column to a value."""
+    if not isinstance(node, BinaryOp) or node.op not in _FLIPPED:
+        return None
+    if isinstance(node.right, Literal) and node.right.value is not None:
+        column = _column(node.left, env)
+        if column is not None:
+            return column, node.op, node.right.value
+    if isinstance(node.left, Literal) and node.left.value is not None:
+        column = _column(node.right, env)
+        if column is not None:
+            return column, _FLIPPED[node.op], node.left.value
+    return None
+
+
+def _zone_keep(column: str, op: str, value: Any) -> pl.Expr:
+    low, high = pl.col(f"min:{column}"), pl.col(f"max:{column}")
+    if op == "eq":
+        return (low <= value) & (high >= value)
+    if op in ("gt", "ge"):
+        return getattr(operator, op)(high, value)
+    return getattr(operator, op)(low, value)
+
+
+@dataclass(frozen=True)
+class FrameIndex:
+    """A sorted column and per-chunk min/max of columns of an eager frame.
+
+    Built by :meth:`DataFrame.with_index`. Before a plan runs, comparisons of
+    indexed columns with constants in its leading filters narrow the input:
+    on ``sorted_by`` to one slice found by binary search, and on zone-mapped
+    columns to the chunks of ``chunk_size`` rows whose range may match. The
+    filters still run on the remaining rows, so results are unchanged.
+    """
+
+    df: pl.DataFrame
+    sorted_by: str | None = None
+    zones: pl.DataFrame | None = None
+    chunk_size: int = 65_536
+
+    @classmethod
+    def build(
+        cls,
+        df: pl.DataFrame,
+        sorted_by: str | None = None,
+        zone_maps: Sequence[str] = (),
+        chunk_size: int = 65_536,
+    ) -> FrameIndex:
+        """Index ``df``; ``sorted_by`` must be sorted ascending without nulls."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if sorted_by is not None:
+            column = df.get_column(sorted_by)
+            if column.null_count() or not column.is_sorted():
+                raise ValueError(
+                    f"{sorted_by} must be sorted ascending without nulls to index"
+                )
+        zones = None
+        if zone_maps:
+            chunk = (pl.int_range(pl.len()) // chunk_size).alias("chunk")
+            zones = (
+                df.group_by(chunk, maintain_order=True)
+                .agg(
+                    *(pl.col(c).min().alias(f"min:{c}") for c in zone_maps),
+                    *(pl.col(c).max().alias(f"max:{c}") for c in zone_maps),
+                )
+                .sort("chunk")
+            )
+        return cls(df, sorted_by, zones, chunk_size)
+
+    def _zone_columns(self) -> set[str]:
+        if self.zones is None:
+            return set()
+        return {name[4:] for name in self.zones.columns if name.startswith("min:")}
+
+    def ranges(self, bounds: Sequence[Bound]) -> list[tuple[int, int]] | None:
+        """Return the ``(start, end)`` row ranges that may satisfy ``bounds``.
+
+        ``None`` means no bound applies to an indexed column.
+        """
+        start, end = 0, self.df.height
+        used = False
+        if self.sorted_by is not None:
+            column = self.df.get_column(self.sorted_by)
+            for name, op, value in bounds:
+                if name != self.sorted_by:
+                    continue
+                used = True
+                if op in ("gt", "ge", "eq"):
+                    side = "right" if op == "gt" else "left"
+                    start = max(start, int(column.search_sorted(value, side)))
+                if op in ("lt", "le", "eq"):
+                    side = "left" if op == "lt" else "right"
+                    end = min(end, int(column.search_sorted(value, side)))
+        ranges = [(start, end)] if start < end else []
+
+        zoned = self._zone_columns()
+        keep = [_zone_keep(*bound) for bound in bounds if bound[0] in zoned]
+        if keep and ranges and self.zones is not None:
+            used = True
+            chunks = self.zones.filter(*keep).get_column("chunk").to_list()
+            size = self.chunk_size
+            ranges = []
+            for chunk in chunks:
+                lo, hi = max(chunk * size, start), min((chunk + 1) * size, end)
+                if lo >= hi:
+                    continue
+                if ranges and ranges[-1][1] == lo:
+                    ranges[-1] = (ranges[-1][0], hi)
+                else:
+                    ranges.append((lo, hi))
+        return ranges if used else None
+
+    def scan(self, filters: Sequence[Node], env: Environment) -> pl.LazyFrame:
+        """Return the rows of the indexed frame that ``filters`` may keep.
+
+        ``filters`` apply in order. Bounds are taken from those ahead of the
+        first that is not row-local, since an aggregation or window in it
+        would see only the remaining rows.
+        """
+        bounds = []
+        for predicate in filters:
+            if not predicate.row_local:
+                break
+            for node in conjuncts(predicate):
+                bound = _bound(node, env)
+                if bound is not None:
+                    bounds.append(bound)
+        ranges = self.ranges(bounds)
+        if ranges is None:
+            return self.df.lazy()
+        if not ranges:
+            return self.df.clear().lazy()
+        parts = [self.df.slice(start, end - start) for start, end in ranges]
+        return pl.concat(parts, rechunk=False).lazy()
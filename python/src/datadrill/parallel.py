@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import io
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Callable, Literal, Sequence
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class SeriesBatch:
+    """Call a series function on one batch of columns.
+
+    ``slots`` lists every argument in order: ``(True, i)`` for the ``i``-th
+    column and ``(False, value)`` for a constant. The first ``n_args`` slots are
+    positional and the rest are passed as ``keys``.
+
+    Pickling stores ``func`` by module and qualified name, so a batch can be
+    sent to worker processes as long as ``func`` is defined at module level.
+    """
+
+    func: Callable[..., Any]
+    slots: tuple[tuple[bool, Any], ...]
+    n_args: int
+    keys: tuple[str, ...]
+    numpy: bool = False
+    return_dtype: Any = None
+
+    def __call__(self, columns: Sequence[pl.Series]) -> pl.Series:
+        if self.numpy:
+            # Zero-copy for single-chunk numeric data without nulls.
+            columns = [column.to_numpy() for column in columns]
+        values = [columns[v] if is_column else v for is_column, v in self.slots]
+        positional, named = values[: self.n_args], values[self.n_args :]
+        result = self.func(*positional, **dict(zip(self.keys, named)))
+        if self.numpy and not isinstance(result, pl.Series):
+            result = pl.Series("_0", result, dtype=self.return_dtype)
+        return result
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        module = self.func.__module__
+        qualname = self.func.__qualname__
+        if "<locals>" in qualname:
+            raise ValueError(
+                f"{qualname} must be defined at module level to run in a process"
+            )
+        fields = (self.slots, self.n_args, self.keys, self.numpy, self.return_dtype)
+        return (_restore_batch, (module, qualname, *fields))
+
+
+def _restore_batch(module: str, qualname: str, *fields: Any) -> SeriesBatch:
+    func: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        func = getattr(func, part)
+    # The module attribute is usually the decorated factory; unwrap it to get
+    # back the original function.
+    return SeriesBatch(inspect.unwrap(func), *fields)
+
+
+def _to_ipc(columns: Sequence[pl.Series]) -> bytes:
+    return pl.DataFrame(columns).write_ipc(None).getvalue()
+
+
+def _from_ipc(payload: bytes) -> list[pl.Series]:
+    return pl.read_ipc(io.BytesIO(payload)).get_columns()
+
+
+def _run_ipc_chunk(batch: SeriesBatch, payload: bytes) -> bytes:
+    return _to_ipc([batch(_from_ipc(payload))])
+
+
+@lru_cache(maxsize=None)
+def _pool(kind: str, max_workers: int | None) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers)
+    # Forking a process that runs Polars' thread pool can deadlock.
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers, mp_context=context)
+
+
+@dataclass(frozen=True)
+class ChunkedExecutor:
+    """Run elementwise series functions over row chunks in parallel.
+
+    The input columns are split into zero-copy slices of ``chunk_size`` rows
+    and the results are concatenated back in row order.
+
+    - ``kind="thread"`` suits functions that release the GIL, such as NumPy
+      code. Chunks are shared in memory.
+    - ``kind="process"`` suits pure-Python functions. Chunks and results are
+      sent as Arrow IPC buffers, and the function must be defined at module
+      level so workers can import it.
+
+    Pools are created on first use and shared by executors with the same
+    ``kind`` and ``max_workers``.
+    """
+
+    kind: Literal["thread", "process"] = "thread"
+    chunk_size: int = 100_000
+    max_workers: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"unknown executor kind: {self.kind!r}")
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+    def map(self, batch: SeriesBatch, columns: Sequence[pl.Series]) -> pl.Series:
+        """Return ``batch(columns)`` computed chunk by chunk."""
+        height = len(columns[0]) if columns else 0
+        if height <= self.chunk_size:
+            return batch(columns)
+
+        size = self.chunk_size
+        chunks = [
+            [column.slice(offset, size) for column in columns]
+            for offset in range(0, height, size)
+        ]
+        pool = _pool(self.kind, self.max_workers)
+        if self.kind == "thread":
+            parts = list(pool.map(batch, chunks))
+        else:
+            payloads = [_to_ipc(chunk) for chunk in chunks]
+            results = pool.map(_run_ipc_chunk, repeat(batch), payloads)
+            parts = [_from_ipc(result)[0] for result in results]
+        return pl.concat(parts)
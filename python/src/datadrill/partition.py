@@ -0,0 +1,191 @@
+"""Run :class:`DataFrame` plans partition by partition over Parquet files."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from glob import glob
+from pathlib import Path
+from typing import Literal, Sequence
+
+import polars as pl
+
+from .dataframe import DataFrame
+from .field import Environment, PolarsExpr, Reader, conjuncts
+from .parallel import _pool
+from .serialize import deserialize_plan, serialize_plan
+
+_SORT_KEY = "__datadrill_sort_key"
+_HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One Parquet file and the hive ``key=value`` pairs in its path."""
+
+    path: str
+    keys: tuple[tuple[str, str | None], ...] = ()
+
+
+def _hive_keys(path: Path, root: Path) -> tuple[tuple[str, str | None], ...]:
+    keys = []
+    for part in path.relative_to(root).parent.parts:
+        key, sep, value = part.partition("=")
+        if sep:
+            keys.append((key, None if value == _HIVE_NULL else value))
+    return tuple(keys)
+
+
+def _run_partition(
+    payload: bytes, partition: Partition, schema: pl.Schema, env: Environment
+) -> pl.DataFrame:
+    keys = [pl.lit(value).cast(schema[key]).alias(key) for key, value in partition.keys]
+    source = pl.scan_parquet(partition.path).with_columns(keys).select(schema.names())
+    return deserialize_plan(payload, source).run(env)
+
+
+def _merge_sorted(parts: Sequence[pl.DataFrame]) -> pl.DataFrame:
+    """Merge frames sorted ascending by the sort key, pairwise in rounds."""
+    while len(parts) > 1:
+        merged = [a.merge_sorted(b, _SORT_KEY) for a, b in zip(parts[::2], parts[1::2])]
+        parts = merged + list(parts[len(parts) // 2 * 2 :])
+    return parts[0]
+
+
+@dataclass(frozen=True)
+class Partitions:
+    """A hive-partitioned Parquet dataset run one file at a time.
+
+    Build plans on :meth:`frame`, which scans every file as one input, and
+    execute them with :meth:`run`. Files whose partition keys cannot satisfy
+    the plan's filters are skipped, and each remaining file is read and run
+    through the plan by a worker, so memory holds about one partition per
+    worker instead of the whole dataset.
+    """
+
+    partitions: tuple[Partition, ...]
+
+    @classmethod
+    def discover(cls, root: str | Path, pattern: str = "**/*.parquet") -> Partitions:
+        """Return the files under ``root`` matching ``pattern``, in path order.
+
+        Directory names of the form ``key=value`` become partition keys.
+        """
+        root = Path(root)
+        paths = sorted(Path(p) for p in glob(str(root / pattern), recursive=True))
+        return cls(tuple(Partition(str(p), _hive_keys(p, root)) for p in paths))
+
+    def scan(self) -> pl.LazyFrame:
+        """Return every partition as one lazy scan with the key columns."""
+        if not self.partitions:
+            raise ValueError("no partitions to scan")
+        paths = [partition.path for partition in self.partitions]
+        return pl.scan_parquet(paths, hive_partitioning=True)
+
+    def frame(self) -> DataFrame:
+        """Return a :class:`DataFrame` over :meth:`scan` to build plans on."""
+        return DataFrame(self.scan())
+
+    def prune(
+        self, frame: DataFrame, env: Environment | None = None
+    ) -> tuple[Partition, ...]:
+        """Return the partitions that may contribute rows to ``frame``.
+
+        Conditions of the plan's leading filters that only read partition key
+        columns are evaluated on each file's key values; files where any of
+        them is false or null are left out.
+        """
+        if env is None:
+            env = frame._default_env()
+        schema = self.scan().collect_schema()
+        predicates = []
+        for op in frame._ops:
+            if not op.keep_columns:
+                break
+            if op.name != "filter":
+                continue
+            for node in conjuncts(op.nodes[0]):
+                if not node.row_local:
+                    continue
+                expr = node.lower(env)
+                roots = set(expr.meta.root_names())
+                if roots and all(dict(p.keys).keys() >= roots for p in self.partitions):
+                    predicates.append(expr)
+        if not predicates:
+            return self.partitions
+
+        kept = []
+        for partition in self.partitions:
+            values = pl.DataFrame(
+                [pl.Series(k, [v]).cast(schema[k]) for k, v in partition.keys]
+            )
+            if all(values.select(p).item() is True for p in predicates):
+                kept.append(partition)
+        return tuple(kept)
+
+    def run(
+        self,
+        frame: DataFrame,
+        env: Environment | None = None,
+        *,
+        kind: Literal["thread", "process"] = "process",
+        max_workers: int | None = None,
+    ) -> pl.DataFrame:
+        """Run ``frame`` on every unpruned partition and combine the results.
+
+        ``frame`` is a plan built on :meth:`frame`. Its operations must be
+        row-local except for a final ``sort``, which runs per partition.
+        Ascending sorted outputs are merged instead of sorted again, and
+        descending ones are concatenated and sorted. Results otherwise keep
+        partition order. The plan reaches workers through
+        :func:`~datadrill.serialize_plan`, so field and series functions in
+        it must be registered.
+
+        The default ``kind="process"`` starts workers with ``spawn``, which
+        only see functions registered at import time of modules they can
+        import. Functions defined in ``__main__``, a notebook or a test module
+        are missing there; run plans using them with ``kind="thread"``.
+        """
+        if env is None:
+            env = frame._default_env()
+        ops = frame._ops
+        sort = ops[-1] if ops and ops[-1].name == "sort" else None
+        body = DataFrame(frame.df, ops[:-1] if sort else ops)
+        body._check_row_local("run per partition")
+
+        partitions = self.prune(frame, env)
+        if not partitions:
+            return frame.lazy(env).head(0).collect()
+
+        descending = False
+        plan = body
+        if sort is not None:
+            (descending,) = sort.params
+            key = Reader(sort.nodes[0]).alias(_SORT_KEY)
+            plan = plan.with_columns(key).sort(
+                Reader(PolarsExpr(pl.col(_SORT_KEY))), descending=descending
+            )
+
+        payload = serialize_plan(plan)
+        schema = self.scan().collect_schema()
+        pool = _pool(kind, max_workers)
+        count = len(partitions)
+        parts = list(
+            pool.map(
+                _run_partition,
+                [payload] * count,
+                partitions,
+                [schema] * count,
+                [env] * count,
+            )
+        )
+        if sort is None:
+            return pl.concat(parts)
+        if descending:
+            # ``merge_sorted`` only merges ascending keys, and reversing the
+            # parts would move their leading nulls to the end.
+            result = pl.concat(parts).sort(
+                _SORT_KEY, descending=True, maintain_order=True
+            )
+        else:
+            result = _merge_sorted(parts)
+        return result.drop(_SORT_KEY)
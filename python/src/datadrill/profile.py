@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class OpProfile:
+    """Timings and sizes recorded for one operation of a plan.
+
+    ``lower_seconds`` is the time spent building and resolving the
+    operation's readers. The execution fields are only measured when
+    operations run one at a time; in a fused plan they are ``None`` and the
+    Polars node timings of :attr:`Profile.nodes` break down execution instead.
+    """
+
+    index: int
+    name: str
+    lower_seconds: float | None = None
+    execute_seconds: float | None = None
+    rows_in: int | None = None
+    rows_out: int | None = None
+    bytes_out: int | None = None
+
+
+@dataclass(frozen=True)
+class Profile:
+    """What a profiled run spent its time on; see :meth:`DataFrame.profile`.
+
+    ``nodes`` holds the ``node``/``start``/``end`` timings in microseconds
+    reported by :meth:`polars.LazyFrame.profile` for a fused plan, or
+    ``None`` when there was nothing for Polars to time.
+    """
+
+    ops: tuple[OpProfile, ...]
+    lower_seconds: float
+    execute_seconds: float
+    rows_out: int
+    bytes_out: int
+    nodes: pl.DataFrame | None = None
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Return one flat record per operation for exporting as metrics."""
+        return [asdict(op) for op in self.ops]
+
+
+ProfileHook = Callable[[Profile], None]
@@ -0,0 +1,108 @@
+"""Run readers and plans on the Rust engine in ``datadrill_rs``.
+
+The extension is optional; build it with
+``maturin develop --manifest-path rust/Cargo.toml -F extension-module``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import polars as pl
+
+from .cache import Cached
+from .dataframe import DataFrame
+from .field import (
+    BinaryOp,
+    Constant,
+    Environment,
+    ExprLike,
+    FieldRef,
+    Literal,
+    MethodCall,
+    Node,
+    PolarsExpr,
+    PrefixScope,
+    Reader,
+    UnaryOp,
+)
+
+
+def _engine() -> Any:
+    try:
+        import datadrill_rs
+    except ImportError as exc:  # pragma: no cover - depends on the build
+        raise ImportError(
+            "the Rust engine is not built; run `maturin develop --manifest-path "
+            "rust/Cargo.toml -F extension-module`"
+        ) from exc
+    return datadrill_rs
+
+
+def to_rust_environment(env: Environment) -> Any:
+    """Return ``env`` as a ``datadrill_rs.Environment``."""
+    rs = _engine()
+    resolver = env.resolver
+    return rs.Environment(rs.FieldResolver(list(resolver.schema), resolver.prefix))
+
+
+def to_rust_reader(value: ExprLike) -> Any:
+    """Return ``value`` as a ``datadrill_rs.Reader``.
+
+    Fields, literals, Polars expressions, operators, ``use_prefix`` and
+    ``alias`` convert. Readers that call back into Python, such as series
+    functions, :func:`~datadrill.map` or :func:`~datadrill.asks`, raise
+    ``TypeError``.
+    """
+    return _convert(Reader._node_from(value), _engine())
+
+
+def _convert(node: Node, rs: Any) -> Any:
+    if isinstance(node, FieldRef):
+        return rs.Reader.field(node.name)
+    if isinstance(node, Literal):
+        return rs.Reader.expr(pl.lit(node.value))
+    if isinstance(node, PolarsExpr):
+        return rs.Reader.expr(node.expr)
+    if isinstance(node, BinaryOp):
+        return _convert(node.left, rs).binary(node.op, _convert(node.right, rs))
+    if isinstance(node, UnaryOp):
+        return _convert(node.operand, rs).unary(node.op)
+    if isinstance(node, PrefixScope):
+        return _convert(node.child, rs).use_prefix(node.prefix)
+    if isinstance(node, Cached):
+        return _convert(node.child, rs)
+    if (
+        isinstance(node, MethodCall)
+        and node.method == "alias"
+        and isinstance(node.args[0], Constant)
+    ):
+        return _convert(node.receiver, rs).alias(node.args[0].value)
+    raise TypeError(f"{type(node).__name__} readers cannot run in Rust")
+
+
+def to_rust(frame: DataFrame) -> Any:
+    """Return ``frame`` as a ``datadrill_rs.DataFrameOps``.
+
+    Its operations must be ``filter``, ``select`` or ``sort``. Running the
+    result resolves fields and executes the plan in Rust as a single lazy
+    query with the GIL released. Eager frames are shared without copying and
+    lazy sources such as scans keep their pushdown.
+    """
+    rs = _engine()
+    if isinstance(frame.df, pl.LazyFrame):
+        ops = rs.DataFrameOps.from_lazy(frame.df)
+    else:
+        ops = rs.DataFrameOps(frame.df)
+    for op in frame._ops:
+        readers = [_convert(node, rs) for node in op.nodes]
+        if op.name == "filter":
+            ops = ops.filter(readers[0])
+        elif op.name == "select":
+            ops = ops.select(readers)
+        elif op.name == "sort":
+            (descending,) = op.params
+            ops = ops.sort(readers[0], descending)
+        else:
+            raise ValueError(f"{op.name} is not supported by the Rust engine")
+    return ops
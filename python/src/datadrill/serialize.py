@@ -0,0 +1,275 @@
+"""Serialize :class:`DataFrame` plans as JSON or compact binary payloads.
+
+A payload records the plan's operations and readers, not the data, so a
+worker holding the same input can rebuild the plan without importing or
+running the code that built it. Readers made of fields, literals, Polars
+expressions, operators, ``use_prefix`` and expression methods serialize as
+they are. Field and series functions serialize by name once registered with
+:func:`register_function`; lambdas passed to :func:`~datadrill.map` or
+:func:`~datadrill.asks` cannot be serialized.
+"""
+
+from __future__ import annotations
+
+import inspect
+import io
+import json
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Literal as LiteralType, TypeVar
+
+import polars as pl
+
+from .cache import Cached
+from .dataframe import DataFrame, _Op
+from .field import (
+    BinaryOp,
+    Call,
+    Constant,
+    FieldRef,
+    Literal,
+    MethodCall,
+    Node,
+    PolarsExpr,
+    PrefixScope,
+    Reader,
+    SeriesCall,
+    UnaryOp,
+)
+from .parallel import ChunkedExecutor
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+Format = LiteralType["json", "binary"]
+
+VERSION = 1
+_MAGIC = b"DDP1"
+_SCALARS = (bool, int, float, str, type(None))
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {}
+_NAMES: dict[Callable[..., Any], str] = {}
+
+
+def register_function(func: F | None = None, *, name: str | None = None) -> Any:
+    """Register a field or series function so plans using it can serialize.
+
+    Use it as a decorator above :func:`~datadrill.field_function` or
+    :func:`~datadrill.series_function`. Payloads refer to the function by
+    ``name``, which defaults to its module and qualified name, so the worker
+    must register the same function under the same name.
+
+    Example:
+        >>> from datadrill import field_function
+        >>> @register_function
+        ... @field_function
+        ... def add_and_scale(a, b, factor):
+        ...     return (a + b) * factor
+    """
+
+    def register(func: F) -> F:
+        original = inspect.unwrap(func)
+        key = name or f"{original.__module__}.{original.__qualname__}"
+        registered = _FUNCTIONS.get(key)
+        if registered is not None and registered is not original:
+            raise ValueError(f"a different function is registered as {key!r}")
+        _FUNCTIONS[key] = original
+        _NAMES[original] = key
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def _function_name(func: Callable[..., Any]) -> str:
+    try:
+        return _NAMES[func]
+    except KeyError:
+        raise ValueError(
+            f"{getattr(func, '__qualname__', func)!r} is not registered; "
+            "decorate it with register_function"
+        ) from None
+
+
+def _function(name: str) -> Callable[..., Any]:
+    try:
+        return _FUNCTIONS[name]
+    except KeyError:
+        raise ValueError(f"no function is registered as {name!r}") from None
+
+
+def _scalar(value: Any) -> Any:
+    if not isinstance(value, _SCALARS):
+        raise TypeError(f"cannot serialize {type(value).__name__} value {value!r}")
+    return value
+
+
+def _dtype_name(dtype: Any) -> str | None:
+    if dtype is None:
+        return None
+    if dtype != dtype.base_type():
+        raise TypeError(f"cannot serialize parameterised dtype {dtype}")
+    return dtype.base_type().__name__
+
+
+def _encode_node(node: Node) -> dict[str, Any]:
+    if isinstance(node, FieldRef):
+        return {"field": node.name}
+    if isinstance(node, Literal):
+        return {"lit": _scalar(node.value)}
+    if isinstance(node, Constant):
+        return {"const": _scalar(node.value)}
+    if isinstance(node, PolarsExpr):
+        return {"expr": json.loads(node.expr.meta.serialize(format="json"))}
+    if isinstance(node, (BinaryOp, UnaryOp)):
+        return {"op": node.op, "args": [_encode_node(c) for c in node.children()]}
+    if isinstance(node, PrefixScope):
+        return {"prefix": node.prefix, "child": _encode_node(node.child)}
+    if isinstance(node, MethodCall):
+        return {"method": node.method, "args": _encode_nodes(node.children())}
+    if isinstance(node, Cached):
+        # The cache is local to the process; the child lowers to the same
+        # expression.
+        return _encode_node(node.child)
+    if isinstance(node, (Call, SeriesCall)):
+        encoded: dict[str, Any] = {
+            "call": _function_name(node.func),
+            "args": _encode_nodes(node.args),
+            "kwargs": [[key, _encode_node(value)] for key, value in node.kwargs],
+        }
+        if isinstance(node, SeriesCall):
+            parallel = node.parallel
+            encoded["series"] = {
+                "numpy": node.numpy,
+                "elementwise": node.elementwise,
+                "return_dtype": _dtype_name(node.return_dtype),
+                "parallel": (
+                    None
+                    if parallel is None
+                    else [parallel.kind, parallel.chunk_size, parallel.max_workers]
+                ),
+            }
+        return encoded
+    raise TypeError(f"{type(node).__name__} readers cannot be serialized")
+
+
+def _encode_nodes(nodes: tuple[Node, ...]) -> list[dict[str, Any]]:
+    return [_encode_node(node) for node in nodes]
+
+
+def _decode_node(data: dict[str, Any]) -> Node:
+    if "field" in data:
+        return FieldRef(data["field"])
+    if "lit" in data:
+        return Literal(data["lit"])
+    if "const" in data:
+        return Constant(data["const"])
+    if "expr" in data:
+        source = io.StringIO(json.dumps(data["expr"]))
+        return PolarsExpr(pl.Expr.deserialize(source, format="json"))
+    if "op" in data:
+        args = _decode_nodes(data["args"])
+        if len(args) == 1:
+            return UnaryOp(data["op"], args[0])
+        return BinaryOp(data["op"], *args)
+    if "prefix" in data:
+        return PrefixScope(data["prefix"], _decode_node(data["child"]))
+    if "method" in data:
+        receiver, *args = _decode_nodes(data["args"])
+        return MethodCall(data["method"], receiver, tuple(args))
+    if "call" in data:
+        func = _function(data["call"])
+        args = _decode_nodes(data["args"])
+        kwargs = tuple((key, _decode_node(value)) for key, value in data["kwargs"])
+        series = data.get("series")
+        if series is None:
+            return Call(func, args, kwargs)
+        dtype = series["return_dtype"]
+        parallel = series["parallel"]
+        return SeriesCall(
+            func,
+            args,
+            kwargs,
+            numpy=series["numpy"],
+            elementwise=series["elementwise"],
+            return_dtype=None if dtype is None else getattr(pl, dtype),
+            parallel=None if parallel is None else ChunkedExecutor(*parallel),
+        )
+    raise ValueError(f"unknown node in plan: {data!r}")
+
+
+def _decode_nodes(data: list[dict[str, Any]]) -> tuple[Node, ...]:
+    return tuple(_decode_node(item) for item in data)
+
+
+def _encode_op(op: _Op) -> dict[str, Any]:
+    encoded: dict[str, Any] = {"op": op.name, "nodes": _encode_nodes(op.nodes)}
+    if op.name == "sort":
+        (encoded["descending"],) = op.params
+    elif op.name == "group_by":
+        encoded["keys"], encoded["maintain_order"] = op.params
+    elif op.name not in ("filter", "select", "with_columns"):
+        raise ValueError(f"{op.name} operations cannot be serialized")
+    return encoded
+
+
+def _decode_op(frame: DataFrame, data: dict[str, Any]) -> DataFrame:
+    name = data["op"]
+    readers = [Reader(node) for node in _decode_nodes(data["nodes"])]
+    if name == "filter":
+        return frame.filter(readers[0])
+    if name == "select":
+        return frame.select(*readers)
+    if name == "with_columns":
+        return frame.with_columns(*readers)
+    if name == "sort":
+        return frame.sort(readers[0], descending=data["descending"])
+    if name == "group_by":
+        n_keys = data["keys"]
+        grouped = frame.group_by(
+            *readers[:n_keys], maintain_order=data["maintain_order"]
+        )
+        return grouped.agg(*readers[n_keys:])
+    raise ValueError(f"unknown operation in plan: {name!r}")
+
+
+def serialize_plan(frame: DataFrame, format: Format = "binary") -> bytes | str:
+    """Return the operations of ``frame`` as a payload.
+
+    ``format="json"`` returns a readable string and ``format="binary"`` the
+    same document compressed into bytes. The input data is not included;
+    joins, which carry another frame, raise ``ValueError``.
+    """
+    document = {"version": VERSION, "ops": [_encode_op(op) for op in frame._ops]}
+    text = json.dumps(document, separators=(",", ":"))
+    if format == "json":
+        return text
+    if format == "binary":
+        return _MAGIC + zlib.compress(text.encode())
+    raise ValueError(f"unknown format: {format!r}")
+
+
+@lru_cache(maxsize=256)
+def _decode_ops(payload: bytes | str) -> tuple[_Op, ...]:
+    if isinstance(payload, bytes):
+        if not payload.startswith(_MAGIC):
+            raise ValueError("not a binary DataDrill plan")
+        payload = zlib.decompress(payload[len(_MAGIC) :]).decode()
+    document = json.loads(payload)
+    if document.get("version") != VERSION:
+        raise ValueError(f"unsupported plan version: {document.get('version')!r}")
+    frame = DataFrame(pl.DataFrame())
+    for data in document["ops"]:
+        frame = _decode_op(frame, data)
+    return tuple(frame._ops)
+
+
+def deserialize_plan(
+    payload: bytes | str, df: pl.DataFrame | pl.LazyFrame
+) -> DataFrame:
+    """Return the plan in ``payload`` applied to ``df``.
+
+    Decoded plans are cached by payload, so a worker receiving the same plan
+    for many inputs decodes it once.
+    """
+    return DataFrame(df, list(_decode_ops(payload)))
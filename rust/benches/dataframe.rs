@@ -0,0 +1,141 @@
+//! `DataFrameOps` timings matching the Python suite in `benchmarks/suite.py`.
+//!
+//! Run with `cargo bench --manifest-path rust/Cargo.toml --bench dataframe`.
+//! Each case prints one JSON line; pass `-- --quick` for smaller inputs.
+//! `*_closure_chain` cases time the same readers built from closures, as
+//! before the expression IR, so one run shows the IR's effect.
+
+use datadrill::{DataFrameOps, Environment, Field, FieldResolver, Reader};
+use polars::prelude::*;
+use std::hint::black_box;
+use std::time::Instant;
+
+const REPEAT: usize = 5;
+
+fn make_frame(rows: usize, cols: usize) -> DataFrame {
+    let columns = (0..cols)
+        .map(|c| {
+            let values: Vec<i64> = (0..rows as i64)
+                .map(|i| (i * 31 + c as i64 * 7) % 1000)
+                .collect();
+            Column::new(format!("col{c}").into(), values)
+        })
+        .collect();
+    DataFrame::new(columns).unwrap()
+}
+
+fn chain(depth: i32) -> Reader<Expr> {
+    let mut reader = Field::new("col0").reader();
+    for i in 0..depth {
+        reader = reader + i;
+    }
+    reader
+}
+
+/// `chain` built the way readers were before the expression IR: one closure
+/// per operator that resolves its field and re-lowers its operands per run.
+fn closure_chain(depth: i32) -> Reader<Expr> {
+    let mut reader = Reader::new(|env: &Environment| col(env.resolver().resolve("col0").unwrap()));
+    for i in 0..depth {
+        let inner = reader;
+        reader = Reader::new(move |env| inner.run(env) + lit(i).cast(DataType::Int32));
+    }
+    reader
+}
+
+fn balanced(leaves: usize) -> Reader<Expr> {
+    let mut readers: Vec<Reader<Expr>> = (0..leaves)
+        .map(|i| Field::new(format!("col{}", i % 10)).reader())
+        .collect();
+    while readers.len() > 1 {
+        let odd = (readers.len() % 2 == 1).then(|| readers.pop().unwrap());
+        let mut pairs = Vec::with_capacity(readers.len() / 2 + 1);
+        let mut iter = readers.into_iter();
+        while let (Some(a), Some(b)) = (iter.next(), iter.next()) {
+            pairs.push(a + b);
+        }
+        pairs.extend(odd);
+        readers = pairs;
+    }
+    readers.pop().unwrap()
+}
+
+/// Print the best seconds per call of `func` over `REPEAT` timings.
+fn report<F: FnMut()>(name: &str, number: usize, mut func: F) {
+    let mut best = f64::INFINITY;
+    for _ in 0..REPEAT {
+        let start = Instant::now();
+        for _ in 0..number {
+            func();
+        }
+        best = best.min(start.elapsed().as_secs_f64() / number as f64);
+    }
+    println!("{{\"name\": \"{name}\", \"seconds\": {best:e}, \"number\": {number}}}");
+}
+
+fn main() {
+    let quick = std::env::args().any(|arg| arg == "--quick");
+
+    let columns: Vec<String> = (0..10).map(|i| format!("col{i}")).collect();
+    let env = Environment::new(FieldResolver::new(columns));
+    for depth in [50, 250] {
+        report(&format!("reader/build_chain/depth={depth}"), 100, || {
+            black_box(chain(depth));
+        });
+        let reader = chain(depth);
+        report(&format!("reader/lower_chain/depth={depth}"), 100, || {
+            black_box(reader.run(&env));
+        });
+        // The same trees as closures, the representation the IR replaced.
+        report(
+            &format!("reader/build_closure_chain/depth={depth}"),
+            100,
+            || {
+                black_box(closure_chain(depth));
+            },
+        );
+        let reader = closure_chain(depth);
+        report(
+            &format!("reader/lower_closure_chain/depth={depth}"),
+            100,
+            || {
+                black_box(reader.run(&env));
+            },
+        );
+    }
+
+    let leaves_sizes: &[usize] = if quick { &[256] } else { &[256, 4096] };
+    for &leaves in leaves_sizes {
+        report(
+            &format!("reader/build_balanced/leaves={leaves}"),
+            10,
+            || {
+                black_box(balanced(leaves));
+            },
+        );
+        let reader = balanced(leaves);
+        report(
+            &format!("reader/lower_balanced/leaves={leaves}"),
+            10,
+            || {
+                black_box(reader.run(&env));
+            },
+        );
+    }
+
+    let sizes: &[usize] = if quick {
+        &[100_000]
+    } else {
+        &[100_000, 1_000_000]
+    };
+    for &rows in sizes {
+        let df = make_frame(rows, 10);
+        let col = |i: usize| Field::new(format!("col{i}")).reader();
+        report(&format!("run/filter_select/rows={rows}"), 10, || {
+            let ops = DataFrameOps::new(df.clone())
+                .filter(col(0).gt(500))
+                .select([col(1) + col(2) * 2, col(3)]);
+            black_box(ops.run(None).unwrap());
+        });
+    }
+}
@@ -0,0 +1,29 @@
+//! Field resolution cost as schema width grows.
+//!
+//! Run with `cargo bench --manifest-path rust/Cargo.toml --bench resolver`.
+
+use datadrill::FieldResolver;
+use std::hint::black_box;
+use std::time::Instant;
+
+const LOOKUPS: usize = 100_000;
+
+fn main() {
+    for width in [100usize, 1_000, 10_000, 20_000] {
+        let columns: Vec<String> = (0..width).map(|i| format!("scen_col{i}")).collect();
+        let resolver = FieldResolver::new(columns).with_prefix("scen_");
+        let names: Vec<String> = (0..LOOKUPS)
+            .map(|i| format!("col{}", (i * 7919) % width))
+            .collect();
+
+        let start = Instant::now();
+        for name in &names {
+            black_box(resolver.resolve(name).unwrap());
+        }
+        let elapsed = start.elapsed();
+        println!(
+            "width={width:>6} ns/lookup={:.1}",
+            elapsed.as_nanos() as f64 / LOOKUPS as f64
+        );
+    }
+}
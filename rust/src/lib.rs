@@ -1,31 +1,53 @@
 use polars::prelude::*;
+use std::collections::{HashMap, HashSet};
 use std::ops::{Add, BitAnd, BitOr, BitXor, Div, Mul, Neg, Not, Rem, Sub};
-use std::sync::Arc;
+use std::sync::{Arc, RwLock};
+
+/// Column names with a hash index, shared by every resolver derived from it.
+#[derive(Debug)]
+struct SchemaIndex {
+    columns: Vec<String>,
+    index: HashSet<String>,
+    /// Resolved column per prefix and field name, filled on first use.
+    resolved: RwLock<HashMap<String, HashMap<String, PlSmallStr>>>,
+}
+
+impl PartialEq for SchemaIndex {
+    fn eq(&self, other: &Self) -> bool {
+        self.columns == other.columns
+    }
+}
 
 #[derive(Clone, Debug, PartialEq)]
 pub struct FieldResolver {
-    schema: Vec<String>,
+    schema: Arc<SchemaIndex>,
     prefix: String,
 }
 
 impl FieldResolver {
     pub fn new<S: Into<String>>(schema: Vec<S>) -> Self {
+        let columns: Vec<String> = schema.into_iter().map(Into::into).collect();
+        let index = columns.iter().cloned().collect();
         Self {
-            schema: schema.into_iter().map(Into::into).collect(),
+            schema: Arc::new(SchemaIndex {
+                columns,
+                index,
+                resolved: RwLock::default(),
+            }),
             prefix: String::new(),
         }
     }
 
     pub fn with_prefix(&self, value: &str) -> Self {
         Self {
-            schema: self.schema.clone(),
+            schema: Arc::clone(&self.schema),
             prefix: value.to_string(),
         }
     }
 
     pub fn clear_prefix(&self) -> Self {
         Self {
-            schema: self.schema.clone(),
+            schema: Arc::clone(&self.schema),
             prefix: String::new(),
         }
     }
@@ -34,13 +56,43 @@ impl FieldResolver {
         &self.prefix
     }
 
+    pub fn schema(&self) -> &[String] {
+        &self.schema.columns
+    }
+
     pub fn resolve(&self, name: &str) -> Result<String, String> {
-        let column = format!("{}{}", self.prefix, name);
-        if self.schema.iter().any(|c| c == &column) {
-            Ok(column)
-        } else {
-            Err(format!("{column} not in schema"))
+        self.resolve_with(&self.prefix, name)
+            .map(|column| column.to_string())
+    }
+
+    /// Resolve `name` under `prefix` instead of the resolver's own prefix.
+    ///
+    /// Results are cached in the schema shared by every derived resolver, so
+    /// repeated lookups neither format nor allocate a new column name.
+    pub fn resolve_with(&self, prefix: &str, name: &str) -> Result<PlSmallStr, String> {
+        if let Some(column) = self
+            .schema
+            .resolved
+            .read()
+            .unwrap()
+            .get(prefix)
+            .and_then(|names| names.get(name))
+        {
+            return Ok(column.clone());
         }
+        let column = format!("{prefix}{name}");
+        if !self.schema.index.contains(&column) {
+            return Err(format!("{column} not in schema"));
+        }
+        let column = PlSmallStr::from(column);
+        self.schema
+            .resolved
+            .write()
+            .unwrap()
+            .entry(prefix.to_string())
+            .or_default()
+            .insert(name.to_string(), column.clone());
+        Ok(column)
     }
 }
 
@@ -71,144 +123,247 @@ impl Environment {
     }
 }
 
+/// Binary operators of the expression IR.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum BinaryOp {
+    Add,
+    Sub,
+    Mul,
+    Div,
+    TrueDiv,
+    Rem,
+    FloorDiv,
+    Pow,
+    And,
+    Or,
+    Xor,
+    Gt,
+    GtEq,
+    Lt,
+    LtEq,
+    Eq,
+    NotEq,
+}
+
+impl BinaryOp {
+    fn apply(self, left: Expr, right: Expr) -> Expr {
+        match self {
+            Self::Add => left + right,
+            Self::Sub => left - right,
+            Self::Mul => left * right,
+            Self::Div => left / right,
+            Self::TrueDiv => binary_expr(left, Operator::TrueDivide, right),
+            Self::Rem => left % right,
+            Self::FloorDiv => left.floor_div(right),
+            Self::Pow => left.pow(right),
+            Self::And => left.and(right),
+            Self::Or => left.or(right),
+            Self::Xor => left.xor(right),
+            Self::Gt => left.gt(right),
+            Self::GtEq => left.gt_eq(right),
+            Self::Lt => left.lt(right),
+            Self::LtEq => left.lt_eq(right),
+            Self::Eq => left.eq(right),
+            Self::NotEq => left.neq(right),
+        }
+    }
+}
+
+/// Unary operators of the expression IR.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum UnaryOp {
+    Neg,
+    Not,
+}
+
+type EnvFn = Arc<dyn Fn(&Environment) -> Expr + Send + Sync>;
+type MapFn = Arc<dyn Fn(Vec<Expr>) -> Expr + Send + Sync>;
+
+/// A node of the expression tree behind every `Reader<Expr>`.
+///
+/// Trees are built once and shared; lowering only walks them, so the `Expr`
+/// it returns is the only thing allocated per evaluation. `Map` and `Func`
+/// keep closures available for user functions.
 #[derive(Clone)]
-pub struct Reader<T>(Arc<dyn Fn(&Environment) -> T + Send + Sync>);
+pub enum ExprNode {
+    /// A field resolved through the environment, by interned name.
+    Field(Arc<str>),
+    /// A ready-made expression such as a literal.
+    Expr(Expr),
+    Binary(BinaryOp, Arc<ExprNode>, Arc<ExprNode>),
+    Unary(UnaryOp, Arc<ExprNode>),
+    /// Lower the child with the resolver prefix replaced.
+    Prefix(Arc<str>, Arc<ExprNode>),
+    Alias(PlSmallStr, Arc<ExprNode>),
+    /// A user function applied to the lowered children.
+    Map(MapFn, Vec<Arc<ExprNode>>),
+    /// A user function of the environment.
+    Func(EnvFn),
+}
+
+impl ExprNode {
+    /// Lower the tree with fields resolved under `prefix`.
+    ///
+    /// Fails with the resolver's message when a field is not in the schema.
+    fn lower(&self, env: &Environment, prefix: &str) -> Result<Expr, String> {
+        Ok(match self {
+            Self::Field(name) => col(env.resolver().resolve_with(prefix, name)?),
+            Self::Expr(expr) => expr.clone(),
+            Self::Binary(op, left, right) => {
+                op.apply(left.lower(env, prefix)?, right.lower(env, prefix)?)
+            }
+            Self::Unary(UnaryOp::Neg, operand) => -operand.lower(env, prefix)?,
+            Self::Unary(UnaryOp::Not, operand) => operand.lower(env, prefix)?.not(),
+            Self::Prefix(scope, child) => child.lower(env, scope)?,
+            Self::Alias(name, child) => child.lower(env, prefix)?.alias(name.clone()),
+            Self::Map(func, children) => func(
+                children
+                    .iter()
+                    .map(|c| c.lower(env, prefix))
+                    .collect::<Result<Vec<_>, String>>()?,
+            ),
+            Self::Func(func) if prefix == env.resolver().prefix() => func(env),
+            Self::Func(func) => func(&env.with_prefix(prefix)),
+        })
+    }
+}
+
+enum Repr<T> {
+    Func(Arc<dyn Fn(&Environment) -> T + Send + Sync>),
+    /// Expression readers; the function converts the lowered `Expr` to `T`
+    /// and is the identity, since only `Reader<Expr>` builds this variant.
+    Node(Arc<ExprNode>, fn(Expr) -> T),
+}
+
+#[derive(Clone)]
+pub struct Reader<T>(Arc<Repr<T>>);
 
 impl<T> Reader<T> {
     pub fn new<F>(func: F) -> Self
     where
         F: Fn(&Environment) -> T + Send + Sync + 'static,
     {
-        Self(Arc::new(func))
+        Self(Arc::new(Repr::Func(Arc::new(func))))
     }
 
+    /// Evaluate the reader in `env`, panicking when a field is not in the schema.
     pub fn run(&self, env: &Environment) -> T {
-        (self.0)(env)
+        self.try_run(env).unwrap_or_else(|err| panic!("{err}"))
     }
+
+    /// Evaluate the reader in `env`, failing when a field is not in the schema.
+    pub fn try_run(&self, env: &Environment) -> Result<T, String> {
+        match &*self.0 {
+            Repr::Func(func) => Ok(func(env)),
+            Repr::Node(node, from_expr) => node.lower(env, env.resolver().prefix()).map(*from_expr),
+        }
+    }
+}
+
+fn identity(expr: Expr) -> Expr {
+    expr
 }
 
 impl Reader<Expr> {
+    pub fn from_node(node: ExprNode) -> Self {
+        Self::from_shared(Arc::new(node))
+    }
+
+    fn from_shared(node: Arc<ExprNode>) -> Self {
+        Self(Arc::new(Repr::Node(node, identity)))
+    }
+
+    /// Return the expression tree of this reader.
+    pub fn node(&self) -> Arc<ExprNode> {
+        match &*self.0 {
+            Repr::Node(node, _) => Arc::clone(node),
+            Repr::Func(func) => Arc::new(ExprNode::Func(Arc::clone(func))),
+        }
+    }
+
+    fn binary<R: IntoReader>(self, op: BinaryOp, rhs: R) -> Self {
+        Self::from_node(ExprNode::Binary(op, self.node(), rhs.into_reader().node()))
+    }
+
     pub fn alias(self, name: &str) -> Self {
-        let name = name.to_string();
-        Reader::new(move |env| self.run(env).alias(&name))
+        Self::from_node(ExprNode::Alias(name.into(), self.node()))
+    }
+
+    pub fn true_div<R>(self, rhs: R) -> Self
+    where
+        R: IntoReader + Clone + Send + Sync + 'static,
+    {
+        self.binary(BinaryOp::TrueDiv, rhs)
     }
 
     pub fn floor_div<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).floor_div(rhs_expr)
-        })
+        self.binary(BinaryOp::FloorDiv, rhs)
     }
 
     pub fn pow<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).pow(rhs_expr)
-        })
+        self.binary(BinaryOp::Pow, rhs)
     }
 
     pub fn gt<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).gt(rhs_expr)
-        })
+        self.binary(BinaryOp::Gt, rhs)
     }
 
     pub fn gt_eq<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).gt_eq(rhs_expr)
-        })
+        self.binary(BinaryOp::GtEq, rhs)
     }
 
     pub fn lt<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).lt(rhs_expr)
-        })
+        self.binary(BinaryOp::Lt, rhs)
     }
 
     pub fn lt_eq<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).lt_eq(rhs_expr)
-        })
+        self.binary(BinaryOp::LtEq, rhs)
     }
 
     pub fn eq_to<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).eq(rhs_expr)
-        })
+        self.binary(BinaryOp::Eq, rhs)
     }
 
     pub fn ne_to<R>(self, rhs: R) -> Self
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        Reader::new(move |env| {
-            let rhs_expr = rhs.clone().into_reader().run(env);
-            self.run(env).neq(rhs_expr)
-        })
+        self.binary(BinaryOp::NotEq, rhs)
     }
 }
 
-macro_rules! impl_expr_op {
-    ($trait:ident, $method:ident, $op:tt) => {
-        impl $trait for Reader<Expr> {
-            type Output = Reader<Expr>;
-
-            fn $method(self, rhs: Reader<Expr>) -> Self::Output {
-                Reader::new(move |env| self.run(env) $op rhs.run(env))
-            }
-        }
-
-        impl $trait<i32> for Reader<Expr> {
-            type Output = Reader<Expr>;
-
-            fn $method(self, rhs: i32) -> Self::Output {
-                Reader::new(move |env| self.run(env) $op lit(rhs).cast(DataType::Int32))
-            }
-        }
-
-        impl $trait<Reader<Expr>> for i32 {
-            type Output = Reader<Expr>;
-
-            fn $method(self, rhs: Reader<Expr>) -> Self::Output {
-                Reader::new(move |env| lit(self).cast(DataType::Int32) $op rhs.run(env))
-            }
-        }
-    };
+fn int32(value: i32) -> Reader<Expr> {
+    Reader::from_node(ExprNode::Expr(lit(value).cast(DataType::Int32)))
 }
 
-macro_rules! impl_expr_op_method {
-    ($trait:ident, $method:ident, $func:ident) => {
+macro_rules! impl_expr_op {
+    ($trait:ident, $method:ident, $op:ident) => {
         impl $trait for Reader<Expr> {
             type Output = Reader<Expr>;
 
             fn $method(self, rhs: Reader<Expr>) -> Self::Output {
-                Reader::new(move |env| self.run(env).$func(rhs.run(env)))
+                self.binary(BinaryOp::$op, rhs)
             }
         }
 
@@ -216,7 +371,7 @@ macro_rules! impl_expr_op_method {
             type Output = Reader<Expr>;
 
             fn $method(self, rhs: i32) -> Self::Output {
-                Reader::new(move |env| self.run(env).$func(lit(rhs).cast(DataType::Int32)))
+                self.binary(BinaryOp::$op, int32(rhs))
             }
         }
 
@@ -224,26 +379,26 @@ macro_rules! impl_expr_op_method {
             type Output = Reader<Expr>;
 
             fn $method(self, rhs: Reader<Expr>) -> Self::Output {
-                Reader::new(move |env| lit(self).cast(DataType::Int32).$func(rhs.run(env)))
+                int32(self).binary(BinaryOp::$op, rhs)
             }
         }
     };
 }
 
-impl_expr_op!(Add, add, +);
-impl_expr_op!(Sub, sub, -);
-impl_expr_op!(Mul, mul, *);
-impl_expr_op!(Div, div, /);
-impl_expr_op!(Rem, rem, %);
-impl_expr_op_method!(BitAnd, bitand, and);
-impl_expr_op_method!(BitOr, bitor, or);
-impl_expr_op_method!(BitXor, bitxor, xor);
+impl_expr_op!(Add, add, Add);
+impl_expr_op!(Sub, sub, Sub);
+impl_expr_op!(Mul, mul, Mul);
+impl_expr_op!(Div, div, Div);
+impl_expr_op!(Rem, rem, Rem);
+impl_expr_op!(BitAnd, bitand, And);
+impl_expr_op!(BitOr, bitor, Or);
+impl_expr_op!(BitXor, bitxor, Xor);
 
 impl Neg for Reader<Expr> {
     type Output = Reader<Expr>;
 
     fn neg(self) -> Self::Output {
-        Reader::new(move |env| -self.run(env))
+        Reader::from_node(ExprNode::Unary(UnaryOp::Neg, self.node()))
     }
 }
 
@@ -251,61 +406,67 @@ impl Not for Reader<Expr> {
     type Output = Reader<Expr>;
 
     fn not(self) -> Self::Output {
-        Reader::new(move |env| self.run(env).not())
+        Reader::from_node(ExprNode::Unary(UnaryOp::Not, self.node()))
     }
 }
 
 #[derive(Clone, Debug)]
 pub struct Field {
-    name: String,
+    name: Arc<str>,
 }
 
 impl Field {
     pub fn new<S: Into<String>>(name: S) -> Self {
-        Self { name: name.into() }
+        Self {
+            name: Arc::from(name.into()),
+        }
     }
 
     pub fn reader(&self) -> Reader<Expr> {
-        let name = self.name.clone();
-        Reader::new(move |env| {
-            let column = env.resolver().resolve(&name).expect("column not in schema");
-            col(&column)
-        })
+        Reader::from_node(ExprNode::Field(Arc::clone(&self.name)))
     }
 }
 
 pub fn use_prefix(prefix: &str, reader: Reader<Expr>) -> Reader<Expr> {
-    let prefix = prefix.to_string();
-    Reader::new(move |env| reader.run(&env.with_prefix(&prefix)))
+    Reader::from_node(ExprNode::Prefix(Arc::from(prefix), reader.node()))
 }
 
 pub fn get_data(name: &str) -> Reader<Expr> {
-    let name = name.to_string();
-    Reader::new(move |env| {
-        let column = env.resolver().resolve(&name).expect("column not in schema");
-        col(&column)
-    })
+    Reader::from_node(ExprNode::Field(Arc::from(name)))
+}
+
+fn map_nodes<F>(func: F, readers: Vec<Reader<Expr>>) -> Reader<Expr>
+where
+    F: Fn(Vec<Expr>) -> Expr + Send + Sync + 'static,
+{
+    let children = readers.iter().map(Reader::node).collect();
+    Reader::from_node(ExprNode::Map(Arc::new(func), children))
 }
 
 pub fn map<F>(func: F, reader: Reader<Expr>) -> Reader<Expr>
 where
     F: Fn(Expr) -> Expr + Send + Sync + 'static,
 {
-    Reader::new(move |env| {
-        let expr = reader.run(env);
-        func(expr)
-    })
+    map_nodes(
+        move |exprs| {
+            let [expr] = <[Expr; 1]>::try_from(exprs).unwrap();
+            func(expr)
+        },
+        vec![reader],
+    )
 }
 
 pub fn map2<F>(func: F, reader1: Reader<Expr>, reader2: Reader<Expr>) -> Reader<Expr>
 where
     F: Fn(Expr, Expr) -> Expr + Send + Sync + 'static,
 {
-    Reader::new(move |env| {
-        let expr1 = reader1.run(env);
-        let expr2 = reader2.run(env);
-        func(expr1, expr2)
-    })
+    map_nodes(
+        move |exprs| {
+            let [expr1, expr2] = <[Expr; 2]>::try_from(exprs).unwrap();
+            func(expr1, expr2)
+        },
+        vec![reader1, reader2],
+    )
 }
 
 pub fn ask() -> Reader<Environment> {
@@ -324,7 +485,7 @@ pub fn pure<T>(value: T) -> Reader<Expr>
 where
     T: Literal + Clone + Send + Sync + 'static,
 {
-    Reader::new(move |_env| value.clone().lit())
+    Reader::from_node(ExprNode::Expr(value.lit()))
 }
 
 pub trait IntoReader {
@@ -354,7 +515,7 @@ where
     T: Literal + Clone + Send + Sync + 'static,
 {
     fn into_reader(self) -> Reader<Expr> {
-        Reader::new(move |_env| self.clone().lit())
+        pure(self)
     }
 }
 
@@ -364,11 +525,7 @@ where
     B: IntoReader + Clone + Send + Sync + 'static,
     F: Fn(Expr, Expr) -> Expr + Send + Sync + 'static,
 {
-    Reader::new(move |env| {
-        let expr_a = a.clone().into_reader().run(env);
-        let expr_b = b.clone().into_reader().run(env);
-        func(expr_a, expr_b)
-    })
+    map2(func, a.into_reader(), b.into_reader())
 }
 
 pub fn field_function3<A, B, C, F>(func: F, a: A, b: B, c: C) -> Reader<Expr>
@@ -378,12 +535,13 @@ where
     C: IntoReader + Clone + Send + Sync + 'static,
     F: Fn(Expr, Expr, Expr) -> Expr + Send + Sync + 'static,
 {
-    Reader::new(move |env| {
-        let expr_a = a.clone().into_reader().run(env);
-        let expr_b = b.clone().into_reader().run(env);
-        let expr_c = c.clone().into_reader().run(env);
-        func(expr_a, expr_b, expr_c)
-    })
+    map_nodes(
+        move |exprs| {
+            let [expr_a, expr_b, expr_c] = <[Expr; 3]>::try_from(exprs).unwrap();
+            func(expr_a, expr_b, expr_c)
+        },
+        vec![a.into_reader(), b.into_reader(), c.into_reader()],
+    )
 }
 
 pub fn series_function3<A, B, C, F>(func: F, a: A, b: B, c: C) -> Reader<Expr>
@@ -394,22 +552,24 @@ where
     F: Fn(Series, Series, Series) -> Series + Send + Sync + 'static,
 {
     let func = Arc::new(func);
-    Reader::new(move |env| {
-        let expr_a = a.clone().into_reader().run(env);
-        let expr_b = b.clone().into_reader().run(env);
-        let expr_c = c.clone().into_reader().run(env);
-        let func = Arc::clone(&func);
-        expr_a.map_many(
-            move |cols: &mut [Column]| {
-                let a = std::mem::take(&mut cols[0]).take_materialized_series();
-                let b = std::mem::take(&mut cols[1]).take_materialized_series();
-                let c = std::mem::take(&mut cols[2]).take_materialized_series();
-                Ok(Some(func(a, b, c).into()))
-            },
-            &[expr_b, expr_c],
-            GetOutput::first(),
-        )
-    })
+    field_function3(
+        move |expr_a, expr_b, expr_c| {
+            let func = Arc::clone(&func);
+            expr_a.map_many(
+                move |cols: &mut [Column]| {
+                    let a = std::mem::take(&mut cols[0]).take_materialized_series();
+                    let b = std::mem::take(&mut cols[1]).take_materialized_series();
+                    let c = std::mem::take(&mut cols[2]).take_materialized_series();
+                    Ok(Some(func(a, b, c).into()))
+                },
+                &[expr_b, expr_c],
+                GetOutput::first(),
+            )
+        },
+        a,
+        b,
+        c,
+    )
 }
 
 pub fn sample_dataframe_with_modified() -> DataFrame {
@@ -420,15 +580,34 @@ pub fn sample_dataframe_with_modified() -> DataFrame {
     .unwrap()
 }
 
+type LazyOp = Box<dyn Fn(LazyFrame, &Environment) -> PolarsResult<LazyFrame> + Send + Sync>;
+
+/// Lower `reader` in `env`, reporting unknown fields as missing columns.
+fn lower<R: IntoReader>(reader: R, env: &Environment) -> PolarsResult<Expr> {
+    reader
+        .into_reader()
+        .try_run(env)
+        .map_err(|err| PolarsError::ColumnNotFound(err.into()))
+}
+
+/// Operations recorded against a source and run as a single lazy query.
+///
+/// Each operation only extends the plan, so Polars optimizes the whole chain
+/// and one `DataFrame` is materialized when it is collected. A `LazyFrame`
+/// source such as a Parquet scan gets projection and predicate pushdown.
 pub struct DataFrameOps {
-    df: DataFrame,
-    ops: Vec<Box<dyn Fn(DataFrame, &Environment) -> PolarsResult<DataFrame> + Send + Sync>>,
+    source: LazyFrame,
+    ops: Vec<LazyOp>,
 }
 
 impl DataFrameOps {
     pub fn new(df: DataFrame) -> Self {
+        Self::from_lazy(df.lazy())
+    }
+
+    pub fn from_lazy(source: LazyFrame) -> Self {
         Self {
-            df,
+            source,
             ops: Vec::new(),
         }
     }
@@ -437,9 +616,8 @@ impl DataFrameOps {
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        self.ops.push(Box::new(move |df, env| {
-            let expr = predicate.clone().into_reader().run(env);
-            df.lazy().filter(expr).collect()
+        self.ops.push(Box::new(move |lf, env| {
+            Ok(lf.filter(lower(predicate.clone(), env)?))
         }));
         self
     }
@@ -449,13 +627,13 @@ impl DataFrameOps {
         I: IntoIterator<Item = R> + Clone + Send + Sync + 'static,
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        self.ops.push(Box::new(move |df, env| {
-            let columns: Vec<Expr> = exprs
+        self.ops.push(Box::new(move |lf, env| {
+            let columns = exprs
                 .clone()
                 .into_iter()
-                .map(|e| e.into_reader().run(env))
-                .collect();
-            df.lazy().select(columns).collect()
+                .map(|e| lower(e, env))
+                .collect::<PolarsResult<Vec<_>>>()?;
+            Ok(lf.select(columns))
         }));
         self
     }
@@ -464,23 +642,40 @@ impl DataFrameOps {
     where
         R: IntoReader + Clone + Send + Sync + 'static,
     {
-        self.ops.push(Box::new(move |df, env| {
-            let expr = by.clone().into_reader().run(env);
+        self.ops.push(Box::new(move |lf, env| {
+            let expr = lower(by.clone(), env)?;
             let options = SortMultipleOptions::new().with_order_descending(descending);
-            df.lazy().sort_by_exprs(vec![expr], options).collect()
+            Ok(lf.sort_by_exprs(vec![expr], options))
         }));
         self
     }
 
+    /// Return the recorded operations as one uncollected query plan.
+    ///
+    /// Without `env`, fields resolve against the source schema, which for a
+    /// scan only reads file metadata. Fields missing from the schema fail
+    /// with `PolarsError::ColumnNotFound`.
+    pub fn into_lazy(&self, env: Option<Environment>) -> PolarsResult<LazyFrame> {
+        let env = match env {
+            Some(env) => env,
+            None => {
+                let schema = self.source.clone().collect_schema()?;
+                let names: Vec<String> = schema.iter_names().map(|n| n.to_string()).collect();
+                Environment::new(FieldResolver::new(names))
+            }
+        };
+        self.ops
+            .iter()
+            .try_fold(self.source.clone(), |lf, op| op(lf, &env))
+    }
+
+    /// Return the Polars query plan, optimized unless `optimized` is false.
+    pub fn explain(&self, env: Option<Environment>, optimized: bool) -> PolarsResult<String> {
+        self.into_lazy(env)?.explain(optimized)
+    }
+
     pub fn run(self, env: Option<Environment>) -> PolarsResult<DataFrame> {
-        let env = env.unwrap_or_else(|| {
-            Environment::new(FieldResolver::new(self.df.get_column_names_str()))
-        });
-        let mut df = self.df;
-        for op in self.ops {
-            df = op(df, &env)?;
-        }
-        Ok(df)
+        self.into_lazy(env)?.collect()
     }
 }
 
@@ -488,17 +683,257 @@ impl DataFrameOps {
 #[cfg(feature = "pybindings")]
 mod py {
     use super::*;
+    use pyo3::exceptions::{PyKeyError, PyValueError};
     use pyo3::prelude::*;
-    use pyo3_polars::PyDataFrame;
+    use pyo3_polars::{PyDataFrame, PyExpr, PyLazyFrame};
+
+    /// Raise missing columns as `KeyError`, like the Python resolver.
+    fn to_py_err(err: PolarsError) -> PyErr {
+        match err {
+            PolarsError::ColumnNotFound(msg) => PyKeyError::new_err(msg.to_string()),
+            err => PyValueError::new_err(err.to_string()),
+        }
+    }
 
     #[pyfunction]
     fn sample_dataframe_with_modified_py() -> PyResult<PyDataFrame> {
         Ok(PyDataFrame(sample_dataframe_with_modified()))
     }
 
+    #[pyclass(name = "FieldResolver", frozen)]
+    #[derive(Clone)]
+    struct PyFieldResolver(FieldResolver);
+
+    #[pymethods]
+    impl PyFieldResolver {
+        #[new]
+        #[pyo3(signature = (schema, prefix = ""))]
+        fn new(schema: Vec<String>, prefix: &str) -> Self {
+            Self(FieldResolver::new(schema).with_prefix(prefix))
+        }
+
+        #[getter]
+        fn schema(&self) -> Vec<String> {
+            self.0.schema().to_vec()
+        }
+
+        #[getter]
+        fn prefix(&self) -> &str {
+            self.0.prefix()
+        }
+
+        fn with_prefix(&self, value: &str) -> Self {
+            Self(self.0.with_prefix(value))
+        }
+
+        fn clear_prefix(&self) -> Self {
+            Self(self.0.clear_prefix())
+        }
+
+        fn resolve(&self, name: &str) -> PyResult<String> {
+            self.0.resolve(name).map_err(PyKeyError::new_err)
+        }
+    }
+
+    #[pyclass(name = "Environment", frozen)]
+    #[derive(Clone)]
+    struct PyEnvironment(Environment);
+
+    #[pymethods]
+    impl PyEnvironment {
+        #[new]
+        fn new(resolver: PyFieldResolver) -> Self {
+            Self(Environment::new(resolver.0))
+        }
+
+        #[getter]
+        fn resolver(&self) -> PyFieldResolver {
+            PyFieldResolver(self.0.resolver().clone())
+        }
+
+        fn with_prefix(&self, value: &str) -> Self {
+            Self(self.0.with_prefix(value))
+        }
+
+        fn clear_prefix(&self) -> Self {
+            Self(self.0.clear_prefix())
+        }
+    }
+
+    /// A Rust `Reader<Expr>`; see `datadrill.rust.to_rust_reader`.
+    #[pyclass(name = "Reader", frozen)]
+    #[derive(Clone)]
+    struct PyReader(Reader<Expr>);
+
+    #[pymethods]
+    impl PyReader {
+        #[staticmethod]
+        fn field(name: &str) -> Self {
+            Self(Field::new(name).reader())
+        }
+
+        #[staticmethod]
+        fn expr(expr: PyExpr) -> Self {
+            Self(Reader::from_node(ExprNode::Expr(expr.0)))
+        }
+
+        /// Apply the operator named after Python's `operator` module.
+        fn binary(&self, op: &str, other: &PyReader) -> PyResult<Self> {
+            let (left, right) = (self.0.clone(), other.0.clone());
+            let reader = match op {
+                "add" => left + right,
+                "sub" => left - right,
+                "mul" => left * right,
+                "truediv" => left.true_div(right),
+                "floordiv" => left.floor_div(right),
+                "mod" => left % right,
+                "pow" => left.pow(right),
+                "and_" => left & right,
+                "or_" => left | right,
+                "xor" => left ^ right,
+                "lt" => left.lt(right),
+                "le" => left.lt_eq(right),
+                "gt" => left.gt(right),
+                "ge" => left.gt_eq(right),
+                "eq" => left.eq_to(right),
+                "ne" => left.ne_to(right),
+                _ => return Err(PyValueError::new_err(format!("unsupported operator {op}"))),
+            };
+            Ok(Self(reader))
+        }
+
+        fn unary(&self, op: &str) -> PyResult<Self> {
+            let operand = self.0.clone();
+            let reader = match op {
+                "neg" => -operand,
+                "pos" => operand,
+                "invert" => !operand,
+                _ => return Err(PyValueError::new_err(format!("unsupported operator {op}"))),
+            };
+            Ok(Self(reader))
+        }
+
+        fn use_prefix(&self, prefix: &str) -> Self {
+            Self(use_prefix(prefix, self.0.clone()))
+        }
+
+        fn alias(&self, name: &str) -> Self {
+            Self(self.0.clone().alias(name))
+        }
+
+        fn __add__(&self, other: &PyReader) -> PyResult<Self> {
+            self.binary("add", other)
+        }
+
+        fn __sub__(&self, other: &PyReader) -> PyResult<Self> {
+            self.binary("sub", other)
+        }
+
+        fn __mul__(&self, other: &PyReader) -> PyResult<Self> {
+            self.binary("mul", other)
+        }
+
+        fn __truediv__(&self, other: &PyReader) -> PyResult<Self> {
+            self.binary("truediv", other)
+        }
+
+        fn __call__(&self, env: &PyEnvironment) -> PyResult<PyExpr> {
+            self.0
+                .try_run(&env.0)
+                .map(PyExpr)
+                .map_err(PyKeyError::new_err)
+        }
+    }
+
+    #[derive(Clone)]
+    enum PyOp {
+        Filter(Reader<Expr>),
+        Select(Vec<Reader<Expr>>),
+        Sort(Reader<Expr>, bool),
+    }
+
+    /// Immutable wrapper around `DataFrameOps`; every operation returns a copy.
+    #[pyclass(name = "DataFrameOps", frozen)]
+    #[derive(Clone)]
+    struct PyDataFrameOps {
+        source: LazyFrame,
+        ops: Vec<PyOp>,
+    }
+
+    impl PyDataFrameOps {
+        fn with_op(&self, op: PyOp) -> Self {
+            let mut ops = self.ops.clone();
+            ops.push(op);
+            Self {
+                source: self.source.clone(),
+                ops,
+            }
+        }
+
+        fn build(&self) -> DataFrameOps {
+            self.ops.iter().cloned().fold(
+                DataFrameOps::from_lazy(self.source.clone()),
+                |ops, op| match op {
+                    PyOp::Filter(predicate) => ops.filter(predicate),
+                    PyOp::Select(exprs) => ops.select(exprs),
+                    PyOp::Sort(by, descending) => ops.sort(by, descending),
+                },
+            )
+        }
+    }
+
+    #[pymethods]
+    impl PyDataFrameOps {
+        #[new]
+        fn new(df: PyDataFrame) -> Self {
+            Self::from_lazy(PyLazyFrame(df.0.lazy()))
+        }
+
+        #[staticmethod]
+        fn from_lazy(lf: PyLazyFrame) -> Self {
+            Self {
+                source: lf.0,
+                ops: Vec::new(),
+            }
+        }
+
+        fn filter(&self, predicate: PyReader) -> Self {
+            self.with_op(PyOp::Filter(predicate.0))
+        }
+
+        fn select(&self, exprs: Vec<PyReader>) -> Self {
+            self.with_op(PyOp::Select(exprs.into_iter().map(|e| e.0).collect()))
+        }
+
+        #[pyo3(signature = (by, descending = false))]
+        fn sort(&self, by: PyReader, descending: bool) -> Self {
+            self.with_op(PyOp::Sort(by.0, descending))
+        }
+
+        #[pyo3(signature = (env = None, optimized = true))]
+        fn explain(&self, env: Option<PyEnvironment>, optimized: bool) -> PyResult<String> {
+            self.build()
+                .explain(env.map(|env| env.0), optimized)
+                .map_err(to_py_err)
+        }
+
+        /// Resolve and execute the plan in Rust with the GIL released.
+        #[pyo3(signature = (env = None))]
+        fn run(&self, py: Python<'_>, env: Option<PyEnvironment>) -> PyResult<PyDataFrame> {
+            let ops = self.build();
+            let env = env.map(|env| env.0);
+            let df = py.allow_threads(move || ops.run(env)).map_err(to_py_err)?;
+            Ok(PyDataFrame(df))
+        }
+    }
+
     #[pymodule]
     fn datadrill_rs(_py: Python<'_>, m: &Bound<PyModule>) -> PyResult<()> {
         m.add_function(wrap_pyfunction!(sample_dataframe_with_modified_py, m)?)?;
+        m.add_class::<PyFieldResolver>()?;
+        m.add_class::<PyEnvironment>()?;
+        m.add_class::<PyReader>()?;
+        m.add_class::<PyDataFrameOps>()?;
         Ok(())
     }
 }
@@ -493,3 +493,98 @@ fn field_function_with_asks() {
         vec![Some(19), Some(29), Some(39)]
     );
 }
+
+#[test]
+fn field_resolver_with_prefix_shares_schema() {
+    let resolver = FieldResolver::new(vec!["numbers", "modified_numbers"]);
+    let prefixed = resolver.with_prefix("modified_");
+    assert!(std::ptr::eq(resolver.schema(), prefixed.schema()));
+    assert!(std::ptr::eq(
+        resolver.schema(),
+        prefixed.clear_prefix().schema()
+    ));
+    assert_eq!(prefixed.resolve("numbers").unwrap(), "modified_numbers");
+}
+
+#[test]
+fn dataframe_ops_runs_one_lazy_plan() {
+    let df = sample_dataframe_with_modified();
+    let numbers = Field::new("numbers");
+    let ops = DataFrameOps::new(df)
+        .sort(numbers.reader(), true)
+        .filter(numbers.reader().gt(1i32))
+        .select([numbers.reader() * 2]);
+
+    let plan = ops.explain(None, true).unwrap();
+    // The filter is pushed below the sort within the same query.
+    assert!(plan.find("FILTER").unwrap() > plan.find("SORT").unwrap());
+
+    let out = ops.run(None).unwrap();
+    assert_eq!(
+        out.column("numbers").unwrap().i32().unwrap().to_vec(),
+        vec![Some(6), Some(4)]
+    );
+}
+
+#[test]
+fn dataframe_ops_from_lazy_source() {
+    let source = sample_dataframe_with_modified().lazy();
+    let env = Environment::new(FieldResolver::new(vec!["numbers", "modified_numbers"]))
+        .with_prefix("modified_");
+    let ops = DataFrameOps::from_lazy(source).select([Field::new("numbers").reader()]);
+
+    let lf = ops.into_lazy(Some(env)).unwrap();
+    let out = lf.collect().unwrap();
+    assert_eq!(out.get_column_names_str(), vec!["modified_numbers"]);
+}
+
+#[test]
+fn field_resolver_caches_resolution_per_prefix() {
+    let resolver = FieldResolver::new(vec!["numbers", "modified_numbers"]);
+    let first = resolver.resolve_with("modified_", "numbers").unwrap();
+    let second = resolver
+        .with_prefix("modified_")
+        .resolve("numbers")
+        .unwrap();
+    assert_eq!(first.as_str(), "modified_numbers");
+    assert_eq!(second, "modified_numbers");
+    assert!(resolver.resolve_with("missing_", "numbers").is_err());
+}
+
+#[test]
+fn readers_build_an_expression_tree() {
+    let numbers = Field::new("numbers");
+    let reader = use_prefix("modified_", numbers.reader()).gt(1i32);
+    match &*reader.node() {
+        ExprNode::Binary(BinaryOp::Gt, left, _) => {
+            assert!(matches!(&**left, ExprNode::Prefix(prefix, _) if &**prefix == "modified_"))
+        }
+        _ => panic!("expected a comparison node"),
+    }
+
+    // Closures stay available and see the scoped prefix.
+    let prefix_len = asks(|e| e.resolver().prefix().len() as i32);
+    let scoped = use_prefix("modified_", prefix_len);
+    let env = Environment::new(FieldResolver::new(vec!["numbers", "modified_numbers"]));
+    let out = sample_dataframe_with_modified()
+        .lazy()
+        .select([scoped.run(&env).alias("len")])
+        .collect()
+        .unwrap();
+    assert_eq!(out.column("len").unwrap().i32().unwrap().get(0), Some(9));
+}
+
+#[test]
+fn unknown_fields_are_errors_not_panics() {
+    let env = Environment::new(FieldResolver::new(vec!["numbers"]));
+    let reader = Field::new("numbers").reader() + Field::new("missing").reader();
+    assert_eq!(reader.try_run(&env).unwrap_err(), "missing not in schema");
+
+    let ops = DataFrameOps::new(sample_dataframe_with_modified())
+        .select([use_prefix("other_", Field::new("numbers").reader())]);
+    let err = ops.run(None).unwrap_err();
+    assert!(matches!(
+        err,
+        polars::prelude::PolarsError::ColumnNotFound(_)
+    ));
+}
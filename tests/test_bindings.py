@@ -11,6 +11,8 @@ import sys
 import polars as pl
 import pytest
 
+from datadrill import Environment, FieldResolver
+
 
 @pytest.fixture(scope="session", autouse=True)
 def build_bindings() -> None:
@@ -29,7 +31,7 @@ def build_bindings() -> None:
                 "--manifest-path",
                 str(repo_root / "rust" / "Cargo.toml"),
                 "-F",
-                "pybindings",
+                "extension-module",
             ],
             check=True,
             env=env,
@@ -43,3 +45,69 @@ def test_sample_dataframe_from_rust() -> None:
     df = sample_dataframe_with_modified_py()
     expected = pl.DataFrame({"numbers": [1, 2, 3], "modified_numbers": [10, 20, 30]})
     assert df.equals(expected)
+
+
+def test_rust_reader_resolves_prefixed_fields() -> None:
+    import datadrill_rs
+
+    from datadrill import Field, use_prefix
+    from datadrill.rust import to_rust_environment, to_rust_reader
+
+    df = pl.DataFrame({"numbers": [1, 2, 3], "modified_numbers": [10, 20, 30]})
+    env = to_rust_environment(Environment(FieldResolver(df.columns)))
+    reader = to_rust_reader(
+        Field("numbers")() + use_prefix("modified_")(Field("numbers")())
+    )
+
+    assert isinstance(reader, datadrill_rs.Reader)
+    assert df.select(reader(env)).to_series().to_list() == [11, 22, 33]
+
+
+def test_rust_dataframe_ops_match_python() -> None:
+    from datadrill import DataFrame, Field
+    from datadrill.rust import to_rust, to_rust_environment
+
+    df = pl.DataFrame({"numbers": [1, 2, 3], "modified_numbers": [10, 20, 30]})
+    numbers = Field("numbers")
+    query = (
+        DataFrame(df)
+        .filter(numbers() > 1)
+        .select(numbers() * 2, Field("modified_numbers")())
+        .sort(numbers(), descending=True)
+    )
+    env = Environment(FieldResolver(df.columns))
+
+    result = to_rust(query).run(to_rust_environment(env))
+    assert result.equals(query.run(env))
+
+
+def test_rust_rejects_python_callbacks() -> None:
+    from datadrill import Field, map
+    from datadrill.rust import to_rust_reader
+
+    with pytest.raises(TypeError, match="cannot run in Rust"):
+        to_rust_reader(map(lambda e: e + 1, Field("numbers")()))
+
+
+def test_rust_dataframe_ops_from_lazy_source() -> None:
+    from datadrill import DataFrame, Field
+    from datadrill.rust import to_rust
+
+    lf = pl.DataFrame({"numbers": [1, 2, 3], "modified_numbers": [10, 20, 30]}).lazy()
+    query = DataFrame(lf).filter(Field("numbers")() > 1)
+    ops = to_rust(query)
+
+    assert ops.explain() == lf.filter(pl.col("numbers") > 1).explain()
+    assert ops.run().equals(query.run())
+
+
+def test_rust_unknown_fields_raise_key_error() -> None:
+    from datadrill import DataFrame, Field
+    from datadrill.rust import to_rust, to_rust_environment, to_rust_reader
+
+    df = pl.DataFrame({"numbers": [1, 2, 3]})
+    env = to_rust_environment(Environment(FieldResolver(df.columns)))
+    with pytest.raises(KeyError, match="missing not in schema"):
+        to_rust_reader(Field("missing")())(env)
+    with pytest.raises(KeyError, match="missing not in schema"):
+        to_rust(DataFrame(df).select(Field("missing")())).run(env)
@@ -0,0 +1,179 @@
+import polars as pl
+import pytest
+
+from datadrill import (
+    DataFrame,
+    Environment,
+    Field,
+    FieldResolver,
+    ReaderCache,
+    ResultCache,
+    asks,
+    sample_dataframe_with_modified,
+    series_function,
+)
+
+
+def test_reader_cache_hits_same_environment():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    cache = ReaderCache()
+    total = cache.wrap(Field("numbers")() + Field("modified_numbers")())
+
+    first = total(env)
+    second = total(Environment(FieldResolver(df.columns)))
+    assert first is second
+    assert df.select(second).to_series().to_list() == [11, 22, 33]
+    assert cache.info() == (1, 1, 1024, 1)
+
+
+def test_reader_cache_keys_on_prefix():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    cache = ReaderCache()
+    numbers = cache.wrap(Field("numbers")())
+
+    numbers(env)
+    result = df.select(numbers(env.with_prefix("modified_")))
+    assert result.to_series().to_list() == [10, 20, 30]
+    assert cache.info().misses == 2
+
+
+def test_reader_cache_evicts_least_recently_used():
+    env = Environment(FieldResolver(["a", "b"]))
+    cache = ReaderCache(maxsize=1)
+    a = Field("a")()
+    b = Field("b")()
+
+    cache.evaluate(a, env)
+    cache.evaluate(b, env)
+    cache.evaluate(a, env)
+    assert cache.info() == (0, 3, 1, 1)
+
+
+def test_reader_cache_skips_asks():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns, prefix="modified_"))
+    cache = ReaderCache()
+    offset = Field("numbers")() + asks(lambda e: len(e.resolver.prefix))
+
+    assert not offset.cacheable
+    cache.evaluate(offset, env)
+    cache.evaluate(offset, env)
+    assert cache.info() == (0, 0, 1024, 0)
+
+
+def counted_query(calls: list[int]) -> DataFrame:
+    @series_function
+    def doubled(a: pl.Series) -> pl.Series:
+        calls.append(len(a))
+        return a * 2
+
+    numbers = Field("numbers")
+    return DataFrame(sample_dataframe_with_modified()).select(doubled(numbers()))
+
+
+def test_result_cache_hits_same_plan_and_input():
+    calls: list[int] = []
+    query = counted_query(calls)
+    cache = ResultCache()
+
+    first = query.run(cache=cache)
+    second = query.run(cache=cache)
+    assert len(calls) == 1
+    assert second.equals(first)
+    info = cache.info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+    assert info.bytes == first.estimated_size()
+
+
+def test_result_cache_keys_on_environment_and_arguments():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    numbers = Field("numbers")
+    query = DataFrame(df).select(numbers())
+    cache = ResultCache()
+
+    base = query.run(env, cache=cache)
+    modified = query.run(env.with_prefix("modified_"), cache=cache)
+    assert base["numbers"].to_list() == [1, 2, 3]
+    assert modified["modified_numbers"].to_list() == [10, 20, 30]
+
+    ascending = DataFrame(df).sort(numbers()).run(cache=cache)
+    descending = DataFrame(df).sort(numbers(), descending=True).run(cache=cache)
+    assert ascending["numbers"].to_list() == [1, 2, 3]
+    assert descending["numbers"].to_list() == [3, 2, 1]
+    assert cache.info().hits == 0
+
+
+def test_result_cache_hashes_equal_inputs():
+    numbers = Field("numbers")
+    cache = ResultCache(hash_inputs=True)
+    DataFrame(sample_dataframe_with_modified()).select(numbers()).run(cache=cache)
+    DataFrame(sample_dataframe_with_modified()).select(numbers()).run(cache=cache)
+    assert cache.info().hits == 1
+
+    identity = ResultCache()
+    DataFrame(sample_dataframe_with_modified()).select(numbers()).run(cache=identity)
+    DataFrame(sample_dataframe_with_modified()).select(numbers()).run(cache=identity)
+    assert identity.info().hits == 0
+
+
+def test_result_cache_spills_evicted_results(tmp_path):
+    df = sample_dataframe_with_modified()
+    numbers = Field("numbers")
+    first = DataFrame(df).select(numbers())
+    second = DataFrame(df).select(numbers() * 2)
+    cache = ResultCache(max_bytes=first.run().estimated_size(), spill_dir=tmp_path)
+
+    first.run(cache=cache)
+    second.run(cache=cache)
+    assert cache.info().spilled == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+    assert first.run(cache=cache)["numbers"].to_list() == [1, 2, 3]
+    assert cache.info().hits == 1
+    cache.clear()
+    assert not list(tmp_path.iterdir())
+
+
+def test_result_cache_bounds_spilled_files(tmp_path):
+    df = sample_dataframe_with_modified()
+    numbers = Field("numbers")
+    queries = [DataFrame(df).select(numbers() * factor) for factor in (1, 2, 3)]
+    size = queries[0].run().estimated_size()
+    probe = ResultCache(max_bytes=size, spill_dir=tmp_path / "probe")
+    for query in queries[:2]:
+        query.run(cache=probe)
+    file_bytes = probe.info().spill_bytes
+    assert file_bytes == sum(p.stat().st_size for p in probe.spill_dir.iterdir())
+
+    cache = ResultCache(
+        max_bytes=size, spill_dir=tmp_path / "capped", max_spill_bytes=file_bytes
+    )
+    for query in queries:
+        query.run(cache=cache)
+    assert cache.info().spilled == 1
+    assert cache.info().spill_bytes == file_bytes
+    assert len(list(cache.spill_dir.iterdir())) == 1
+
+    # Reading a result back deletes its file, and the oldest spilled result
+    # was deleted to make room, so it is computed again.
+    queries[1].run(cache=cache)
+    assert cache.info().hits == 1
+    queries[0].run(cache=cache)
+    assert cache.info().hits == 1
+    assert cache.info().spill_bytes == file_bytes
+    assert len(list(cache.spill_dir.iterdir())) == 1
+
+
+def test_result_cache_skips_asks_and_lazy_runs():
+    df = sample_dataframe_with_modified()
+    query = DataFrame(df).select(asks(lambda env: Field("numbers")()(env)))
+    cache = ResultCache()
+    query.run(cache=cache)
+    query.run(cache=cache)
+    assert cache.info().hits == cache.info().misses == 0
+
+    with pytest.raises(ValueError, match="collected"):
+        query.run(lazy=True, cache=cache)
@@ -1,9 +1,21 @@
+import asyncio
+import time
+
+import polars as pl
+import pytest
+
 from datadrill import (
     DataFrame,
     Field,
     Environment,
     FieldResolver,
+    gather_runs,
+    run_all,
+    map,
+    pure,
     sample_dataframe_with_modified,
+    series_function,
+    use_prefix,
 )
 
 
@@ -30,3 +42,602 @@ def test_sort_descending():
 
     result = base.sort(numbers(), descending=True).run()
     assert result["numbers"].to_list() == [3, 2, 1]
+
+
+def test_run_lazy_returns_single_plan():
+    base = DataFrame(sample_dataframe_with_modified())
+    numbers = Field("numbers")
+    query = base.filter(numbers() > 1).select(numbers()).sort(numbers())
+
+    plan = query.run(lazy=True)
+    assert isinstance(plan, pl.LazyFrame)
+    assert plan.collect()["numbers"].to_list() == [2, 3]
+
+
+def test_explain_pushes_projection_into_source():
+    base = DataFrame(sample_dataframe_with_modified())
+    numbers = Field("numbers")
+    plan = base.filter(numbers() > 1).select(numbers()).explain()
+    assert "1/2 COLUMNS" in plan
+
+
+def test_scan_parquet_reads_only_resolved_columns(tmp_path):
+    path = tmp_path / "scenarios.parquet"
+    pl.DataFrame(
+        {"numbers": [1, 2, 3], "scen1_numbers": [10, 20, 30], "other": [0, 0, 0]}
+    ).write_parquet(path)
+    numbers = Field("numbers")
+    query = DataFrame.scan_parquet(path).select(use_prefix("scen1_")(numbers()))
+
+    assert "PROJECT 1/3 COLUMNS" in query.explain()
+    assert query.run()["scen1_numbers"].to_list() == [10, 20, 30]
+
+
+def test_scan_csv_default_env_from_schema(tmp_path):
+    path = tmp_path / "numbers.csv"
+    sample_dataframe_with_modified().write_csv(path)
+    numbers = Field("numbers")
+    result = DataFrame.scan_csv(path).filter(numbers() > 1).select(numbers()).run()
+    assert result["numbers"].to_list() == [2, 3]
+
+
+def test_scan_ipc_with_prefix_env(tmp_path):
+    path = tmp_path / "numbers.arrow"
+    df = sample_dataframe_with_modified()
+    df.write_ipc(path)
+    env = Environment(FieldResolver(df.columns, prefix="modified_"))
+    result = DataFrame.scan_ipc(path).select(Field("numbers")()).run(env)
+    assert result["modified_numbers"].to_list() == [10, 20, 30]
+
+
+def test_run_batches_yields_fixed_size_batches():
+    df = pl.DataFrame({"numbers": list(range(10))})
+    numbers = Field("numbers")
+    query = DataFrame(df).filter(numbers() % 2 == 0).select(numbers() * 10)
+
+    batches = list(query.run_batches(batch_size=2))
+    assert [batch.height for batch in batches] == [2, 2, 1]
+    assert pl.concat(batches)["numbers"].to_list() == [0, 20, 40, 60, 80]
+
+
+def test_run_batches_rejects_sort():
+    base = DataFrame(sample_dataframe_with_modified())
+    query = base.sort(Field("numbers")())
+    with pytest.raises(ValueError, match="sort"):
+        query.run_batches(batch_size=2)
+
+
+def test_cse_computes_shared_series_function_once():
+    calls = []
+
+    @series_function
+    def normalized(a: pl.Series) -> pl.Series:
+        calls.append(len(a))
+        return a / a.max()
+
+    df = sample_dataframe_with_modified()
+    numbers = Field("numbers")
+    shared = normalized(numbers())
+    query = (
+        DataFrame(df)
+        .filter(numbers() > 1)
+        .select(
+            numbers(),
+            map(lambda e: e.alias("double"), shared * 2),
+            map(lambda e: e.alias("shifted"), shared + 1),
+            map(lambda e: e.alias("triple"), shared * 3),
+        )
+    )
+
+    expected = query.run()
+    calls.clear()
+    result = query.run(cse=True)
+    assert len(calls) == 1
+    assert result.columns == expected.columns
+    assert result.equals(expected)
+
+    report = query.cse_report()
+    assert report.hoisted == 1
+    assert report.duplicates_removed == 2
+
+
+def test_cse_keeps_whole_column_functions_below_filter():
+    @series_function
+    def normalized(a: pl.Series) -> pl.Series:
+        return a / a.max()
+
+    numbers = Field("numbers")
+    shared = normalized(numbers())
+    query = (
+        DataFrame(sample_dataframe_with_modified()).filter(shared < 1).select(shared)
+    )
+
+    # After the filter the maximum is 2, so values must be recomputed.
+    assert query.run(cse=True).to_series().to_list() == [0.5, 1.0]
+    assert query.cse_report().hoisted == 0
+
+
+@pytest.mark.parametrize(
+    "shared",
+    [
+        Field("numbers")() / pl.col("numbers").max(),
+        map(lambda e: e / e.max(), Field("numbers")),
+    ],
+)
+def test_cse_keeps_raw_aggregates_and_closures_below_filter(shared):
+    query = (
+        DataFrame(sample_dataframe_with_modified()).filter(shared < 1).select(shared)
+    )
+    assert query.run(cse=True).to_series().to_list() == [0.5, 1.0]
+    assert query.cse_report().hoisted == 0
+
+
+def test_cse_drops_temporaries_and_respects_prefix():
+    df = sample_dataframe_with_modified()
+    numbers = Field("numbers")
+    scaled = numbers() * 3
+    modified = use_prefix("modified_")(scaled)
+    query = DataFrame(df).filter(scaled > 3).filter(scaled < 9).filter(modified > 0)
+
+    result = query.run(cse=True)
+    assert result.equals(query.run())
+    assert query.cse_report().hoisted == 1
+
+
+def scenario_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "numbers": [1, 2, 3],
+            "scen1_price": [10, 20, 30],
+            "scen2_price": [100, 200, 300],
+        }
+    )
+
+
+def test_run_many_wide_shares_prefix_independent_readers():
+    numbers = use_prefix("")(Field("numbers")())
+    price = Field("price")
+    query = (
+        DataFrame(scenario_frame())
+        .filter(numbers > 1)
+        .select(numbers, price() * numbers)
+    )
+
+    result = query.run_many(["scen1_", "scen2_"])
+    assert result.columns == ["numbers", "scen1_price", "scen2_price"]
+    assert result["scen1_price"].to_list() == [40, 90]
+    assert result["scen2_price"].to_list() == [400, 900]
+
+
+def test_run_many_long_layout():
+    df = scenario_frame()
+    env = Environment(FieldResolver(df.columns))
+    query = DataFrame(df).select(Field("price")())
+    scenarios = {"base": env.with_prefix("scen1_"), "stress": env.with_prefix("scen2_")}
+
+    result = query.run_many(scenarios, how="long")
+    assert result.columns == ["scenario", "price"]
+    assert result["scenario"].to_list() == ["base"] * 3 + ["stress"] * 3
+    assert result["price"].to_list() == [10, 20, 30, 100, 200, 300]
+
+
+def test_run_many_rejects_prefix_dependent_filter():
+    query = (
+        DataFrame(scenario_frame())
+        .filter(Field("price")() > 10)
+        .select(Field("price")())
+    )
+    with pytest.raises(ValueError, match="filter depends on the prefix"):
+        query.run_many(["scen1_", "scen2_"])
+
+
+def group_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "desk": ["a", "b", "a", "b"],
+            "scen1_desk": ["x", "x", "y", "y"],
+            "price": [1, 2, 3, 4],
+        }
+    )
+
+
+def test_group_by_agg_with_prefix_resolved_key():
+    df = group_frame()
+    env = Environment(FieldResolver(df.columns, prefix="scen1_"))
+    price = use_prefix("")(Field("price")())
+    query = (
+        DataFrame(df)
+        .group_by(Field("desk")(), maintain_order=True)
+        .agg(price.sum().alias("total"), price.max())
+    )
+
+    result = query.run(env)
+    assert result.columns == ["scen1_desk", "total", "price"]
+    assert result["total"].to_list() == [3, 7]
+    assert result["price"].to_list() == [2, 4]
+
+
+def test_filter_pushed_below_group_by():
+    price = Field("price")
+    query = (
+        DataFrame(group_frame().lazy())
+        .group_by(Field("desk")())
+        .agg(price().sum())
+        .filter(Field("desk")() == "a")
+    )
+    plan = query.explain()
+    assert plan.index("FILTER") > plan.index("AGGREGATE")
+    assert query.run()["price"].to_list() == [4]
+
+
+def test_with_columns_then_filter_on_new_field():
+    price = Field("price")
+    query = (
+        DataFrame(group_frame())
+        .with_columns((price() * 10).alias("scaled"))
+        .filter(Field("scaled")() > 20)
+        .select(Field("scaled")())
+    )
+    assert query.run()["scaled"].to_list() == [30, 40]
+
+
+def test_over_window():
+    price = Field("price")
+    query = DataFrame(group_frame()).select(
+        price(), price().sum().over(Field("desk")()).alias("desk_total")
+    )
+    assert query.run()["desk_total"].to_list() == [4, 6, 4, 6]
+
+
+def test_cse_does_not_hoist_aggregations():
+    price = Field("price")
+    total = price().sum()
+    query = (
+        DataFrame(group_frame())
+        .group_by(Field("desk")())
+        .agg(total.alias("a"), total.alias("b"))
+    )
+    result = query.run(cse=True).sort("desk")
+    assert result["a"].to_list() == [4, 6]
+    assert query.cse_report(query._default_env()).hoisted == 0
+
+
+def test_run_batches_rejects_aggregation():
+    query = DataFrame(group_frame()).select(Field("price")().sum())
+    with pytest.raises(ValueError, match="select"):
+        next(iter(query.run_batches(batch_size=2)))
+
+
+def test_run_batches_rejects_raw_expression_aggregation():
+    query = DataFrame(pl.DataFrame({"a": range(10)})).select(pl.col("a").sum())
+    with pytest.raises(ValueError, match="select uses an aggregation"):
+        query.run_batches(batch_size=3)
+
+
+def test_run_batches_rejects_literal_only_select():
+    base = DataFrame(pl.DataFrame({"a": range(10)}))
+    query = base.select(pure(1).alias("one"))
+    assert query.run().height == 1
+    with pytest.raises(ValueError, match="select reads no column"):
+        query.run_batches(batch_size=3)
+
+
+def test_run_batches_matches_run_for_literal_next_to_column():
+    base = DataFrame(pl.DataFrame({"a": range(10)}))
+    query = base.select(Field("a")(), pure(1).alias("one"))
+    batches = pl.concat(query.run_batches(batch_size=3))
+    assert batches.equals(query.run())
+
+
+def join_frames() -> tuple[pl.DataFrame, pl.DataFrame]:
+    fact = pl.DataFrame(
+        {
+            "id": [1, 2, 3, 1],
+            "scen1_id": [2, 2, 3, 3],
+            "qty": [1, 2, 3, 4],
+            "unused": [0, 0, 0, 0],
+        }
+    )
+    dim = pl.DataFrame({"id": [1, 2, 3], "region": ["eu", "us", "eu"], "rate": [9] * 3})
+    return fact, dim
+
+
+def test_join_exposes_right_side_under_prefix():
+    fact, dim = join_frames()
+    region = use_prefix("dim_")(Field("region")())
+    query = (
+        DataFrame(fact)
+        .join(DataFrame(dim), on="id", prefix="dim_")
+        .filter(region == "eu")
+        .select(Field("qty")(), region)
+        .sort(Field("qty")())
+    )
+
+    result = query.run()
+    assert result.columns == ["qty", "dim_region"]
+    assert result["qty"].to_list() == [1, 3, 4]
+
+
+def test_join_pushes_projections_and_predicates_into_both_sides():
+    fact, dim = join_frames()
+    region = use_prefix("dim_")(Field("region")())
+    query = (
+        DataFrame(fact.lazy())
+        .join(DataFrame(dim.lazy()), on=Field("id"), prefix="dim_")
+        .filter(region == "eu")
+        .select(Field("qty")())
+    )
+
+    plan = query.explain()
+    assert plan.index("FILTER") > plan.index("JOIN")
+    assert "unused" not in plan.split("PROJECT")[1]
+    assert plan.count("2/") == 2
+
+
+def test_join_keys_resolve_through_each_side():
+    fact, dim = join_frames()
+    env = Environment(FieldResolver(fact.columns, prefix="scen1_"))
+    region = use_prefix("dim_")(Field("region")())
+    qty = use_prefix("")(Field("qty")())
+    query = (
+        DataFrame(fact)
+        .join(DataFrame(dim), left_on=Field("id")(), right_on="id", prefix="dim_")
+        .select(qty, region)
+        .sort(qty)
+    )
+
+    result = query.run(env)
+    assert result["dim_region"].to_list() == ["us", "us", "eu", "eu"]
+
+
+def test_join_right_keys_use_prefixes_of_the_right_frame():
+    fact, dim = join_frames()
+    dim = dim.with_columns(old_id=pl.col("id") + 1)
+    right_key = use_prefix("old_")(Field("id")())
+    query = (
+        DataFrame(fact)
+        .join(DataFrame(dim), left_on="id", right_on=right_key, prefix="dim_")
+        .select(Field("qty")(), use_prefix("dim_")(Field("region")()))
+        .sort(Field("qty")())
+    )
+
+    result = query.run()
+    assert result["qty"].to_list() == [2, 3]
+    assert result["dim_region"].to_list() == ["eu", "us"]
+
+
+def test_join_rejects_mismatched_keys():
+    fact, dim = join_frames()
+    with pytest.raises(ValueError, match="same length"):
+        DataFrame(fact).join(DataFrame(dim), left_on=["id", "qty"], right_on="id")
+
+
+def test_cross_join_pairs_every_row_without_keys():
+    fact, dim = join_frames()
+    query = (
+        DataFrame(fact)
+        .join(DataFrame(dim), how="cross")
+        .select(Field("qty")(), use_prefix("right_")(Field("region")()))
+    )
+    result = query.run()
+    assert result.shape == (12, 2)
+    assert result.columns == ["qty", "right_region"]
+
+    with pytest.raises(ValueError, match="no keys"):
+        DataFrame(fact).join(DataFrame(dim), on="id", how="cross")
+
+
+def test_incremental_processes_only_appended_rows():
+    calls = []
+
+    @series_function(elementwise=True)
+    def doubled(a: pl.Series) -> pl.Series:
+        calls.append(len(a))
+        return a * 2
+
+    log = pl.DataFrame({"numbers": [1, 2, 3]})
+    numbers = Field("numbers")
+    query = DataFrame(log).filter(numbers() > 1).select(doubled(numbers()))
+    run = query.incremental()
+
+    assert run.update().to_series().to_list() == [4, 6]
+    grown = pl.concat([log, pl.DataFrame({"numbers": [0, 5]})])
+    assert run.update(grown).to_series().to_list() == [4, 6, 10]
+    assert run.rows == 5
+    assert calls == [2, 1]
+    assert run.result.equals(DataFrame(grown, query._ops).run())
+
+    with pytest.raises(ValueError, match="append-only"):
+        run.update(log)
+
+
+def test_incremental_rejects_closures_over_the_whole_column():
+    query = DataFrame(pl.DataFrame({"a": [1.0, 2.0, 3.0]})).select(
+        map(lambda e: e - e.mean(), Field("a"))
+    )
+    with pytest.raises(ValueError, match="run incrementally: select"):
+        query.incremental()
+
+
+def test_incremental_rejects_literal_only_select():
+    log = pl.DataFrame({"numbers": [1, 2, 3]})
+    query = DataFrame(log).select(pure(1).alias("one"), pure("x").alias("tag"))
+    with pytest.raises(ValueError, match="select reads no column"):
+        query.incremental()
+
+    # Next to a column the literals follow its rows, so updates stay exact.
+    run = DataFrame(log).select(Field("numbers")(), pure(1).alias("one")).incremental()
+    run.update()
+    grown = pl.concat([log, pl.DataFrame({"numbers": [4]})])
+    assert run.update(grown).equals(DataFrame(grown, run.frame._ops).run())
+
+
+def test_incremental_explains_blocking_operations():
+    numbers = Field("numbers")
+    query = (
+        DataFrame(sample_dataframe_with_modified())
+        .sort(numbers())
+        .select(numbers().sum())
+    )
+    with pytest.raises(ValueError) as error:
+        query.incremental()
+    message = str(error.value)
+    assert "sort orders rows across the whole input" in message
+    assert "select uses an aggregation" in message
+
+
+def test_profile_records_fused_plan_nodes():
+    numbers = Field("numbers")
+    query = (
+        DataFrame(sample_dataframe_with_modified())
+        .filter(numbers() > 1)
+        .select(numbers() * 2)
+    )
+    result, profile = query.profile()
+
+    assert result.equals(query.run())
+    assert [op.name for op in profile.ops] == ["filter", "select"]
+    assert all(op.lower_seconds is not None for op in profile.ops)
+    assert profile.ops[0].execute_seconds is None
+    assert profile.rows_out == 2
+    assert profile.nodes is not None
+    assert profile.nodes.columns == ["node", "start", "end"]
+
+
+def test_profile_raises_errors_without_running_again(monkeypatch):
+    query = DataFrame(pl.DataFrame({"a": [[1], [2]]})).select(pl.col("a").list.get(5))
+
+    def collect(*args, **kwargs):
+        raise AssertionError("the plan ran again")
+
+    monkeypatch.setattr(pl.LazyFrame, "collect", collect)
+    with pytest.raises(pl.exceptions.ComputeError, match="out of bounds"):
+        query.profile()
+
+
+def test_profile_by_op_records_rows_and_bytes():
+    numbers = Field("numbers")
+    query = (
+        DataFrame(sample_dataframe_with_modified())
+        .filter(numbers() > 1)
+        .with_columns((numbers() * 2).alias("doubled"))
+        .select(Field("doubled")())
+    )
+    result, profile = query.profile(by_op=True)
+
+    assert result["doubled"].to_list() == [4, 6]
+    records = profile.to_dicts()
+    assert [(r["rows_in"], r["rows_out"]) for r in records] == [(3, 2), (2, 2), (2, 2)]
+    assert records[-1]["bytes_out"] == result.estimated_size()
+    assert all(r["execute_seconds"] >= 0 for r in records)
+
+
+def test_run_calls_profile_hook():
+    reports = []
+    query = DataFrame(sample_dataframe_with_modified()).select(Field("numbers")())
+    result = query.run(profile=reports.append)
+    assert result["numbers"].to_list() == [1, 2, 3]
+    assert len(reports) == 1 and reports[0].rows_out == 3
+
+
+def test_run_async_matches_run():
+    numbers = Field("numbers")
+    query = DataFrame(sample_dataframe_with_modified()).filter(numbers() > 1)
+    assert asyncio.run(query.run_async()).equals(query.run())
+
+
+def test_gather_runs_returns_results_in_order():
+    numbers = Field("numbers")
+    base = DataFrame(sample_dataframe_with_modified())
+    queries = [base.select(numbers() * factor) for factor in (1, 2, 3)]
+    results = asyncio.run(gather_runs(queries))
+    assert [r.to_series().to_list() for r in results] == [
+        [1, 2, 3],
+        [2, 4, 6],
+        [3, 6, 9],
+    ]
+
+
+def test_gather_runs_returns_or_raises_failures():
+    base = DataFrame(sample_dataframe_with_modified())
+    queries = [base.select(Field("numbers")()), base.select(Field("missing")())]
+    with pytest.raises(KeyError, match="missing"):
+        asyncio.run(gather_runs(queries))
+
+    ok, failed = asyncio.run(gather_runs(queries, return_exceptions=True))
+    assert ok["numbers"].to_list() == [1, 2, 3]
+    assert isinstance(failed, KeyError)
+
+
+def test_gather_runs_times_out():
+    @series_function
+    def slow(values: pl.Series) -> pl.Series:
+        time.sleep(0.5)
+        return values
+
+    query = DataFrame(sample_dataframe_with_modified()).select(slow(Field("numbers")()))
+    with pytest.raises(TimeoutError):
+        asyncio.run(gather_runs([query], timeout=0.05))
+
+
+def test_run_all_returns_results_in_query_order():
+    numbers = Field("numbers")
+    base = DataFrame(sample_dataframe_with_modified()).filter(numbers() > 1)
+    queries = [
+        base.select(numbers()),
+        base.sort(numbers(), descending=True).select(numbers() * 10),
+        DataFrame(base.df).select(Field("modified_numbers")()),
+    ]
+    results = run_all(queries)
+    assert [r.equals(q.run()) for r, q in zip(results, queries)] == [True] * 3
+
+
+def test_run_all_computes_shared_operations_once():
+    calls = []
+
+    @series_function
+    def counted(values: pl.Series) -> pl.Series:
+        calls.append(values.len())
+        return values * 2
+
+    numbers = Field("numbers")
+    base = (
+        DataFrame(sample_dataframe_with_modified())
+        .filter(numbers() > 1)
+        .with_columns(counted(numbers()).alias("doubled"))
+    )
+    first, second = run_all(
+        [base.select(Field("doubled")()), base.select(Field("doubled")() + 1)]
+    )
+    assert first["doubled"].to_list() == [4, 6]
+    assert second["doubled"].to_list() == [5, 7]
+    assert calls == [2]
+
+
+@pytest.mark.parametrize(
+    "sink, read",
+    [
+        ("sink_parquet", pl.read_parquet),
+        ("sink_ipc", pl.read_ipc),
+        ("sink_csv", pl.read_csv),
+    ],
+)
+def test_sinks_write_the_result(tmp_path, sink, read):
+    numbers = Field("numbers")
+    query = DataFrame(sample_dataframe_with_modified()).filter(numbers() > 1)
+    path = tmp_path / "result"
+    getattr(query, sink)(path)
+    assert read(path).equals(query.run())
+
+
+def test_sink_partitions_by_resolved_key(tmp_path):
+    df = pl.DataFrame({"region": ["eu", "us", "eu"], "value": [1, 2, 3]})
+    env = Environment(FieldResolver(df.columns))
+    query = DataFrame(df).select(Field("region")(), Field("value")() * 10)
+    query.sink_parquet(
+        tmp_path, env, partition_by="region", compression="lz4", row_group_size=2
+    )
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["region=eu", "region=us"]
+    eu = DataFrame.scan_parquet(tmp_path / "region=eu").run()
+    assert eu["value"].to_list() == [10, 30]
@@ -1,4 +1,5 @@
 import polars as pl
+import pytest
 from datadrill import (
     Environment,
     Field,
@@ -53,3 +54,38 @@ def test_series_function_basic():
 
     result = df.select(add_and_scale_series(numbers(), modified(), factor=2)(env))
     assert result.to_series().to_list() == [22, 44, 66]
+
+
+@series_function(numpy=True, elementwise=True, return_dtype=pl.Float64)
+def weighted(a, b, weight):
+    # Zero-copy views of Polars memory are read-only.
+    assert not a.flags.writeable
+    return a * weight + b
+
+
+def test_series_function_numpy_elementwise():
+    pytest.importorskip("numpy")
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    numbers = Field("numbers")
+    modified = Field("modified_numbers")
+
+    expr = weighted(numbers(), modified(), weight=0.5)(env)
+    result = df.lazy().select(expr).collect(engine="streaming").to_series()
+    assert result.dtype == pl.Float64
+    assert result.to_list() == [10.5, 21.0, 31.5]
+
+
+@series_function(numpy=True, return_dtype=pl.Int64)
+def total(a, b):
+    return a + b
+
+
+def test_series_function_numpy_multiple_inputs():
+    pytest.importorskip("numpy")
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    expr = total(Field("numbers")(), Field("modified_numbers")())(env)
+
+    assert "struct" not in str(expr)
+    assert df.select(expr).to_series().to_list() == [11, 22, 33]
@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from datadrill import (
     Environment,
     Field,
@@ -87,3 +91,24 @@ def test_modulo_field_scalar():
 
     result = df.select((numbers() % 2)(env))
     assert result["numbers"].to_list() == [1, 0, 1]
+
+
+def test_resolver_with_prefix_shares_schema():
+    resolver = FieldResolver(["numbers", "modified_numbers"])
+    prefixed = resolver.with_prefix("modified_")
+    assert prefixed.schema is resolver.schema
+    assert prefixed.clear_prefix().schema is resolver.schema
+    assert prefixed.fields() == {"numbers"}
+    with pytest.raises(KeyError):
+        prefixed.resolve("missing")
+
+
+def test_pickled_environment_recomputes_its_hash():
+    env = Environment(FieldResolver(["numbers", "modified_numbers"]))
+    # Stand in for the hash cached by a process with another hash seed.
+    env.resolver.schema._hash = hash(env.resolver.schema) + 1
+    restored = pickle.loads(pickle.dumps(env))
+    fresh = Environment(FieldResolver(["numbers", "modified_numbers"]))
+    assert restored == fresh
+    assert hash(restored) == hash(fresh)
+    assert restored.resolver.fields() == {"numbers", "modified_numbers"}
@@ -0,0 +1,126 @@
+import polars as pl
+import pytest
+
+from datadrill import (
+    DataFrame,
+    Environment,
+    Field,
+    FieldResolver,
+    FrameIndex,
+    pure,
+    run_all,
+    use_prefix,
+)
+
+
+@pytest.fixture
+def frame():
+    ts = pl.int_range(0, 1_000, eager=True)
+    return pl.DataFrame(
+        {
+            "ts": ts,
+            "scen1_ts": ts * 2,
+            "value": (ts * 37) % 101,
+            "bucket": ts // 100,
+        }
+    )
+
+
+def test_sorted_index_slices_range_filters(frame):
+    ts = Field("ts")
+    base = DataFrame(frame)
+    indexed = base.with_index(sorted_by="ts")
+    for predicate in (
+        ts() > 990,
+        ts() >= 990,
+        ts() < 5,
+        ts() <= 5,
+        ts() == 500,
+        (ts() >= 100) & (ts() < 110) & (Field("value")() > 50),
+        pure(995) < ts(),
+    ):
+        query = indexed.filter(predicate).select(ts(), Field("value")())
+        assert query.run().equals(
+            base.filter(predicate).select(ts(), Field("value")()).run()
+        )
+
+
+def test_index_narrows_the_input(frame):
+    ts = Field("ts")
+    query = DataFrame(frame).with_index(sorted_by="ts").filter(ts() >= 990)
+    env = Environment(FieldResolver(frame.columns))
+    assert query._source(env).collect().height == 10
+
+
+def test_index_resolves_prefixed_fields(frame):
+    ts = Field("ts")
+    env = Environment(FieldResolver(frame.columns, prefix="scen1_"))
+    base = DataFrame(frame).filter(use_prefix("scen1_")(ts()) < 10)
+    indexed = DataFrame(frame).with_index(sorted_by="scen1_ts").filter(ts() < 10)
+    assert indexed._source(env).collect().height == 5
+    assert indexed.run(env).equals(base.run(env))
+
+
+def test_zone_maps_skip_chunks(frame):
+    bucket = Field("bucket")
+    indexed = DataFrame(frame).with_index(zone_maps=["bucket"], chunk_size=100)
+    query = indexed.filter((bucket() == 3) | (bucket() == 4)).filter(bucket() >= 3)
+    env = Environment(FieldResolver(frame.columns))
+    assert query._source(env).collect().height == 700
+    narrowed = indexed.filter(bucket() == 3)
+    assert narrowed._source(env).collect()["ts"].to_list() == list(range(300, 400))
+    assert narrowed.run().equals(DataFrame(frame).filter(bucket() == 3).run())
+
+
+def test_empty_match_keeps_schema(frame):
+    query = DataFrame(frame).with_index("ts", ["value"]).filter(Field("ts")() > 5_000)
+    result = query.select(Field("value")()).run()
+    assert result.shape == (0, 1)
+
+
+def test_index_needs_sorted_eager_input(frame):
+    with pytest.raises(ValueError, match="sorted ascending"):
+        FrameIndex.build(frame, sorted_by="value")
+    with pytest.raises(ValueError, match="eager"):
+        DataFrame(frame.lazy()).with_index(sorted_by="ts")
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda q, ts, value: q.filter((ts() >= 900) & (value() > value().mean())),
+        lambda q, ts, value: q.filter(value() > value().mean()).filter(ts() >= 400),
+        lambda q, ts, value: q.filter(pl.col("value").rank() <= 10).filter(ts() >= 400),
+    ],
+)
+def test_filters_reading_the_whole_column_see_every_row(frame, build):
+    ts, value = Field("ts"), Field("value")
+    expected = build(DataFrame(frame), ts, value).run()
+    indexed = build(DataFrame(frame).with_index(sorted_by="ts"), ts, value)
+    assert indexed.run().equals(expected)
+    env = Environment(FieldResolver(frame.columns))
+    assert indexed._source(env).collect().height == frame.height
+
+
+def test_run_all_run_many_and_run_batches_use_the_index(frame, monkeypatch):
+    scans = []
+    scan = FrameIndex.scan
+
+    def counted(self, filters, env):
+        scans.append(filters)
+        return scan(self, filters, env)
+
+    monkeypatch.setattr(FrameIndex, "scan", counted)
+    ts = Field("ts")
+    base = DataFrame(frame).filter(ts() >= 990).select(ts())
+    indexed = (
+        DataFrame(frame).with_index(sorted_by="ts").filter(ts() >= 990).select(ts())
+    )
+    scenarios = {"base_": Environment(FieldResolver(frame.columns))}
+
+    assert run_all([indexed])[0].equals(base.run())
+    assert indexed.run_many(scenarios).equals(base.run_many(scenarios))
+    batches = list(indexed.run_batches(batch_size=4))
+    assert [b.height for b in batches] == [4, 4, 2]
+    assert pl.concat(batches).equals(base.run())
+    assert len(scans) == 3
@@ -0,0 +1,78 @@
+import polars as pl
+import pytest
+
+from datadrill import (
+    ChunkedExecutor,
+    DataFrame,
+    Environment,
+    Field,
+    FieldResolver,
+    series_function,
+)
+
+
+def scale(a: pl.Series, factor: int) -> pl.Series:
+    return pl.Series([value * factor for value in a])
+
+
+scale_in_threads = series_function(
+    elementwise=True, parallel=ChunkedExecutor("thread", chunk_size=3)
+)(scale)
+
+
+@series_function(
+    elementwise=True,
+    return_dtype=pl.Int64,
+    parallel=ChunkedExecutor("process", chunk_size=4, max_workers=2),
+)
+def offset_in_processes(a: pl.Series, b: pl.Series, offset: int) -> pl.Series:
+    return pl.Series([x + y + offset for x, y in zip(a, b)])
+
+
+@series_function(elementwise=True)
+def double(a: pl.Series) -> pl.Series:
+    return a * 2
+
+
+def frame() -> pl.DataFrame:
+    return pl.DataFrame({"a": list(range(10)), "b": list(range(10, 20))})
+
+
+def test_thread_executor_keeps_row_order():
+    df = frame()
+    env = Environment(FieldResolver(df.columns))
+    result = df.select(scale_in_threads(Field("a")(), 3)(env)).to_series()
+    assert result.to_list() == [value * 3 for value in range(10)]
+
+
+def test_process_executor_round_trips_chunks():
+    df = frame()
+    env = Environment(FieldResolver(df.columns))
+    expr = offset_in_processes(Field("a")(), Field("b")(), offset=1)(env)
+    result = df.select(expr).to_series()
+    assert result.to_list() == [2 * value + 11 for value in range(10)]
+
+
+def test_run_applies_executor_to_elementwise_functions():
+    query = DataFrame(frame()).select(double(Field("a")()))
+    executor = ChunkedExecutor("thread", chunk_size=2)
+    result = query.run(parallel=executor)
+    assert result.equals(query.run())
+
+
+def test_parallel_requires_elementwise():
+    with pytest.raises(ValueError, match="elementwise"):
+        series_function(parallel=ChunkedExecutor())(scale)
+
+
+def test_local_functions_cannot_run_in_processes():
+    @series_function(
+        elementwise=True, parallel=ChunkedExecutor("process", chunk_size=2)
+    )
+    def local(a):
+        return a
+
+    df = frame()
+    env = Environment(FieldResolver(df.columns))
+    with pytest.raises(ValueError, match="local must be defined at module level"):
+        df.select(local(Field("a")())(env))
@@ -0,0 +1,92 @@
+import polars as pl
+import pytest
+
+from datadrill import Field, Partitions, series_function
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    for year in (2023, 2024):
+        for region in ("eu", "us"):
+            directory = tmp_path / f"year={year}" / f"region={region}"
+            directory.mkdir(parents=True)
+            values = [(year * 7 + len(region) * i) % 50 for i in range(20)]
+            pl.DataFrame({"value": values}).write_parquet(directory / "0.parquet")
+    return Partitions.discover(tmp_path)
+
+
+def test_discover_reads_hive_keys(dataset):
+    assert len(dataset.partitions) == 4
+    assert dataset.partitions[0].keys == (("year", "2023"), ("region", "eu"))
+    assert dataset.scan().collect_schema().names() == ["value", "year", "region"]
+
+
+def test_prune_skips_partitions_excluded_by_key_filters(dataset):
+    year, value = Field("year"), Field("value")
+    query = dataset.frame().filter((year() == 2024) & (value() > 10))
+    kept = dataset.prune(query)
+    assert [dict(p.keys)["year"] for p in kept] == ["2024", "2024"]
+
+
+def test_run_matches_a_single_plan(dataset):
+    year, region, value = Field("year"), Field("region"), Field("value")
+    query = (
+        dataset.frame()
+        .filter((year() >= 2024) & (value() > 10))
+        .select(region(), (value() * 2).alias("doubled"))
+    )
+    result = dataset.run(query, kind="thread")
+    assert result.equals(query.run())
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_run_merges_sorted_partitions(dataset, descending):
+    value = Field("value")
+    query = (
+        dataset.frame()
+        .select(Field("year")(), value())
+        .sort(value(), descending=descending)
+    )
+    result = dataset.run(query, kind="thread", max_workers=2)
+    expected = query.run()
+    assert result.columns == expected.columns
+    assert result["value"].equals(expected["value"])
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_run_keeps_nulls_first_across_partitions(tmp_path, descending):
+    for year, values in ((2023, [None, 5, 1]), (2024, [None, 3, 2])):
+        directory = tmp_path / f"year={year}"
+        directory.mkdir()
+        frame = pl.DataFrame({"value": values}, schema={"value": pl.Int64})
+        frame.write_parquet(directory / "0.parquet")
+    dataset = Partitions.discover(tmp_path)
+    value = Field("value")
+    query = dataset.frame().sort(value(), descending=descending)
+    result = dataset.run(query, kind="thread")
+    assert result["value"].to_list() == query.run()["value"].to_list()
+    assert result["value"].to_list()[:2] == [None, None]
+
+
+def test_run_in_processes(dataset):
+    query = dataset.frame().filter(Field("region")() == "us")
+    result = dataset.run(query, max_workers=2)
+    assert result.sort("year", "value").equals(query.run().sort("year", "value"))
+
+
+def test_run_without_matching_partitions_is_empty(dataset):
+    query = dataset.frame().filter(Field("year")() == 1999)
+    assert dataset.run(query, kind="thread").shape == (0, 3)
+
+
+def test_run_rejects_whole_input_operations(dataset):
+    query = dataset.frame().sort(Field("value")()).select(Field("value")())
+    with pytest.raises(ValueError, match="run per partition"):
+        dataset.run(query)
+
+    @series_function
+    def total(values: pl.Series) -> pl.Series:
+        return values.sum()
+
+    with pytest.raises(ValueError, match="run per partition"):
+        dataset.run(dataset.frame().select(total(Field("value")())))
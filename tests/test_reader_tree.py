@@ -0,0 +1,136 @@
+import pickle
+
+import polars as pl
+import pytest
+
+from datadrill import (
+    Environment,
+    Field,
+    FieldResolver,
+    Reader,
+    asks,
+    field_function,
+    get_data,
+    map,
+    pure,
+    sample_dataframe_with_modified,
+    series_function,
+    use_prefix,
+)
+from datadrill.field import BinaryOp, FieldRef, Literal, PrefixScope
+
+
+def test_operators_build_structural_tree():
+    numbers = Field("numbers")
+    expr = numbers() + 1
+
+    assert expr.node == BinaryOp("add", FieldRef("numbers"), Literal(1))
+    assert (1 - numbers()).node == BinaryOp("sub", Literal(1), FieldRef("numbers"))
+    assert use_prefix("modified_")(get_data("numbers")).node == PrefixScope(
+        "modified_", FieldRef("numbers")
+    )
+
+
+def test_structural_equality_and_hash():
+    numbers = Field("numbers")
+    left = (numbers() * 2 + pure(1)).node
+    right = (get_data("numbers") * 2 + 1).node
+
+    assert left == right
+    assert hash(left) == hash(right)
+    assert left != (numbers() * 2.0 + 1).node
+    assert len({left, right}) == 1
+
+
+def test_pickled_nodes_recompute_their_hash():
+    node = (use_prefix("modified_")(Field("numbers")()) + 1).node
+    # Stand in for hashes memoised by a process with another hash seed.
+    for child in (node, node.left, node.left.child):
+        object.__setattr__(child, "_hash", hash(child) + 1)
+    restored = pickle.loads(pickle.dumps(node))
+    fresh = (use_prefix("modified_")(Field("numbers")()) + 1).node
+    assert restored == fresh
+    assert hash(restored) == hash(fresh)
+    assert {restored: 1}[fresh] == 1
+
+
+def test_required_fields():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    numbers = Field("numbers")
+    expr = map(lambda a: a * 2, numbers()) + use_prefix("modified_")(numbers())
+
+    assert expr.required_fields() == {"numbers", "modified_numbers"}
+    assert (numbers() + 1).required_fields(env.with_prefix("modified_")) == {
+        "modified_numbers"
+    }
+    with pytest.raises(KeyError):
+        (numbers() + Field("missing")()).required_fields(env)
+
+
+def test_required_fields_of_asks_need_environment():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns, prefix="modified_"))
+    reader = asks(lambda e: Field("numbers"))
+
+    assert reader.required_fields(env) == {"modified_numbers"}
+    with pytest.raises(ValueError):
+        reader.required_fields()
+
+
+@field_function
+def scaled(a: Reader, factor: int) -> Reader:
+    return a * factor
+
+
+@series_function
+def shifted(a, offset):
+    return a + offset
+
+
+def test_function_nodes_lower_like_closures():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    numbers = Field("numbers")
+
+    assert scaled(numbers(), 2).node == scaled(numbers(), 2).node
+    assert shifted(numbers(), 1).node == shifted(numbers(), 1).node
+    assert shifted(numbers(), 1).node != shifted(numbers(), 2).node
+
+    result = df.select(
+        scaled(numbers(), 2)(env).alias("scaled"),
+        shifted(numbers(), offset=1)(env).alias("shifted"),
+    )
+    assert result["scaled"].to_list() == [2, 4, 6]
+    assert result["shifted"].to_list() == [2, 3, 4]
+
+
+def test_closure_reader_still_supported():
+    df = sample_dataframe_with_modified()
+    env = Environment(FieldResolver(df.columns))
+    reader = Reader(lambda e: Field("numbers")()(e)) + 1
+
+    assert df.select(reader(env)).to_series().to_list() == [2, 3, 4]
+    with pytest.raises(ValueError):
+        reader.required_fields(env)
+
+
+def test_row_local_is_only_reported_for_elementwise_readers():
+    numbers = Field("numbers")
+    elementwise = [
+        numbers() * 2 + 1,
+        use_prefix("modified_")(numbers()).alias("scaled"),
+        numbers() + pl.col("numbers").abs(),
+        numbers() & pl.col("numbers").is_in([1, 2]),
+    ]
+    whole_column = [
+        numbers().sum(),
+        numbers().over(Field("group")()),
+        numbers() / pl.col("numbers").max(),
+        numbers() + pl.col("numbers").rank(),
+        map(lambda e: e - e.mean(), numbers),
+        asks(lambda env: pl.col("numbers")),
+        Reader(lambda env: pl.col("numbers")),
+    ]
+    assert all(reader.node.row_local for reader in elementwise)
+    assert not any(reader.node.row_local for reader in whole_column)
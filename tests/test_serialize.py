@@ -0,0 +1,96 @@
+import polars as pl
+import pytest
+
+from datadrill import (
+    DataFrame,
+    Field,
+    deserialize_plan,
+    field_function,
+    map,
+    pure,
+    register_function,
+    sample_dataframe_with_modified,
+    serialize_plan,
+    series_function,
+    use_prefix,
+)
+
+
+@register_function
+@field_function
+def add_and_scale(a, b, factor):
+    return (a + b) * factor
+
+
+@register_function(name="tests.doubled")
+@series_function(elementwise=True, return_dtype=pl.Int64)
+def doubled(values: pl.Series) -> pl.Series:
+    return values * 2
+
+
+def sample_plan() -> DataFrame:
+    df = sample_dataframe_with_modified()
+    numbers = Field("numbers")
+    return (
+        DataFrame(df)
+        .filter((numbers() > 1) & ~(numbers() == pure(5)))
+        .with_columns((numbers() * 2).alias("twice"))
+        .select(
+            add_and_scale(
+                numbers(), use_prefix("modified_")(numbers()), factor=2
+            ).alias("scaled"),
+            doubled(Field("twice")()).alias("doubled"),
+            pl.col("numbers").cum_sum().alias("running"),
+            (-numbers()).alias("negated"),
+        )
+        .sort(Field("doubled")(), descending=True)
+    )
+
+
+@pytest.mark.parametrize("format", ["json", "binary"])
+def test_plan_round_trips_to_the_same_polars_plan(format):
+    plan = sample_plan()
+    payload = serialize_plan(plan, format)
+    restored = deserialize_plan(payload, plan.df)
+
+    assert restored.explain() == plan.explain()
+    assert restored.run().equals(plan.run())
+
+
+def test_json_plan_is_readable():
+    payload = serialize_plan(DataFrame(pl.DataFrame()).select(Field("a")() + 1), "json")
+    assert payload == (
+        '{"version":1,"ops":[{"op":"select","nodes":'
+        '[{"op":"add","args":[{"field":"a"},{"lit":1}]}]}]}'
+    )
+
+
+def test_group_by_round_trips():
+    df = pl.DataFrame({"key": ["a", "b", "a"], "value": [1, 2, 3]})
+    plan = (
+        DataFrame(df)
+        .group_by(Field("key")(), maintain_order=True)
+        .agg(Field("value")().sum())
+    )
+    restored = deserialize_plan(serialize_plan(plan), df)
+    assert restored.run().equals(plan.run())
+
+
+def test_deserialized_plans_are_cached_by_payload():
+    payload = serialize_plan(sample_plan())
+    first = deserialize_plan(payload, sample_dataframe_with_modified())
+    second = deserialize_plan(payload, sample_dataframe_with_modified())
+    assert first._ops == second._ops
+
+
+def test_unregistered_functions_cannot_be_serialized():
+    plan = DataFrame(pl.DataFrame()).select(map(lambda x: x + 1, Field("a")))
+    with pytest.raises(ValueError, match="register_function"):
+        serialize_plan(plan)
+
+
+def test_joins_cannot_be_serialized():
+    df = sample_dataframe_with_modified()
+    plan = DataFrame(df).join(DataFrame(df), on="numbers")
+    with pytest.raises(ValueError, match="join"):
+        serialize_plan(plan)